@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Measure per cover cost of each ArtBehaviour combination used by views,
+# with previous pipeline (full decode, full size blur, cairo rounding)
+# and with ArtworkManager pipeline
+# Usage: bin/bench_artwork.py [image path] [runs]
+
+import gi
+gi.require_version("Gdk", "3.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gdk, GdkPixbuf, GLib, GObject
+
+from PIL import Image, ImageFilter
+
+import os
+import sys
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lollypop.artwork_manager import ArtworkManager  # noqa: E402
+from lollypop.define import ArtBehaviour  # noqa: E402
+from lollypop.utils import get_round_surface  # noqa: E402
+
+# (label, behaviour, width, height)
+COMBINATIONS = [
+    ("cover", ArtBehaviour.CACHE | ArtBehaviour.CROP_SQUARE, 200, 200),
+    ("cover small", ArtBehaviour.CACHE | ArtBehaviour.CROP_SQUARE, 50, 50),
+    ("cover border", ArtBehaviour.CROP_SQUARE |
+     ArtBehaviour.ROUNDED_BORDER, 200, 200),
+    ("artist rounded", ArtBehaviour.CROP_SQUARE |
+     ArtBehaviour.ROUNDED, 100, 100),
+    ("banner blur", ArtBehaviour.CROP | ArtBehaviour.BLUR, 1200, 300),
+    ("banner blur hard", ArtBehaviour.CROP |
+     ArtBehaviour.BLUR_HARD, 1200, 300),
+    ("fullscreen blur max", ArtBehaviour.CROP |
+     ArtBehaviour.BLUR_MAX, 1920, 1080),
+    ("miniplayer blur hard", ArtBehaviour.BLUR_HARD, 400, 200)]
+
+
+class BenchArtworkManager(ArtworkManager):
+    """
+        Artwork manager without settings
+    """
+
+    def __init__(self):
+        GObject.GObject.__init__(self)
+
+
+def previous(manager, path, width, height, behaviour):
+    """
+        Previous pipeline
+        @return GdkPixbuf.Pixbuf/cairo.Surface
+    """
+    pixbuf = GdkPixbuf.Pixbuf.new_from_file(path)
+    if behaviour & ArtBehaviour.CROP_SQUARE:
+        pixbuf = manager._crop_pixbuf_square(pixbuf)
+    elif behaviour & ArtBehaviour.CROP:
+        pixbuf = manager._crop_pixbuf(pixbuf, width, height)
+    gaussian = 0
+    if behaviour & ArtBehaviour.BLUR:
+        gaussian = 25
+    elif behaviour & ArtBehaviour.BLUR_HARD:
+        gaussian = 50
+    elif behaviour & ArtBehaviour.BLUR_MAX:
+        gaussian = 100
+    if gaussian:
+        pixbuf = pixbuf.scale_simple(width, height,
+                                     GdkPixbuf.InterpType.NEAREST)
+        mode = "RGBA" if pixbuf.get_has_alpha() else "RGB"
+        image = Image.frombytes(mode, (width, height), pixbuf.get_pixels(),
+                                "raw", mode, pixbuf.get_rowstride())
+        image = image.filter(ImageFilter.GaussianBlur(gaussian))
+        pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(
+            GLib.Bytes.new(image.tobytes()), GdkPixbuf.Colorspace.RGB,
+            pixbuf.get_has_alpha(), 8, width, height, width * len(mode))
+    else:
+        pixbuf = pixbuf.scale_simple(width, height,
+                                     GdkPixbuf.InterpType.BILINEAR)
+    if behaviour & ArtBehaviour.ROUNDED:
+        return get_round_surface(pixbuf, 1, pixbuf.get_width() / 2)
+    elif behaviour & ArtBehaviour.ROUNDED_BORDER:
+        return get_round_surface(pixbuf, 1, 5)
+    return Gdk.cairo_surface_create_from_pixbuf(pixbuf, 1, None)
+
+
+def current(manager, path, width, height, behaviour):
+    """
+        ArtworkManager pipeline
+        @return cairo.Surface
+    """
+    pixbuf = manager.load_pixbuf(path, width, height, behaviour)
+    pixbuf = manager.load_behaviour(pixbuf, width, height, behaviour)
+    pixbuf = manager.load_rounded(pixbuf, behaviour)
+    return Gdk.cairo_surface_create_from_pixbuf(pixbuf, 1, None)
+
+
+def run(pipeline, manager, path, runs):
+    """
+        Run pipeline for each combination
+        @return {str: float}: milliseconds per cover
+    """
+    results = {}
+    for (label, behaviour, width, height) in COMBINATIONS:
+        start = perf_counter()
+        for i in range(0, runs):
+            pipeline(manager, path, width, height, behaviour)
+        results[label] = (perf_counter() - start) * 1000 / runs
+    return results
+
+
+def main():
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    manager = BenchArtworkManager()
+    with NamedTemporaryFile(suffix=".jpg") as f:
+        if len(sys.argv) > 1:
+            path = sys.argv[1]
+        else:
+            # Same size as a common downloaded cover
+            image = Image.effect_mandelbrot((1200, 1200),
+                                            (-2, -1.5, 1, 1.5), 100)
+            image.convert("RGB").save(f.name, quality=95)
+            path = f.name
+        before = run(previous, manager, path, runs)
+        after = run(current, manager, path, runs)
+    print("%s runs" % runs)
+    print("%-24s %12s %12s %8s" % ("behaviour", "before (ms)",
+                                   "after (ms)", "x"))
+    for label in before.keys():
+        print("%-24s %12.3f %12.3f %8.1f" % (
+            label, before[label], after[label],
+            before[label] / max(after[label], 0.0001)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Measure hot path queries latency on a generated library,
+# before and after creating indexes from DatabaseAlbumsUpgrade 49
+# Usage: bin/bench_database.py [tracks count]
+
+import sqlite3
+import sys
+from random import randint, seed
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+
+SCHEMA = [
+    """CREATE TABLE albums (id INTEGER PRIMARY KEY, name TEXT NOT NULL,
+        mb_album_id TEXT, lp_album_id TEXT, no_album_artist BOOLEAN NOT NULL,
+        year INT, timestamp INT, uri TEXT NOT NULL, popularity INT NOT NULL,
+        rate INT NOT NULL, loved INT NOT NULL, mtime INT NOT NULL,
+        storage_type INT NOT NULL, synced INT NOT NULL)""",
+    """CREATE TABLE artists (id INTEGER PRIMARY KEY, name TEXT NOT NULL,
+        sortname TEXT NOT NULL, mb_artist_id TEXT)""",
+    """CREATE TABLE genres (id INTEGER PRIMARY KEY, name TEXT NOT NULL)""",
+    """CREATE TABLE album_artists (album_id INT NOT NULL,
+        artist_id INT NOT NULL)""",
+    """CREATE TABLE album_genres (album_id INT NOT NULL,
+        genre_id INT NOT NULL)""",
+    """CREATE TABLE tracks (id INTEGER PRIMARY KEY, name TEXT NOT NULL,
+        uri TEXT NOT NULL, duration INT, tracknumber INT, discnumber INT,
+        discname TEXT, album_id INT NOT NULL, year INT, timestamp INT,
+        popularity INT NOT NULL, loved INT NOT NULL DEFAULT 0,
+        rate INT NOT NULL, ltime INT NOT NULL, mtime INT NOT NULL,
+        storage_type INT NOT NULL, mb_track_id TEXT, lp_track_id TEXT,
+        bpm DOUBLE)""",
+    "CREATE index idx_aa ON album_artists(album_id)",
+    "CREATE index idx_ag ON album_genres(album_id)"]
+
+INDEXES = [
+    "CREATE index idx_tracks_uri ON tracks(uri, mtime, storage_type)",
+    "CREATE index idx_tracks_album ON tracks(album_id)",
+    "CREATE index idx_albums_uri ON albums(uri)",
+    "CREATE index idx_albums_name ON albums(name COLLATE NOCASE)",
+    "CREATE index idx_artists_name ON artists(name COLLATE NOCASE)",
+    "CREATE index idx_aa_artist ON album_artists(artist_id, album_id)",
+    "CREATE index idx_ag_genre ON album_genres(genre_id, album_id)"]
+
+# (label, request, params generator, runs)
+QUERIES = [
+    ("tracks.get_id_by_uri",
+     "SELECT rowid FROM tracks WHERE uri=?",
+     lambda t, a: ("file:///music/%s/%s.flac" % (randint(1, a),
+                                                 randint(1, t)),), 200),
+    ("tracks.get_mtimes",
+     "SELECT DISTINCT uri, mtime FROM tracks WHERE storage_type & 2",
+     lambda t, a: (), 3),
+    ("tracks.get_uris",
+     "SELECT uri FROM tracks WHERE storage_type & 2",
+     lambda t, a: (), 3),
+    ("tracks by album_id",
+     "SELECT rowid FROM tracks WHERE album_id=?",
+     lambda t, a: (randint(1, a),), 200),
+    ("albums.get_id",
+     "SELECT albums.rowid FROM albums, album_artists\
+      WHERE name=? COLLATE NOCASE AND albums.mb_album_id IS NULL\
+      AND no_album_artist=0 AND album_artists.album_id=albums.rowid\
+      AND artist_id=?",
+     lambda t, a: ("Album %s" % randint(1, a), randint(1, a // 4)), 200),
+    ("albums.get_id_by_uri",
+     "SELECT rowid FROM albums WHERE uri=?",
+     lambda t, a: ("file:///music/%s" % randint(1, a),), 200),
+    ("albums.get_uri_count",
+     "SELECT COUNT(uri) FROM albums WHERE uri=?",
+     lambda t, a: ("file:///music/%s" % randint(1, a),), 200),
+    ("artists.get_id",
+     "SELECT rowid, name FROM artists WHERE name=? COLLATE NOCASE",
+     lambda t, a: ("artist %s" % randint(1, a // 4),), 200),
+    ("album_artists by artist_id",
+     "SELECT album_id FROM album_artists WHERE artist_id=?",
+     lambda t, a: (randint(1, a // 4),), 200),
+    ("album_genres by genre_id",
+     "SELECT album_id FROM album_genres WHERE genre_id=?",
+     lambda t, a: (randint(1, 300),), 50)]
+
+
+def populate(sql, tracks_count):
+    """
+        Generate a library with ~10 tracks per album, ~4 albums per artist
+        @param sql as sqlite3.Connection
+        @param tracks_count as int
+        @return albums count as int
+    """
+    albums_count = tracks_count // 10
+    artists_count = albums_count // 4
+    for request in SCHEMA:
+        sql.execute(request)
+    sql.executemany("INSERT INTO genres (name) VALUES (?)",
+                    (("Genre %s" % i,) for i in range(1, 301)))
+    sql.executemany("INSERT INTO artists (name, sortname) VALUES (?, ?)",
+                    (("Artist %s" % i, "Artist %s" % i)
+                     for i in range(1, artists_count + 1)))
+    sql.executemany("INSERT INTO albums (name, no_album_artist, uri,\
+                     popularity, rate, loved, mtime, storage_type, synced)\
+                     VALUES (?, 0, ?, 0, 0, 1, 1, 2, 0)",
+                    (("Album %s" % i, "file:///music/%s" % i)
+                     for i in range(1, albums_count + 1)))
+    sql.executemany("INSERT INTO album_artists VALUES (?, ?)",
+                    ((i, (i - 1) // 4 + 1)
+                     for i in range(1, albums_count + 1)))
+    sql.executemany("INSERT INTO album_genres VALUES (?, ?)",
+                    ((i, randint(1, 300)) for i in range(1, albums_count + 1)))
+    sql.executemany("INSERT INTO tracks (name, uri, album_id, popularity,\
+                     rate, ltime, mtime, storage_type)\
+                     VALUES (?, ?, ?, 0, 0, 0, 1, 2)",
+                    (("Track %s" % i,
+                      "file:///music/%s/%s.flac" % ((i - 1) // 10 + 1, i),
+                      (i - 1) // 10 + 1)
+                     for i in range(1, tracks_count + 1)))
+    sql.commit()
+    return albums_count
+
+
+def run(sql, tracks_count, albums_count):
+    """
+        Run queries
+        @return {str: float} in milliseconds
+    """
+    results = {}
+    for (label, request, params, runs) in QUERIES:
+        seed(0)
+        start = perf_counter()
+        for i in range(0, runs):
+            sql.execute(request, params(tracks_count, albums_count)).fetchall()
+        results[label] = (perf_counter() - start) * 1000 / runs
+    return results
+
+
+def main():
+    tracks_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with NamedTemporaryFile(suffix=".db") as f:
+        sql = sqlite3.connect(f.name)
+        seed(0)
+        albums_count = populate(sql, tracks_count)
+        before = run(sql, tracks_count, albums_count)
+        for request in INDEXES:
+            sql.execute(request)
+        sql.commit()
+        after = run(sql, tracks_count, albums_count)
+        sql.close()
+    print("%s tracks, %s albums" % (tracks_count, albums_count))
+    print("%-28s %12s %12s %8s" % ("query", "before (ms)", "after (ms)", "x"))
+    for label in before.keys():
+        print("%-28s %12.3f %12.3f %8.1f" % (
+            label, before[label], after[label],
+            before[label] / max(after[label], 0.0001)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check HTTP connections are reused by SoupSessionPool:
+# run sequential requests against a local keep-alive server, with a new
+# Soup session per request and with pooled sessions
+# Usage: bin/bench_http.py [requests count]
+
+import gi
+gi.require_version("Soup", "3.0")
+from gi.repository import Soup
+
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from lollypop.helper_task import SoupSessionPool  # noqa: E402
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        Handler.connections += 1
+
+    def do_GET(self):
+        body = b"lollypop"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(uri, count, get_session):
+    """
+        Run requests
+        @return (connections as int, seconds as float)
+    """
+    Handler.connections = 0
+    start = perf_counter()
+    for i in range(0, count):
+        message = Soup.Message.new("GET", uri)
+        data = get_session(uri).send_and_read(message, None).get_data()
+        assert data == b"lollypop"
+    return (Handler.connections, perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    uri = "http://127.0.0.1:%s/" % server.server_address[1]
+    pool = SoupSessionPool("Lollypop/bench")
+    results = [("new session", run(uri, count, lambda u: Soup.Session.new())),
+               ("pooled session", run(uri, count, pool.get))]
+    server.shutdown()
+    print("%s sequential requests" % count)
+    print("%-16s %12s %12s" % ("", "connections", "seconds"))
+    for (label, (connections, seconds)) in results:
+        print("%-16s %12s %12.3f" % (label, connections, seconds))
+    print(pool.stats)
+    if results[1][1][0] != 1:
+        sys.exit("Connections were not reused")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,25 +22,26 @@ Gst.init(None)
 GstPbutils.pb_utils_init()
 
 from threading import current_thread
-from pickle import dump
 from signal import signal, SIGINT, SIGTERM
 
 from lollypop.utils import init_proxy_from_gnome
 from lollypop.application_actions import ApplicationActions
 from lollypop.application_cmdline import ApplicationCmdline
 from lollypop.utils_file import install_youtube_dl
-from lollypop.define import LOLLYPOP_DATA_PATH, StorageType
+from lollypop.define import ScanType, TaskLane
 from lollypop.database import Database
 from lollypop.player import Player
 from lollypop.inhibitor import Inhibitor
 from lollypop.artwork import Artwork
 from lollypop.artwork_album import AlbumArtwork
 from lollypop.artwork_artist import ArtistArtwork
+from lollypop.artwork_manager import PixbufCache
+from lollypop.artwork_prewarmer import ArtworkPrewarmer
 from lollypop.logger import Logger
+from lollypop.profiler import StartupProfiler
 from lollypop.ws_director import DirectorWebService
 from lollypop.sqlcursor import SqlCursor
 from lollypop.settings import Settings
-from lollypop.database_cache import CacheDatabase
 from lollypop.database_albums import AlbumsDatabase
 from lollypop.database_artists import ArtistsDatabase
 from lollypop.database_genres import GenresDatabase
@@ -90,7 +91,6 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
             # Set /tmp for GLib, /tmp not accessible in flatpak
             tmp = GLib.environ_getenv(GLib.get_environ(), "XDG_RUNTIME_DIR")
             GLib.setenv("TMPDIR", "%s/app/%s" % (tmp, app_id), True)
-        self.cursors = {}
         self.shown_sidebar_tooltip = False
         self.system_supports_color_schemes = False
         self.__window = None
@@ -109,6 +109,7 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
         """
             Init main application
         """
+        StartupProfiler.stage("imports")
         self.settings = Settings.new()
         # Mount enclosing volume as soon as possible
         uris = self.settings.get_music_uris()
@@ -141,28 +142,30 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
             styleContext = Gtk.StyleContext()
             styleContext.add_provider_for_screen(
                 screen, cssProvider, Gtk.STYLE_PROVIDER_PRIORITY_USER + 1)
+        StartupProfiler.stage("settings and css")
+        self.task_helper = TaskHelper()
         self.db = Database()
-        self.cache = CacheDatabase()
         self.playlists = Playlists()
         self.albums = AlbumsDatabase(self.db)
         self.artists = ArtistsDatabase(self.db)
         self.genres = GenresDatabase(self.db)
         self.tracks = TracksDatabase(self.db)
+        StartupProfiler.stage("databases")
         self.player = Player()
         self.inhibitor = Inhibitor()
+        StartupProfiler.stage("player")
         self.scanner = CollectionScanner()
         self.notify = NotificationManager()
-        self.task_helper = TaskHelper()
         self.art_helper = ArtHelper()
+        self.pixbuf_cache = PixbufCache()
         self.art = Artwork()
         self.art.update_art_size()
         self.album_art = AlbumArtwork()
         self.artist_art = ArtistArtwork()
+        # Started once window is shown, see __init_deferred()
+        self.art_prewarmer = ArtworkPrewarmer()
         self.ws_director = DirectorWebService()
-        self.ws_director.start()
-        if not self.settings.get_value("disable-mpris"):
-            from lollypop.mpris import MPRIS
-            MPRIS(self)
+        StartupProfiler.stage("scanner and artwork")
 
         settings = Gtk.Settings.get_default()
         # Fallback setting
@@ -176,11 +179,7 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
                 self.system_supports_color_schemes = True
                 manager.set_color_scheme(Handy.ColorScheme.PREFER_LIGHT)
         ApplicationActions.__init__(self)
-        monitor = Gio.NetworkMonitor.get_default()
-        if monitor.get_network_available() and\
-                not monitor.get_network_metered() and\
-                self.settings.get_value("recent-youtube-dl"):
-            self.task_helper.run(install_youtube_dl)
+        StartupProfiler.stage("actions")
 
     def do_startup(self):
         """
@@ -190,12 +189,18 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
         Handy.init()
         if self.__window is None:
             from lollypop.window import Window
+            StartupProfiler.stage("gtk")
             self.init()
             self.__window = Window()
             self.__window.connect("delete-event", self.__hide_on_delete)
             self.__window.setup()
             self.__window.show()
+            StartupProfiler.stage("window")
             self.player.restore_state()
+            StartupProfiler.stage("player state")
+            # Let main loop draw window before starting services
+            GLib.idle_add(self.__init_deferred,
+                          priority=GLib.PRIORITY_LOW)
 
     def quit(self, vacuum=False, wait=100):
         """
@@ -210,6 +215,7 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
             GLib.timeout_add(wait, self.quit, vacuum, wait + 100)
             return
         self.album_art.cancellable.cancel()
+        self.art_prewarmer.stop()
         self.artist_art.cancellable.cancel()
         if self.settings.get_value("save-state"):
             self.__window.container.stack.save_history()
@@ -217,6 +223,7 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
         if vacuum:
             self.__vacuum()
             self.art.clean_artwork()
+        SqlCursor.pool.close_all()
         Gio.Application.quit(self)
         if GLib.environ_getenv(GLib.get_environ(), "DEBUG_LEAK") is not None:
             import gc
@@ -311,33 +318,35 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
 #######################
 # PRIVATE             #
 #######################
+    def __init_deferred(self):
+        """
+            Start services not needed to show window
+        """
+        StartupProfiler.stage("first frame")
+        self.ws_director.start()
+        if not self.settings.get_value("disable-mpris"):
+            from lollypop.mpris import MPRIS
+            MPRIS(self)
+        monitor = Gio.NetworkMonitor.get_default()
+        if monitor.get_network_available() and\
+                not monitor.get_network_metered() and\
+                self.settings.get_value("recent-youtube-dl"):
+            self.task_helper.run(install_youtube_dl)
+        StartupProfiler.stage("web services and mpris")
+        self.task_helper.run(self.db.update_sort_keys, lane=TaskLane.DB)
+        self.scanner.init_monitoring()
+        self.art_prewarmer.start()
+        if self.settings.get_value("auto-update") or self.tracks.is_empty():
+            self.scanner.update(ScanType.FULL)
+        StartupProfiler.stage("scanner")
+        StartupProfiler.report()
+
     def __save_state(self):
         """
             Save player state
         """
         if self.settings.get_value("save-state"):
-            if self.player.current_track.id is None or\
-                    self.player.current_track.storage_type &\
-                    StorageType.EPHEMERAL:
-                track_id = None
-            else:
-                track_id = self.player.current_track.id
-                # Save albums context
-                try:
-                    with open(LOLLYPOP_DATA_PATH + "/Albums.bin", "wb") as f:
-                        dump(self.player.albums, f)
-                except Exception as e:
-                    Logger.error("Application::__save_state(): %s" % e)
-            dump(track_id, open(LOLLYPOP_DATA_PATH + "/track_id.bin", "wb"))
-            dump([self.player.is_playing, self.player.is_party],
-                 open(LOLLYPOP_DATA_PATH + "/player.bin", "wb"))
-            dump(self.player.queue,
-                 open(LOLLYPOP_DATA_PATH + "/queue.bin", "wb"))
-            if self.player.current_track.id is not None:
-                position = self.player.position
-            else:
-                position = 0
-            dump(position, open(LOLLYPOP_DATA_PATH + "/position.bin", "wb"))
+            self.player.save_state()
         self.player.stop_all()
 
     def __vacuum(self):
@@ -356,7 +365,6 @@ class Application(Gtk.Application, ApplicationActions, ApplicationCmdline):
             self.artists.clean(False)
             self.genres.clean(False)
             SqlCursor.remove(self.db)
-            self.cache.clean(True)
 
             with SqlCursor(self.db) as sql:
                 sql.isolation_level = None
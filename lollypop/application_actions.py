@@ -172,7 +172,7 @@ class ApplicationActions:
             Search for new music
         """
         if App().window:
-            App().scanner.update(ScanType.FULL)
+            App().scanner.update(ScanType.FULL, use_index=False)
 
     def __on_about_activate_response(self, dialog, response_id):
         """
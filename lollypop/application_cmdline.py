@@ -62,6 +62,10 @@ class ApplicationCmdline:
                              GLib.OptionArg.NONE,
                              "Lollypop version",
                              None)
+        self.add_main_option("profile-startup", b"\0", GLib.OptionFlags.NONE,
+                             GLib.OptionArg.NONE,
+                             "Print startup timings and import costs",
+                             None)
         self.connect("command-line", self.__on_command_line)
         self.connect("handle-local-options", self.__on_handle_local_options)
 
@@ -17,7 +17,7 @@ from hashlib import md5
 from lollypop.artwork_manager import ArtworkManager
 from lollypop.logger import Logger
 from lollypop.define import CACHE_PATH, ALBUMS_WEB_PATH, ALBUMS_PATH
-from lollypop.define import ARTISTS_PATH, TimeStamp
+from lollypop.define import ARTISTS_PATH, TimeStamp, App
 from lollypop.utils import emit_signal
 from lollypop.utils_file import remove_oldest, create_dir
 
@@ -53,6 +53,7 @@ class Artwork(ArtworkManager):
                                               width, height)
             pixbuf = Gdk.pixbuf_get_from_surface(surface, 0, 0, width, height)
             self.save_pixbuf(pixbuf, self.add_extension(cache_path))
+            App().pixbuf_cache.invalidate((prefix, encoded))
         except Exception as e:
             Logger.error("Art::add_artwork_to_cache(): %s" % e)
 
@@ -65,6 +66,7 @@ class Artwork(ArtworkManager):
         try:
             from glob import glob
             encoded = md5(name.encode("utf-8")).hexdigest()
+            App().pixbuf_cache.invalidate((prefix, encoded))
             search = "%s/@%s@%s_*.%s" % (CACHE_PATH,
                                          prefix,
                                          encoded,
@@ -88,12 +90,17 @@ class Artwork(ArtworkManager):
         """
         try:
             encoded = md5(name.encode("utf-8")).hexdigest()
+            key = ((prefix, encoded), width, height)
+            pixbuf = App().pixbuf_cache.get(key)
+            if pixbuf is not None:
+                return pixbuf
             cache_path = "%s/@%s@%s_%s_%s" % (CACHE_PATH,
                                               prefix,
                                               encoded,
                                               width, height)
             pixbuf = GdkPixbuf.Pixbuf.new_from_file(
                 self.add_extension(cache_path))
+            App().pixbuf_cache.add(key, pixbuf)
             return pixbuf
         except Exception as e:
             Logger.warning("Art::get_artwork_from_cache(): %s" % e)
@@ -132,6 +139,7 @@ class Artwork(ArtworkManager):
         """
             Clean rounded artwork
         """
+        App().pixbuf_cache.clear()
         try:
             from pathlib import Path
             extension = self.extension_str
@@ -144,6 +152,7 @@ class Artwork(ArtworkManager):
         """
             Remove all covers from cache
         """
+        App().pixbuf_cache.clear()
         try:
             from pathlib import Path
             extension = self.extension_str
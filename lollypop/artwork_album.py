@@ -10,14 +10,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gio, GdkPixbuf, GLib, Gst
+from gi.repository import Gio, GdkPixbuf, GLib
 
 from random import choice
 from gettext import gettext as _
 from time import time
 
 from lollypop.helper_task import TaskHelper
-from lollypop.tagreader import Discoverer
+from lollypop.tagreader import Discoverer, TagReader
 from lollypop.artwork_manager import ArtworkManager
 from lollypop.artwork_downloader_album import AlbumArtworkDownloader
 from lollypop.logger import Logger
@@ -43,11 +43,15 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
         AlbumArtworkDownloader.__init__(self)
         create_dir(ALBUMS_PATH)
         create_dir(ALBUMS_WEB_PATH)
+        # Album id => lp_album_id for pixbufs in memory cache
+        self.__lp_album_ids = {}
         self.__favorite = App().settings.get_value(
             "favorite-cover").get_string()
         if not self.__favorite:
             self.__favorite = App().settings.get_default_value(
                 "favorite-cover").get_string()
+        self.connect("album-artwork-changed",
+                     self.__on_album_artwork_changed)
 
     def get_cache_path(self, album, width, height):
         """
@@ -74,6 +78,21 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
             Logger.error("AlbumArtwork::get_cache_path(): %s" % e)
         return None
 
+    def exists_in_cache(self, album, width, height):
+        """
+            True if artwork exists in cache
+            @param album as Album
+            @param width as int
+            @param height as int
+            @return bool
+        """
+        cache_path = "%s/%s_%s_%s" % (CACHE_PATH,
+                                      album.lp_album_id,
+                                      width,
+                                      height)
+        f = Gio.File.new_for_path(self.add_extension(cache_path))
+        return f.query_exists()
+
     def get_uri(self, album):
         """
             Look for artwork in dir:
@@ -153,7 +172,8 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
         return uris
 
     def get(self, album, width, height, scale_factor,
-            behaviour=ArtBehaviour.CACHE | ArtBehaviour.CROP_SQUARE):
+            behaviour=ArtBehaviour.CACHE | ArtBehaviour.CROP_SQUARE,
+            download=True):
         """
             Return a cairo surface for album_id, covers are cached as jpg.
             @param album as Album
@@ -161,6 +181,7 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
             @param height as int
             @param scale_factor factor as int
             @param behaviour as ArtBehaviour
+            @param download as bool: download artwork if missing
             @return cairo surface
             @thread safe
         """
@@ -169,6 +190,12 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
             return None
         width *= scale_factor
         height *= scale_factor
+        key = (album.lp_album_id, width, height, behaviour)
+        if not behaviour & ArtBehaviour.NO_CACHE:
+            pixbuf = App().pixbuf_cache.get(key)
+            if pixbuf is not None:
+                return pixbuf
+        self.__lp_album_ids[album.id] = album.lp_album_id
         # Blur when reading from tags can be slow, so prefer cached version
         # Blur allows us to ignore width/height until we want CROP/CACHE
         optimized_blur = behaviour & (ArtBehaviour.BLUR |
@@ -189,10 +216,15 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
             # Look in cache
             f = Gio.File.new_for_path(cache_path)
             if not behaviour & ArtBehaviour.NO_CACHE and f.query_exists():
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
                 if optimized_blur:
+                    pixbuf = self.load_pixbuf(cache_path,
+                                              width, height, behaviour)
                     pixbuf = self.load_behaviour(pixbuf,
                                                  width, height, behaviour)
+                else:
+                    pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
+                pixbuf = self.load_rounded(pixbuf, behaviour)
+                App().pixbuf_cache.add(key, pixbuf)
                 return pixbuf
             # Use favorite folder artwork
             if pixbuf is None:
@@ -201,11 +233,8 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
                 if uri is not None:
                     f = Gio.File.new_for_uri(uri)
                     (status, data, tag) = f.load_contents(None)
-                    bytes = GLib.Bytes.new(data)
-                    stream = Gio.MemoryInputStream.new_from_bytes(bytes)
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_stream(
-                        stream, None)
-                    stream.close()
+                    pixbuf = self.load_pixbuf_from_data(
+                        data, width, height, behaviour)
 
             # Use tags artwork
             if pixbuf is None and album.tracks and\
@@ -213,7 +242,8 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
                                           StorageType.EXTERNAL):
                 try:
                     track = choice(album.tracks)
-                    pixbuf = self.__get_pixbuf_from_tags(track.uri)
+                    pixbuf = self.__get_pixbuf_from_tags(
+                        track.uri, width, height, behaviour)
                 except Exception as e:
                     Logger.error("AlbumArtwork::get(): %s", e)
 
@@ -226,18 +256,19 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
                 if uri is not None:
                     f = Gio.File.new_for_uri(uri)
                     (status, data, tag) = f.load_contents(None)
-                    bytes = GLib.Bytes.new(data)
-                    stream = Gio.MemoryInputStream.new_from_bytes(bytes)
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_stream(
-                        stream, None)
-                    stream.close()
+                    pixbuf = self.load_pixbuf_from_data(
+                        data, width, height, behaviour)
             if pixbuf is None:
-                self.download(album.id)
+                if download:
+                    self.download(album.id)
                 return None
             pixbuf = self.load_behaviour(pixbuf,
                                          width, height, behaviour)
             if behaviour & ArtBehaviour.CACHE:
                 self.save_pixbuf(pixbuf, cache_path)
+            pixbuf = self.load_rounded(pixbuf, behaviour)
+            if not behaviour & ArtBehaviour.NO_CACHE:
+                App().pixbuf_cache.add(key, pixbuf)
             return pixbuf
         except Exception as e:
             Logger.warning("AlbumArtwork::get(): %s -> %s" % (uri, e))
@@ -260,12 +291,37 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
         except Exception as e:
             Logger.error("AlbumArtwork::add(): %s" % e)
 
+    def add_embedded(self, album, data, scale_factor):
+        """
+            Add artwork read from tags to store, album folder is untouched
+            Cache is rendered for default sizes, no signal is emitted:
+            scanner notifies views
+            @param album as Album
+            @param data as bytes
+            @param scale_factor as int
+            @thread safe
+        """
+        try:
+            store_path = "%s/%s" % (ALBUMS_PATH, album.lp_album_id)
+            store_path = self.add_extension(store_path)
+            self.save_pixbuf_from_data(store_path, data)
+            self.uncache(album)
+            for size in [ArtSize.BIG, ArtSize.SMALL]:
+                self.get(album, size, size, scale_factor,
+                         ArtBehaviour.CACHE |
+                         ArtBehaviour.CROP_SQUARE |
+                         ArtBehaviour.NO_CACHE)
+        except Exception as e:
+            Logger.error("AlbumArtwork::add_embedded(): %s" % e)
+
     def move(self, old_lp_album_id, new_lp_album_id):
         """
             Move artwork from an old id to a new id
             @param old_lp_album_id as str
             @param new_lp_album_id s str
         """
+        App().pixbuf_cache.invalidate(old_lp_album_id)
+        App().pixbuf_cache.invalidate(new_lp_album_id)
         try:
             for store in [ALBUMS_WEB_PATH, ALBUMS_PATH]:
                 old_path = "%s/%s" % (store, old_lp_album_id)
@@ -287,6 +343,8 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
             @param width as int
             @param height as int
         """
+        # Memory cache keys are not cache file sizes, remove all
+        App().pixbuf_cache.invalidate(album.lp_album_id)
         try:
             from pathlib import Path
             if width == -1 or height == -1:
@@ -343,8 +401,18 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
             @param album_id as int
         """
         if album_id is not None:
+            self.__invalidate(album_id)
             emit_signal(self, "album-artwork-changed", album_id)
 
+    def __invalidate(self, album_id):
+        """
+            Remove album pixbufs from memory cache
+            @param album_id as int
+        """
+        lp_album_id = self.__lp_album_ids.get(album_id, None)
+        if lp_album_id is not None:
+            App().pixbuf_cache.invalidate(lp_album_id)
+
     def __update_uri(self, album):
         """
             Check if album uri exists, update if not
@@ -424,10 +492,14 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
             src.move(dst, Gio.FileCopyFlags.OVERWRITE, None, None)
         self.__emit_update(album.id)
 
-    def __get_pixbuf_from_tags(self, uri):
+    def __get_pixbuf_from_tags(self, uri, width, height, behaviour):
         """
             Return cover from tags
             @param uri as str
+            @param width as int
+            @param height as int
+            @param behaviour as ArtBehaviour
+            @return GdkPixbuf.Pixbuf/None
         """
         pixbuf = None
         # Internal URI are just like sp:
@@ -436,19 +508,11 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
         try:
             discoverer = Discoverer()
             info = discoverer.get_info(uri)
-            exist = False
             if info is not None:
-                (exist, sample) = info.get_tags().get_sample_index("image", 0)
-                if not exist:
-                    (exist, sample) = info.get_tags().get_sample_index(
-                        "preview-image", 0)
-            if exist:
-                (exist, mapflags) = sample.get_buffer().map(Gst.MapFlags.READ)
-            if exist:
-                bytes = GLib.Bytes.new(mapflags.data)
-                stream = Gio.MemoryInputStream.new_from_bytes(bytes)
-                pixbuf = GdkPixbuf.Pixbuf.new_from_stream(stream, None)
-                stream.close()
+                data = TagReader().get_artwork(info.get_tags())
+                if data is not None:
+                    pixbuf = self.load_pixbuf_from_data(data, width,
+                                                        height, behaviour)
         except Exception as e:
             Logger.error("AlbumArtwork::__get_pixbuf_from_tags(): %s" % e)
         return pixbuf
@@ -513,3 +577,13 @@ class AlbumArtwork(ArtworkManager, AlbumArtworkDownloader):
         else:
             App().notify.send("Lollypop",
                               _("You need to install kid3-cli"))
+
+    def __on_album_artwork_changed(self, art, album_id):
+        """
+            Remove album pixbufs from memory cache, downloader may
+            have saved a new artwork
+            Connected first, so before any widget reloading artwork
+            @param art as AlbumArtwork
+            @param album_id as int
+        """
+        self.__invalidate(album_id)
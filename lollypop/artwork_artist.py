@@ -17,7 +17,7 @@ from hashlib import md5
 from lollypop.artwork_manager import ArtworkManager
 from lollypop.artwork_downloader_artist import ArtistArtworkDownloader
 from lollypop.logger import Logger
-from lollypop.define import CACHE_PATH
+from lollypop.define import App, CACHE_PATH
 from lollypop.define import ARTISTS_PATH, ArtBehaviour, ArtSize
 from lollypop.define import StoreExtention
 from lollypop.utils import emit_signal
@@ -97,6 +97,11 @@ class ArtistArtwork(ArtworkManager, ArtistArtworkDownloader):
             w = width
             h = height
         filename = self.__encode(artist)
+        key = (("artist", filename), width, height, behaviour)
+        if not behaviour & ArtBehaviour.NO_CACHE:
+            pixbuf = App().pixbuf_cache.get(key)
+            if pixbuf is not None:
+                return pixbuf
         cache_path = "%s/%s_%s_%s" % (CACHE_PATH, filename, w, h)
         cache_path = self.add_extension(cache_path)
         pixbuf = None
@@ -104,15 +109,18 @@ class ArtistArtwork(ArtworkManager, ArtistArtworkDownloader):
             # Look in cache
             f = Gio.File.new_for_path(cache_path)
             if not behaviour & ArtBehaviour.NO_CACHE and f.query_exists():
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
                 if optimized_blur:
+                    pixbuf = self.load_pixbuf(cache_path,
+                                              width, height, behaviour)
                     pixbuf = self.load_behaviour(pixbuf,
                                                  width, height, behaviour)
-                return pixbuf
+                else:
+                    pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
             else:
                 artwork_path = self.get_path(artist)
                 if artwork_path is not None:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file(artwork_path)
+                    pixbuf = self.load_pixbuf(artwork_path,
+                                              width, height, behaviour)
                 else:
                     self.download(artist)
                     return None
@@ -120,6 +128,9 @@ class ArtistArtwork(ArtworkManager, ArtistArtworkDownloader):
                                              width, height, behaviour)
                 if behaviour & ArtBehaviour.CACHE:
                     self.save_pixbuf(pixbuf, cache_path)
+            pixbuf = self.load_rounded(pixbuf, behaviour)
+            if not behaviour & ArtBehaviour.NO_CACHE:
+                App().pixbuf_cache.add(key, pixbuf)
             return pixbuf
         except Exception as e:
             Logger.warning("ArtistArtwork::get(): %s" % e)
@@ -142,6 +153,7 @@ class ArtistArtwork(ArtworkManager, ArtistArtworkDownloader):
         """
         try:
             from pathlib import Path
+            App().pixbuf_cache.invalidate(("artist", self.__encode(artist)))
             if self.extension == StoreExtention.PNG:
                 extension = "png"
             else:
@@ -12,13 +12,153 @@
 
 from gi.repository import Gio, GdkPixbuf, GLib, GObject
 
-from PIL import Image, ImageFilter
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+
+from collections import OrderedDict
+from math import ceil
+from threading import Lock
 
 from lollypop.define import CACHE_PATH
 from lollypop.define import App, StoreExtention, ArtSize, ArtBehaviour
+from lollypop.logger import Logger
 from lollypop.utils_file import create_dir
 
 
+class PixbufCache:
+    """
+        Process wide LRU cache for pixbufs loaded from artwork cache
+        Keys are tuples, first item is a group used for invalidation:
+        - lp_album_id for albums
+        - ("artist", encoded name) for artists
+        - (prefix, encoded name) for named artwork
+    """
+
+    def __init__(self):
+        """
+            Init cache, budget is read from settings
+        """
+        self.__lock = Lock()
+        self.__pixbufs = OrderedDict()
+        self.__groups = {}
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__budget = 0
+        App().settings.connect("changed::artwork-cache-size",
+                               self.__on_cache_size_changed)
+        self.__on_cache_size_changed()
+
+    def get(self, key):
+        """
+            Get pixbuf for key
+            @param key as tuple
+            @return GdkPixbuf.Pixbuf/None
+            @thread safe
+        """
+        with self.__lock:
+            item = self.__pixbufs.get(key, None)
+            if item is None:
+                self.__misses += 1
+                return None
+            self.__pixbufs.move_to_end(key)
+            self.__hits += 1
+            return item[0]
+
+    def add(self, key, pixbuf):
+        """
+            Add pixbuf for key, evict least recently used pixbufs
+            @param key as tuple
+            @param pixbuf as GdkPixbuf.Pixbuf
+            @thread safe
+        """
+        if pixbuf is None:
+            return
+        size = pixbuf.get_rowstride() * pixbuf.get_height()
+        with self.__lock:
+            # Bigger than budget, would evict everything else
+            if size > self.__budget:
+                return
+            self.__remove(key)
+            self.__pixbufs[key] = (pixbuf, size)
+            if key[0] not in self.__groups.keys():
+                self.__groups[key[0]] = set()
+            self.__groups[key[0]].add(key)
+            self.__size += size
+            self.__evict()
+
+    def invalidate(self, group):
+        """
+            Remove all pixbufs for group
+            @param group as str/tuple
+            @thread safe
+        """
+        with self.__lock:
+            for key in list(self.__groups.get(group, [])):
+                self.__remove(key)
+
+    def clear(self):
+        """
+            Remove all pixbufs
+            @thread safe
+        """
+        with self.__lock:
+            self.__pixbufs = OrderedDict()
+            self.__groups = {}
+            self.__size = 0
+
+    @property
+    def stats(self):
+        """
+            Get cache counters, sizes in bytes
+            @return {str: int}
+        """
+        with self.__lock:
+            return {"pixbufs": len(self.__pixbufs),
+                    "size": self.__size,
+                    "budget": self.__budget,
+                    "hits": self.__hits,
+                    "misses": self.__misses,
+                    "evictions": self.__evictions}
+
+#######################
+# PRIVATE             #
+#######################
+    def __remove(self, key):
+        """
+            Remove key from cache
+            @param key as tuple
+            @warning: lock needed
+        """
+        item = self.__pixbufs.pop(key, None)
+        if item is None:
+            return
+        self.__size -= item[1]
+        keys = self.__groups[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self.__groups[key[0]]
+
+    def __evict(self):
+        """
+            Remove least recently used pixbufs until cache fits budget
+            @warning: lock needed
+        """
+        while self.__size > self.__budget and self.__pixbufs:
+            self.__remove(next(iter(self.__pixbufs)))
+            self.__evictions += 1
+
+    def __on_cache_size_changed(self, *ignore):
+        """
+            Update budget
+        """
+        value = App().settings.get_value("artwork-cache-size").get_int32()
+        with self.__lock:
+            self.__budget = max(0, value) * 1024 * 1024
+            self.__evict()
+        Logger.debug("PixbufCache: budget %s MB", value)
+
+
 class ArtworkManager(GObject.GObject):
     """
         Common methods for artworks manager
@@ -33,6 +173,18 @@ class ArtworkManager(GObject.GObject):
                               (GObject.TYPE_PYOBJECT,)),
     }
 
+    __BLUR_DOWNSCALE = 4
+    __BLUR_GAUSSIANS = [(ArtBehaviour.BLUR, 25),
+                        (ArtBehaviour.BLUR_HARD, 50),
+                        (ArtBehaviour.BLUR_MAX, 100)]
+    __BORDER_RADIUS = 5
+    __MASK_ANTIALIAS = 4
+    __MASKS_COUNT = 16
+
+    # Round masks are shared by all managers
+    __masks = OrderedDict()
+    __masks_lock = Lock()
+
     def __init__(self):
         """
             Init artwork manager
@@ -65,9 +217,46 @@ class ArtworkManager(GObject.GObject):
         else:
             return "%s.jpg" % path
 
+    def load_pixbuf(self, path, width, height, behaviour):
+        """
+            Load pixbuf from file at smallest size needed by load_behaviour()
+            @param path as str
+            @param width as int
+            @param height as int
+            @param behaviour as ArtBehaviour
+            @return GdkPixbuf.Pixbuf
+        """
+        (info, src_width, src_height) = GdkPixbuf.Pixbuf.get_file_info(path)
+        if info is not None:
+            (decode_width, decode_height) = self.__get_decode_size(
+                src_width, src_height, width, height, behaviour)
+            if decode_width != src_width or decode_height != src_height:
+                return GdkPixbuf.Pixbuf.new_from_file_at_scale(
+                    path, decode_width, decode_height, False)
+        return GdkPixbuf.Pixbuf.new_from_file(path)
+
+    def load_pixbuf_from_data(self, data, width, height, behaviour):
+        """
+            Load pixbuf from data at smallest size needed by load_behaviour()
+            @param data as bytes
+            @param width as int
+            @param height as int
+            @param behaviour as ArtBehaviour
+            @return GdkPixbuf.Pixbuf
+        """
+        loader = GdkPixbuf.PixbufLoader.new()
+        loader.connect("size-prepared", self.__on_size_prepared,
+                       width, height, behaviour)
+        try:
+            loader.write(data)
+        finally:
+            loader.close()
+        return loader.get_pixbuf()
+
     def load_behaviour(self, pixbuf, width, height, behaviour):
         """
             Load behaviour on pixbuf
+            Crop is a view on pixbuf, blur runs on a reduced pixbuf
             @param width as int
             @param height as int
             @param behaviour as ArtBehaviour
@@ -79,28 +268,43 @@ class ArtworkManager(GObject.GObject):
         elif behaviour & ArtBehaviour.CROP:
             pixbuf = self._crop_pixbuf(pixbuf, width, height)
 
-        # Handle blur
-        if behaviour & ArtBehaviour.BLUR:
-            pixbuf = pixbuf.scale_simple(width,
-                                         height,
-                                         GdkPixbuf.InterpType.NEAREST)
-            pixbuf = self._get_blur(pixbuf, 25)
-        elif behaviour & ArtBehaviour.BLUR_HARD:
+        gaussian = self.__get_gaussian(behaviour)
+        if gaussian:
+            # Blurring a reduced pixbuf with a reduced radius is visually
+            # the same and processes BLUR_DOWNSCALE² less pixels
+            pixbuf = pixbuf.scale_simple(
+                max(1, width // self.__BLUR_DOWNSCALE),
+                max(1, height // self.__BLUR_DOWNSCALE),
+                GdkPixbuf.InterpType.BILINEAR)
+            pixbuf = self._get_blur(pixbuf,
+                                    gaussian / self.__BLUR_DOWNSCALE)
             pixbuf = pixbuf.scale_simple(width,
                                          height,
-                                         GdkPixbuf.InterpType.NEAREST)
-            pixbuf = self._get_blur(pixbuf, 50)
-        elif behaviour & ArtBehaviour.BLUR_MAX:
-            pixbuf = pixbuf.scale_simple(width,
-                                         height,
-                                         GdkPixbuf.InterpType.NEAREST)
-            pixbuf = self._get_blur(pixbuf, 100)
-        else:
+                                         GdkPixbuf.InterpType.BILINEAR)
+        elif pixbuf.get_width() != width or pixbuf.get_height() != height:
             pixbuf = pixbuf.scale_simple(width,
                                          height,
                                          GdkPixbuf.InterpType.BILINEAR)
         return pixbuf
 
+    def load_rounded(self, pixbuf, behaviour):
+        """
+            Round pixbuf corners for ROUNDED and ROUNDED_BORDER
+            Result has an alpha channel, do not save it to artwork cache
+            @param pixbuf as GdkPixbuf.Pixbuf
+            @param behaviour as ArtBehaviour
+            @return GdkPixbuf.Pixbuf
+        """
+        if pixbuf is None:
+            return None
+        if behaviour & ArtBehaviour.ROUNDED:
+            radius = min(pixbuf.get_width(), pixbuf.get_height()) // 2
+        elif behaviour & ArtBehaviour.ROUNDED_BORDER:
+            radius = self.__BORDER_RADIUS
+        else:
+            return pixbuf
+        return self._get_rounded(pixbuf, radius)
+
     def update_art_size(self):
         """
             Update value with some check
@@ -215,37 +419,34 @@ class ArtworkManager(GObject.GObject):
 
     def _get_blur(self, pixbuf, gaussian):
         """
-            Blur surface using PIL
+            Blur pixbuf using PIL
             @param pixbuf as GdkPixbuf.Pixbuf
-            @param gaussian as int
+            @param gaussian as float
             @return GdkPixbuf.Pixbuf
         """
         if pixbuf is None:
             return None
+        image = self.__get_image(pixbuf)
+        image = image.filter(ImageFilter.GaussianBlur(gaussian))
+        return self.__get_pixbuf(image)
+
+    def _get_rounded(self, pixbuf, radius):
+        """
+            Get pixbuf with round corners using PIL
+            @param pixbuf as GdkPixbuf.Pixbuf
+            @param radius as int
+            @return GdkPixbuf.Pixbuf
+        """
         width = pixbuf.get_width()
         height = pixbuf.get_height()
-        data = pixbuf.get_pixels()
-        stride = pixbuf.get_rowstride()
-        has_alpha = pixbuf.get_has_alpha()
-        if has_alpha:
-            mode = "RGBA"
-            dst_row_stride = width * 4
+        mask = self.__get_round_mask(width, height, radius)
+        image = self.__get_image(pixbuf)
+        if pixbuf.get_has_alpha():
+            mask = ImageChops.multiply(image.getchannel("A"), mask)
         else:
-            mode = "RGB"
-            dst_row_stride = width * 3
-        tmp = Image.frombytes(mode, (width, height),
-                              data, "raw", mode, stride)
-        tmp = tmp.filter(ImageFilter.GaussianBlur(gaussian))
-        bytes = GLib.Bytes.new(tmp.tobytes())
-        del pixbuf
-        pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(bytes,
-                                                 GdkPixbuf.Colorspace.RGB,
-                                                 has_alpha,
-                                                 8,
-                                                 width,
-                                                 height,
-                                                 dst_row_stride)
-        return pixbuf
+            image = image.convert("RGBA")
+        image.putalpha(mask)
+        return self.__get_pixbuf(image)
 
 #######################
 # PRIVATE             #
@@ -258,3 +459,121 @@ class ArtworkManager(GObject.GObject):
             self.__extension = StoreExtention.PNG
         else:
             self.__extension = StoreExtention.JPG
+        # Cached pixbufs were loaded with previous extension
+        App().pixbuf_cache.clear()
+
+    def __get_gaussian(self, behaviour):
+        """
+            Get gaussian radius for behaviour
+            @param behaviour as ArtBehaviour
+            @return int, 0 if no blur
+        """
+        for (flag, gaussian) in self.__BLUR_GAUSSIANS:
+            if behaviour & flag:
+                return gaussian
+        return 0
+
+    def __get_decode_size(self, src_width, src_height,
+                          width, height, behaviour):
+        """
+            Get smallest size keeping ratio that load_behaviour() can crop
+            and scale to width/height without upscaling
+            @param src_width as int
+            @param src_height as int
+            @param width as int
+            @param height as int
+            @param behaviour as ArtBehaviour
+            @return (int, int)
+        """
+        if self.__get_gaussian(behaviour):
+            width = max(1, width // self.__BLUR_DOWNSCALE)
+            height = max(1, height // self.__BLUR_DOWNSCALE)
+        if behaviour & ArtBehaviour.CROP_SQUARE:
+            factor = max(width, height) / min(src_width, src_height)
+        else:
+            factor = max(width / src_width, height / src_height)
+        if factor >= 1:
+            return (src_width, src_height)
+        return (max(1, ceil(src_width * factor)),
+                max(1, ceil(src_height * factor)))
+
+    def __get_round_mask(self, width, height, radius):
+        """
+            Get an antialiased round rectangle mask
+            @param width as int
+            @param height as int
+            @param radius as int
+            @return PIL.Image.Image, mode L
+        """
+        radius = min(radius, width // 2, height // 2)
+        key = (width, height, radius)
+        with self.__masks_lock:
+            mask = self.__masks.get(key, None)
+            if mask is not None:
+                self.__masks.move_to_end(key)
+                return mask
+        # Draw bigger and reduce for antialiasing
+        antialias = self.__MASK_ANTIALIAS
+        mask = Image.new("L", (width * antialias, height * antialias), 0)
+        ImageDraw.Draw(mask).rounded_rectangle(
+            (0, 0, width * antialias - 1, height * antialias - 1),
+            radius * antialias, fill=255)
+        mask = mask.resize((width, height), Image.LANCZOS)
+        with self.__masks_lock:
+            self.__masks[key] = mask
+            if len(self.__masks) > self.__MASKS_COUNT:
+                self.__masks.popitem(last=False)
+        return mask
+
+    def __get_image(self, pixbuf):
+        """
+            Get a PIL image from pixbuf
+            @param pixbuf as GdkPixbuf.Pixbuf
+            @return PIL.Image.Image
+        """
+        mode = "RGBA" if pixbuf.get_has_alpha() else "RGB"
+        width = pixbuf.get_width()
+        height = pixbuf.get_height()
+        rowstride = pixbuf.get_rowstride()
+        length = width * pixbuf.get_n_channels()
+        data = pixbuf.read_pixel_bytes().get_data()
+        # Sub pixbufs keep parent rowstride and last row is not padded,
+        # copy() keeps rowstride too, so slice rows to exact length
+        if rowstride != length:
+            data = b"".join([data[i * rowstride:i * rowstride + length]
+                             for i in range(0, height)])
+        return Image.frombytes(mode, (width, height), data)
+
+    def __get_pixbuf(self, image):
+        """
+            Get a pixbuf from PIL image
+            @param image as PIL.Image.Image, mode RGB or RGBA
+            @return GdkPixbuf.Pixbuf
+        """
+        has_alpha = image.mode == "RGBA"
+        (width, height) = image.size
+        bytes = GLib.Bytes.new(image.tobytes())
+        return GdkPixbuf.Pixbuf.new_from_bytes(bytes,
+                                               GdkPixbuf.Colorspace.RGB,
+                                               has_alpha,
+                                               8,
+                                               width,
+                                               height,
+                                               width * (4 if has_alpha
+                                                        else 3))
+
+    def __on_size_prepared(self, loader, src_width, src_height,
+                           width, height, behaviour):
+        """
+            Decode at smallest size needed
+            @param loader as GdkPixbuf.PixbufLoader
+            @param src_width as int
+            @param src_height as int
+            @param width as int
+            @param height as int
+            @param behaviour as ArtBehaviour
+        """
+        (decode_width, decode_height) = self.__get_decode_size(
+            src_width, src_height, width, height, behaviour)
+        if decode_width != src_width or decode_height != src_height:
+            loader.set_size(decode_width, decode_height)
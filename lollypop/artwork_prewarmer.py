@@ -0,0 +1,179 @@
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import GLib
+
+from time import monotonic
+
+from lollypop.define import App, ArtBehaviour, ArtSize, ScanUpdate, TaskLane
+from lollypop.objects_album import Album
+from lollypop.logger import Logger
+
+
+class ArtworkPrewarmer:
+    """
+        Fill artwork cache at idle time, before widgets ask for artwork
+        Albums are prewarmed one by one in TaskLane.ARTWORK, prewarming
+        waits while user is active or while widgets are loading artwork
+    """
+
+    # Same behaviour as AlbumSimpleWidget
+    __BEHAVIOUR = ArtBehaviour.CACHE | ArtBehaviour.CROP_SQUARE
+    __IDLE_DELAY = 2  # Seconds without user activity
+    __BUSY_DELAY = 500  # Milliseconds before checking activity again
+
+    def __init__(self):
+        """
+            Init prewarmer, nothing is done before start()
+        """
+        self.__started = False
+        self.__running = False
+        self.__timeout_id = None
+        self.__active_time = 0
+        # Albums wanted by current view, prewarmed first
+        self.__view_album_ids = []
+        # Albums added by scanner
+        self.__new_album_ids = []
+        self.__scanned_album_ids = []
+        self.__size = ArtSize.BIG
+        self.__scale_factor = 1
+
+    def start(self):
+        """
+            Start prewarming, call it when window is shown
+        """
+        if self.__started:
+            return
+        self.__started = True
+        self.__scale_factor = App().window.get_scale_factor()
+        for signal in ["key-press-event",
+                       "button-press-event",
+                       "scroll-event"]:
+            App().window.connect(signal, self.__on_user_event)
+        App().scanner.connect("updated", self.__on_collection_updated)
+        App().scanner.connect("scan-finished", self.__on_scan_finished)
+        self.__schedule()
+
+    def prewarm(self, album_ids, size, scale_factor):
+        """
+            Prewarm artwork for view albums, replaces previous view albums
+            @param album_ids as [int], most wanted first
+            @param size as int
+            @param scale_factor as int
+        """
+        self.__view_album_ids = list(album_ids)
+        self.__size = size
+        self.__scale_factor = scale_factor
+        self.__schedule()
+
+    def stop(self):
+        """
+            Stop prewarming, pending albums are forgotten
+        """
+        self.__view_album_ids = []
+        self.__new_album_ids = []
+        self.__scanned_album_ids = []
+        if self.__timeout_id is not None:
+            GLib.source_remove(self.__timeout_id)
+            self.__timeout_id = None
+
+#######################
+# PRIVATE             #
+#######################
+    def __schedule(self, delay=0):
+        """
+            Prewarm next album later
+            @param delay as int: milliseconds
+        """
+        if not self.__started or self.__running or\
+                self.__timeout_id is not None:
+            return
+        if self.__view_album_ids or self.__new_album_ids:
+            self.__timeout_id = GLib.timeout_add(delay, self.__prewarm_next,
+                                                 priority=GLib.PRIORITY_LOW)
+
+    def __prewarm_next(self):
+        """
+            Prewarm next album if user is idle
+        """
+        self.__timeout_id = None
+        if monotonic() - self.__active_time < self.__IDLE_DELAY or\
+                App().task_helper.pending(TaskLane.UI_ARTWORK):
+            self.__schedule(self.__BUSY_DELAY)
+            return
+        if self.__view_album_ids:
+            album_id = self.__view_album_ids.pop(0)
+        elif self.__new_album_ids:
+            album_id = self.__new_album_ids.pop(0)
+        else:
+            return
+        self.__running = True
+        App().task_helper.run(self.__prewarm, album_id,
+                              self.__size, self.__scale_factor,
+                              callback=(self.__on_prewarmed,),
+                              lane=TaskLane.ARTWORK)
+
+    def __prewarm(self, album_id, size, scale_factor):
+        """
+            Create album artwork cache file
+            @param album_id as int
+            @param size as int
+            @param scale_factor as int
+        """
+        try:
+            album = Album(album_id)
+            # Removed while waiting
+            if not album.lp_album_id:
+                return
+            width = size * scale_factor
+            if App().album_art.exists_in_cache(album, width, width):
+                return
+            # Cache file only, do not evict pixbufs used by widgets
+            # Local artwork only, widgets will download missing artwork
+            App().album_art.get(album, size, size, scale_factor,
+                                self.__BEHAVIOUR | ArtBehaviour.NO_CACHE,
+                                False)
+        except Exception as e:
+            Logger.error("ArtworkPrewarmer::__prewarm(): %s", e)
+
+    def __on_prewarmed(self, *ignore):
+        """
+            Prewarm next album
+        """
+        self.__running = False
+        self.__schedule()
+
+    def __on_user_event(self, *ignore):
+        """
+            Delay prewarming
+        """
+        self.__active_time = monotonic()
+        return False
+
+    def __on_collection_updated(self, scanner, item, scan_update):
+        """
+            Remember added albums
+            @param scanner as CollectionScanner
+            @param item as CollectionItem
+            @param scan_update as ScanUpdate
+        """
+        if scan_update == ScanUpdate.ADDED:
+            self.__scanned_album_ids.append(item.album_id)
+
+    def __on_scan_finished(self, scanner, *ignore):
+        """
+            Prewarm added albums
+            @param scanner as CollectionScanner
+        """
+        self.__new_album_ids += self.__scanned_album_ids
+        self.__scanned_album_ids = []
+        self.__schedule()
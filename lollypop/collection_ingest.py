@@ -0,0 +1,347 @@
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio
+
+from string import ascii_uppercase, ascii_lowercase
+
+from lollypop.define import App, Type
+from lollypop.database_search import SearchDatabase
+from lollypop.logger import Logger
+from lollypop.utils import format_artist_name, sql_escape
+from lollypop.utils import get_lollypop_album_id, get_lollypop_track_id
+
+# SQLite NOCASE only folds ASCII characters
+NOCASE = str.maketrans(ascii_uppercase, ascii_lowercase)
+
+
+class CollectionIngest:
+    """
+        Save scanned items into DB by chunks:
+        - artists and genres are resolved with in-memory maps
+        - tracks and their artists/genres are inserted with executemany()
+        - album artists, genres and durations are updated once per album
+        Same result as CollectionScanner.save_album()/save_track()
+        Must be used from a SqlCursor.add() scope
+    """
+
+    def __init__(self, disable_compilations):
+        """
+            Init ingest
+            @param disable_compilations as bool
+        """
+        self.__disable_compilations = disable_compilations
+        self.__pending_new_artist_ids = []
+        self.__need_clean = False
+        self.__artists = {}
+        self.__genres = {}
+        self.__search = SearchDatabase(App().db)
+        self.__load()
+
+    def save(self, items):
+        """
+            Save items into DB
+            @param items as [CollectionItem]
+        """
+        albums = {}
+        for item in items:
+            self.__save_album(item, albums)
+            self.__save_track(item)
+        values = [(item.track_name, item.uri, item.duration,
+                   item.tracknumber, item.discnumber, item.discname,
+                   item.album_id, item.original_year,
+                   item.original_timestamp, item.track_pop, item.track_rate,
+                   item.track_loved, item.track_ltime, item.track_mtime,
+                   item.mb_track_id, item.lp_track_id, item.bpm,
+                   item.storage_type) for item in items]
+        track_ids = App().tracks.add_many(values)
+        artists = []
+        genres = []
+        for (item, track_id) in zip(items, track_ids):
+            item.track_id = track_id
+            artists += [(track_id, artist_id)
+                        for artist_id in dict.fromkeys(item.artist_ids)]
+            genres += [(track_id, genre_id)
+                       for genre_id in dict.fromkeys(item.genre_ids)]
+        App().tracks.add_many_artists(artists)
+        App().tracks.add_many_genres(genres)
+        self.__update_albums(items)
+        artist_ids = []
+        for item in items:
+            artist_ids += item.artist_ids + item.album_artist_ids
+        self.__search.update(track_ids,
+                             [item.album_id for item in items],
+                             artist_ids)
+        if self.__need_clean:
+            App().tracks.clean(False)
+            App().albums.clean(False)
+            App().artists.clean(False)
+            self.__need_clean = False
+            self.__load()
+        App().albums.update_durations([item.album_id for item in items])
+
+#######################
+# PRIVATE             #
+#######################
+    def __load(self):
+        """
+            Load artists and genres maps
+        """
+        self.__artists = {}
+        self.__genres = {}
+        for (artist_id, name, sortname, mb_artist_id) in\
+                App().artists.get_all_rows():
+            key = name.translate(NOCASE)
+            if key not in self.__artists.keys():
+                self.__artists[key] = []
+            self.__artists[key].append(
+                [artist_id, name, sortname, mb_artist_id])
+        for (genre_id, name) in App().genres.get_all_rows():
+            key = sql_escape(name)
+            if key not in self.__genres.keys():
+                self.__genres[key] = genre_id
+        Logger.debug("CollectionIngest::__load(): %s artists, %s genres",
+                     len(self.__artists), len(self.__genres))
+
+    def __save_album(self, item, albums):
+        """
+            Add album artists and album to DB
+            @param item as CollectionItem
+            @param albums as {}: album ids for this chunk
+        """
+        (item.new_album_artist_ids,
+         item.album_artist_ids) = self.__add_artists(item.album_artists,
+                                                     item.aa_sortnames,
+                                                     item.mb_album_artist_id)
+        # We handle artists already created by any previous track
+        for artist_id in item.album_artist_ids:
+            if artist_id in self.__pending_new_artist_ids:
+                item.new_album_artist_ids.append(artist_id)
+                self.__pending_new_artist_ids.remove(artist_id)
+        item.lp_album_id = get_lollypop_album_id(item.album_name,
+                                                 item.album_artists,
+                                                 item.year,
+                                                 item.mb_album_id)
+        (item.new_album, item.album_id) = self.__add_album(item, albums)
+
+    def __save_track(self, item):
+        """
+            Add track artists and genres to DB
+            @param item as CollectionItem
+        """
+        (item.new_artist_ids,
+         item.artist_ids) = self.__add_artists(item.artists,
+                                               item.a_sortnames,
+                                               item.mb_artist_id)
+        self.__pending_new_artist_ids += item.new_artist_ids
+        missing_artist_ids = list(
+            set(item.album_artist_ids) - set(item.artist_ids))
+        # Special case for broken tags
+        # If all artist album tags are missing
+        # Can't do more because don't want to break split album behaviour
+        if len(missing_artist_ids) == len(item.album_artist_ids):
+            item.artist_ids += missing_artist_ids
+        if item.genres is None:
+            (item.new_genre_ids, item.genre_ids) = ([], [Type.WEB])
+        else:
+            (item.new_genre_ids, item.genre_ids) = self.__add_genres(
+                item.genres)
+        item.lp_track_id = get_lollypop_track_id(item.track_name,
+                                                 item.artists,
+                                                 item.album_name,
+                                                 item.mb_track_id)
+
+    def __update_albums(self, items):
+        """
+            Update albums artists, year and genres
+            First item for album gets new album artist ids, like
+            CollectionScanner.update_album() does before notifying UI
+            @param items as [CollectionItem]
+        """
+        first_items = {}
+        last_items = {}
+        year_items = {}
+        genre_ids = {}
+        for item in items:
+            if item.album_id not in first_items.keys():
+                first_items[item.album_id] = item
+                genre_ids[item.album_id] = {}
+            last_items[item.album_id] = item
+            if item.year is not None:
+                year_items[item.album_id] = item
+            genre_ids[item.album_id].update(dict.fromkeys(item.genre_ids))
+        for (album_id, item) in last_items.items():
+            if item.album_artist_ids and not item.compilation:
+                App().albums.set_artist_ids(album_id, item.album_artist_ids)
+            # Set artist ids based on content
+            else:
+                if item.compilation:
+                    new_album_artist_ids = [Type.COMPILATIONS]
+                else:
+                    new_album_artist_ids = App().albums.calculate_artist_ids(
+                        album_id, self.__disable_compilations)
+                App().albums.set_artist_ids(album_id, new_album_artist_ids)
+                first_item = first_items[album_id]
+                first_item.new_album_artist_ids = []
+                for artist_id in new_album_artist_ids:
+                    if artist_id in self.__pending_new_artist_ids:
+                        first_item.new_album_artist_ids.append(artist_id)
+                        self.__pending_new_artist_ids.remove(artist_id)
+            if album_id in year_items.keys():
+                App().albums.set_year(album_id, year_items[album_id].year)
+                App().albums.set_timestamp(album_id,
+                                           year_items[album_id].timestamp)
+            for genre_id in genre_ids[album_id].keys():
+                App().albums.add_genre(album_id, genre_id)
+
+    def __add_album(self, item, albums):
+        """
+            Get album id for item, add album if missing
+            @param item as CollectionItem
+            @param albums as {}: album ids for this chunk
+            @return (added as bool, album_id as int)
+        """
+        added = False
+        uri = item.uri
+        if uri.find("://") != -1:
+            parent = Gio.File.new_for_uri(uri).get_parent()
+            if parent is not None:
+                uri = parent.get_uri()
+        key = (item.album_name, item.mb_album_id,
+               tuple(item.album_artist_ids), item.storage_type)
+        if key in albums.keys():
+            (album_id, album_uri) = albums[key]
+        else:
+            album_id = App().albums.get_id(item.album_name,
+                                           item.mb_album_id,
+                                           item.album_artist_ids)
+            # Check storage type did not changed, remove album then
+            # Clean is delayed: tracks for this chunk are not in DB yet
+            if album_id is not None and\
+                    App().albums.get_storage_type(album_id) !=\
+                    item.storage_type:
+                App().tracks.remove_album(album_id)
+                self.__need_clean = True
+                album_id = None
+            if album_id is None:
+                added = True
+                album_id = App().albums.add(item.album_name,
+                                            item.mb_album_id,
+                                            item.lp_album_id,
+                                            item.album_artist_ids,
+                                            uri,
+                                            item.album_loved,
+                                            item.album_pop,
+                                            item.album_rate,
+                                            item.album_synced,
+                                            item.album_mtime,
+                                            item.storage_type)
+                album_uri = uri
+            else:
+                album_uri = App().albums.get_uri(album_id)
+        # Check if path did not change
+        if album_uri != uri:
+            App().albums.set_uri(album_id, uri)
+        albums[key] = (album_id, uri)
+        return (added, album_id)
+
+    def __add_artists(self, artists, sortnames, mb_artist_id):
+        """
+            Get artist ids, add missing artists to DB
+            Same as TagReader.add_artists() but only update changed values
+            @param artists as str
+            @param sortnames as str
+            @param mb_artist_id as str
+            @return ([int], [int]): (added artist ids, artist ids)
+        """
+        artist_ids = []
+        added_artist_ids = []
+        artistsplit = artists.split(";")
+        sortsplit = sortnames.split(";")
+        sortlen = len(sortsplit)
+        mbidsplit = mb_artist_id.split(";")
+        mbidlen = len(mbidsplit)
+        if len(artistsplit) != mbidlen:
+            mbidsplit = []
+            mbidlen = 0
+        i = 0
+        for artist in artistsplit:
+            artist = artist.strip()
+            if artist == "":
+                continue
+            if i >= mbidlen or mbidsplit[i] == "":
+                mbid = None
+            else:
+                mbid = mbidsplit[i].strip()
+            if i >= sortlen or sortsplit[i] == "":
+                sortname = None
+            else:
+                sortname = sortsplit[i].strip()
+            row = self.__get_artist(artist, mbid)
+            if row is None:
+                if sortname is None:
+                    sortname = format_artist_name(artist)
+                artist_id = App().artists.add(artist, sortname, mbid)
+                key = artist.translate(NOCASE)
+                if key not in self.__artists.keys():
+                    self.__artists[key] = []
+                self.__artists[key].append([artist_id, artist, sortname, mbid])
+                added_artist_ids.append(artist_id)
+            else:
+                artist_id = row[0]
+                # Name lookup is NOCASE, check if we need to update name
+                if row[1] != artist:
+                    App().artists.set_name(artist_id, artist)
+                    row[1] = artist
+                if sortname is not None and row[2] != sortname:
+                    App().artists.set_sortname(artist_id, sortname)
+                    row[2] = sortname
+                if mbid is not None and row[3] != mbid:
+                    App().artists.set_mb_artist_id(artist_id, mbid)
+                    row[3] = mbid
+            i += 1
+            artist_ids.append(artist_id)
+        return (added_artist_ids, artist_ids)
+
+    def __get_artist(self, name, mb_artist_id):
+        """
+            Get artist row, same lookup as ArtistsDatabase.get_id()
+            @param name as str
+            @param mb_artist_id as str
+            @return [int, str, str, str]/None
+        """
+        for row in self.__artists.get(name.translate(NOCASE), []):
+            if not mb_artist_id or row[3] is None or\
+                    row[3] == mb_artist_id:
+                return row
+        return None
+
+    def __add_genres(self, genres):
+        """
+            Get genre ids, add missing genres to DB
+            @param genres as str
+            @return ([int], [int]): (added genre ids, genre ids)
+        """
+        genre_ids = []
+        added_genre_ids = []
+        for genre in genres.split(";"):
+            genre = genre.strip()
+            if genre == "":
+                continue
+            key = sql_escape(genre)
+            genre_id = self.__genres.get(key, None)
+            if genre_id is None:
+                genre_id = App().genres.add(genre)
+                self.__genres[key] = genre_id
+                added_genre_ids.append(genre_id)
+            genre_ids.append(genre_id)
+        return (added_genre_ids, genre_ids)
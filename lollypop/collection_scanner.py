@@ -22,22 +22,33 @@ from gi.repository.Gio import FILE_ATTRIBUTE_STANDARD_NAME, \
                               FILE_ATTRIBUTE_STANDARD_CONTENT_TYPE
 
 from gettext import gettext as _
+from hashlib import md5
+from shutil import rmtree
+from tempfile import mkdtemp
 from time import time, sleep
 from urllib.parse import urlparse
+from threading import Lock
 from multiprocessing import cpu_count
 
 from lollypop.collection_item import CollectionItem
+from lollypop.collection_ingest import CollectionIngest
 from lollypop.inotify import Inotify
 from lollypop.define import App, ScanType, Type, StorageType, ScanUpdate
-from lollypop.define import FileType
+from lollypop.define import FileType, TaskLane
 from lollypop.sqlcursor import SqlCursor
 from lollypop.tagreader import TagReader, Discoverer
+from lollypop.tagreader_pool import new_pool, read_file_tags
+from lollypop.tagreader_pool import get_artwork_key
 from lollypop.logger import Logger
 from lollypop.database_history import History
+from lollypop.database_dirs import DirsDatabase
+from lollypop.database_search import SearchDatabase
+from lollypop.objects_album import Album
 from lollypop.objects_track import Track
 from lollypop.utils_file import is_audio, is_pls, get_mtime, get_file_type
 from lollypop.utils_album import tracks_to_albums
 from lollypop.utils import emit_signal, profile, split_list
+from lollypop.utils import get_workers_count
 from lollypop.utils import get_lollypop_album_id, get_lollypop_track_id
 
 
@@ -60,6 +71,9 @@ class CollectionScanner(GObject.GObject, TagReader):
                     (GObject.TYPE_PYOBJECT, int))
     }
 
+    # Tracks saved to DB between two UI notifications
+    __SAVE_CHUNK_SIZE = 1000
+
     def __init__(self):
         """
             Init collection scanner
@@ -70,35 +84,59 @@ class CollectionScanner(GObject.GObject, TagReader):
         self.__items = []
         self.__notified_ids = []
         self.__pending_new_artist_ids = []
-        self.__history = History()
+        self.__listed_files = set()
+        self.__listed_dirs = {}
+        self.__unchanged_dirs = set()
+        # Embedded artworks: album keys and uri => file in artwork dir
+        self.__import_artwork = False
+        self.__artwork_keys = set()
+        self.__artworks = {}
+        self.__artwork_lock = Lock()
+        self.__artwork_dir = None
+        self.__scale_factor = 1
+        # Created on first scan, needs a full count of history
+        self.__history = None
+        self.__dirs = DirsDatabase(App().db)
+        self.__search = SearchDatabase(App().db)
         self.__progress_total = 1
         self.__progress_count = 0
         self.__progress_fraction = 0
         self.__disable_compilations = not App().settings.get_value(
                 "show-compilations")
-        if App().settings.get_value("auto-update"):
+        self.__inotify = None
+        App().task_helper.run(App().albums.update_max_count,
+                              lane=TaskLane.DB)
+
+    def init_monitoring(self):
+        """
+            Monitor collection if auto update is enabled
+        """
+        if App().settings.get_value("auto-update") and\
+                self.__inotify is None:
             self.__inotify = Inotify()
-        else:
-            self.__inotify = None
-        App().albums.update_max_count()
 
-    def update(self, scan_type, uris=[]):
+    def update(self, scan_type, uris=[], use_index=True):
         """
             Update database
             @param scan_type as ScanType
             @param uris as [str]
+            @param use_index as bool => skip directories not modified
+                                        since last scan
         """
         self.__disable_compilations = not App().settings.get_value(
                 "show-compilations")
+        self.__import_artwork = App().settings.get_value(
+                "import-embedded-artwork")
+        self.__scale_factor = App().window.get_scale_factor()
         App().lookup_action("update_db").set_enabled(False)
         # Stop previous scan
         if self.is_locked() and scan_type != ScanType.EXTERNAL:
             self.stop()
-            GLib.timeout_add(250, self.update, scan_type, uris)
+            GLib.timeout_add(250, self.update, scan_type, uris, use_index)
             return
         elif App().ws_director.collection_ws is not None and\
                 not App().ws_director.collection_ws.stop():
-            GLib.timeout_add(250, self.update, scan_type, uris)
+            GLib.timeout_add(250, self.update, scan_type, uris, use_index)
             return
         else:
             if scan_type == ScanType.FULL:
@@ -111,7 +149,8 @@ class CollectionScanner(GObject.GObject, TagReader):
                 App().window.container.progress.set_fraction(0, self)
             Logger.info("Scan started")
             # Launch scan in a separate thread
-            self.__thread = App().task_helper.run(self.__scan, scan_type, uris)
+            self.__thread = App().task_helper.run(self.__scan, scan_type,
+                                                  uris, use_index)
 
     def save_album(self, item):
         """
@@ -207,6 +246,8 @@ class CollectionScanner(GObject.GObject, TagReader):
         self.update_track(item)
         Logger.debug("CollectionScanner::save_track(): Update album")
         self.update_album(item)
+        self.__search.update([item.track_id], [item.album_id],
+                             item.artist_ids + item.album_artist_ids)
 
     def update_album(self, item):
         """
@@ -243,7 +284,7 @@ class CollectionScanner(GObject.GObject, TagReader):
         # Update album genres
         for genre_id in item.genre_ids:
             App().albums.add_genre(item.album_id, genre_id)
-        App().cache.clear_durations(item.album_id)
+        App().albums.update_durations([item.album_id])
 
     def update_track(self, item):
         """
@@ -282,16 +323,17 @@ class CollectionScanner(GObject.GObject, TagReader):
             if backup:
                 f = Gio.File.new_for_uri(uri)
                 name = f.get_basename()
-                self.__history.add(name, duration, track_pop, track_rate,
-                                   track_ltime, album_mtime, track_loved,
-                                   album_loved, album_pop, album_rate,
-                                   album_synced)
+                self.__get_history().add(name, duration, track_pop,
+                                         track_rate, track_ltime,
+                                         album_mtime, track_loved,
+                                         album_loved, album_pop,
+                                         album_rate, album_synced)
             App().tracks.remove(track_id)
             genre_ids = App().tracks.get_genre_ids(track_id)
             App().albums.clean()
             App().genres.clean()
             App().artists.clean()
-            App().cache.clear_durations(album_id)
+            App().albums.update_durations([album_id])
             SqlCursor.commit(App().db)
             item = CollectionItem(album_id=album_id)
             if not App().albums.get_name(album_id):
@@ -353,6 +395,15 @@ class CollectionScanner(GObject.GObject, TagReader):
 #######################
 # PRIVATE             #
 #######################
+    def __get_history(self):
+        """
+            Get history database
+            @return History
+        """
+        if self.__history is None:
+            self.__history = History()
+        return self.__history
+
     def __reset_database(self):
         """
             Reset database
@@ -366,7 +417,7 @@ class CollectionScanner(GObject.GObject, TagReader):
         uris = App().tracks.get_uris()
         i = 0
         SqlCursor.add(App().db)
-        SqlCursor.add(self.__history)
+        SqlCursor.add(self.__get_history())
         count = len(uris)
         for uri in uris:
             self.del_from_db(uri, True)
@@ -377,7 +428,7 @@ class CollectionScanner(GObject.GObject, TagReader):
         App().albums.clean(False)
         App().artists.clean(False)
         App().genres.clean(False)
-        App().cache.clear_table("duration")
+        self.__dirs.clear()
         SqlCursor.commit(App().db)
         SqlCursor.remove(App().db)
         SqlCursor.commit(self.__history)
@@ -433,11 +484,14 @@ class CollectionScanner(GObject.GObject, TagReader):
                 self.__inotify.add_monitor(d)
 
     @profile
-    def __get_objects_for_uris(self, scan_type, uris):
+    def __get_objects_for_uris(self, scan_type, uris, use_index):
         """
             Get all tracks and dirs in uris
+            Directories not modified since last scan are not listed, their
+            subdirectories are read from index
             @param scan_type as ScanType
             @param uris as string
+            @param use_index as bool
             @return ([(int, str)], [str], [str])
                     ([(mtime, file)], [dir], [stream])
         """
@@ -445,6 +499,18 @@ class CollectionScanner(GObject.GObject, TagReader):
         dirs = []
         streams = []
         walk_uris = []
+        self.__listed_files = set()
+        self.__listed_dirs = {}
+        self.__unchanged_dirs = set()
+        index = self.__dirs.get() if use_index else {}
+        subdirs = {}
+        for (uri, (parent, mtime, count)) in index.items():
+            if parent not in subdirs.keys():
+                subdirs[parent] = []
+            subdirs[parent].append(uri)
+        # Do not trust mtime for directories modified during scan
+        max_mtime = int(time()) - 1
+        skipped = 0
         # Check collection exists
         for uri in uris:
             parsed = urlparse(uri)
@@ -453,34 +519,53 @@ class CollectionScanner(GObject.GObject, TagReader):
             else:
                 f = Gio.File.new_for_uri(uri)
                 if f.query_exists():
-                    walk_uris.append(uri)
+                    # Collection roots are always listed
+                    walk_uris.append((f.get_uri(), "", None, True))
                 else:
                     return ([], [], [])
 
         while walk_uris:
-            uri = walk_uris.pop(0)
+            (uri, parent, info, force) = walk_uris.pop(0)
             try:
                 # Directly add files, walk through directories
                 f = Gio.File.new_for_uri(uri)
-                info = f.query_info(SCAN_QUERY_INFO,
-                                    Gio.FileQueryInfoFlags.NONE,
-                                    None)
+                if info is None:
+                    info = f.query_info(SCAN_QUERY_INFO,
+                                        Gio.FileQueryInfoFlags.NONE,
+                                        None)
                 if info.get_file_type() == Gio.FileType.DIRECTORY:
                     dirs.append(uri)
+                    mtime = get_mtime(info)
+                    indexed = index.get(uri, None)
+                    if not force and indexed is not None and\
+                            indexed[1] == mtime:
+                        self.__unchanged_dirs.add(uri)
+                        skipped += indexed[2]
+                        for subdir in subdirs.get(uri, []):
+                            walk_uris.append((subdir, uri, None, False))
+                        continue
+                    count = 0
                     infos = f.enumerate_children(SCAN_QUERY_INFO,
                                                  Gio.FileQueryInfoFlags.NONE,
                                                  None)
                     for info in infos:
-                        f = infos.get_child(info)
-                        child_uri = f.get_uri()
+                        child = infos.get_child(info)
+                        child_uri = child.get_uri()
                         if info.get_is_hidden():
                             continue
                         # User do not want internal symlinks
                         elif info.get_is_symlink() and\
                                 App().settings.get_value("ignore-symlinks"):
                             continue
-                        walk_uris.append(child_uri)
+                        count += 1
+                        if info.get_file_type() == Gio.FileType.DIRECTORY:
+                            walk_uris.append((child_uri, uri, info, False))
+                        else:
+                            files.append((get_mtime(info), child_uri))
+                            self.__listed_files.add(child_uri)
                     infos.close(None)
+                    self.__listed_dirs[uri] = (
+                        parent, mtime if mtime < max_mtime else 0, count)
                 # Only happens if files passed as args
                 else:
                     mtime = get_mtime(info)
@@ -488,23 +573,64 @@ class CollectionScanner(GObject.GObject, TagReader):
             except Exception as e:
                 Logger.error("CollectionScanner::__get_objects_for_uris(): %s"
                              % e)
+        Logger.info("%s directories listed, %s unchanged, %s entries skipped",
+                    len(self.__listed_dirs), len(self.__unchanged_dirs),
+                    skipped)
         files.sort(reverse=True)
         return (files, dirs, streams)
 
+    def __save_dirs(self, scan_type, uris):
+        """
+            Save listed directories to index, remove deleted ones
+            @param scan_type as ScanType
+            @param uris as [str]
+        """
+        walked = set(self.__listed_dirs.keys()) | self.__unchanged_dirs
+        if scan_type == ScanType.FULL:
+            roots = [""]
+        else:
+            roots = [Gio.File.new_for_uri(uri).get_uri() for uri in uris]
+        index = self.__dirs.get()
+        removed = [uri for uri in index.keys()
+                   if uri not in walked and
+                   [root for root in roots if uri.startswith(root)]]
+        self.__dirs.remove(removed)
+        self.__dirs.set(self.__listed_dirs)
+
+    def __file_exists(self, uri):
+        """
+            True if file exists, use directory listings if available
+            @param uri as str
+            @return bool
+        """
+        f = Gio.File.new_for_uri(uri)
+        parent = f.get_parent()
+        if parent is not None:
+            parent_uri = parent.get_uri()
+            if parent_uri in self.__listed_dirs.keys():
+                return uri in self.__listed_files
+            elif parent_uri in self.__unchanged_dirs:
+                return True
+        return f.query_exists()
+
     @profile
-    def __scan(self, scan_type, uris):
+    def __scan(self, scan_type, uris, use_index):
         """
             Scan music collection for music files
             @param scan_type as ScanType
             @param uris as [str]
+            @param use_index as bool
             @thread safe
         """
         try:
             self.__items = []
             App().art.clean_rounded()
+            use_index = use_index and scan_type != ScanType.EXTERNAL and\
+                not App().tracks.is_empty()
             (files, dirs, streams) = self.__get_objects_for_uris(
-                scan_type, uris)
-            if len(uris) != len(streams) and not files:
+                scan_type, uris, use_index)
+            if len(uris) != len(streams) and not files and\
+                    not self.__unchanged_dirs:
                 self.__flatpak_migration()
                 App().notify.send("Lollypop",
                                   _("Scan disabled, missing collection"))
@@ -522,23 +648,36 @@ class CollectionScanner(GObject.GObject, TagReader):
             self.__progress_total = len(files) * 2 + len(streams)
             self.__progress_count = 0
             self.__progress_fraction = 0
-            # Min: 1 thread, Max: 5 threads
-            count = max(1, min(5, cpu_count() // 2))
-            split_files = split_list(files, count)
             self.__tags = {}
             self.__notified_ids = []
             self.__pending_new_artist_ids = []
-            threads = []
-            for files in split_files:
-                thread = App().task_helper.run(self.__scan_files,
-                                               files, db_mtimes,
-                                               scan_type)
-                threads.append(thread)
-            while threads:
-                sleep(0.1)
-                thread = threads[0]
-                if not thread.is_alive():
-                    threads.remove(thread)
+            self.__artwork_keys = set()
+            self.__artworks = {}
+            if self.__import_artwork and scan_type != ScanType.EXTERNAL:
+                self.__artwork_dir = mkdtemp(prefix="lollypop-artwork-")
+            workers = App().settings.get_value("scan-workers").get_int32()
+            if App().settings.get_value("scan-processes") and\
+                    scan_type != ScanType.EXTERNAL:
+                self.__scan_files_in_pool(files, db_mtimes, scan_type,
+                                          get_workers_count(workers))
+            else:
+                # Min: 1 thread, Max: 5 threads
+                if workers > 0:
+                    count = workers
+                else:
+                    count = max(1, min(5, cpu_count() // 2))
+                split_files = split_list(files, count)
+                threads = []
+                for files in split_files:
+                    thread = App().task_helper.run(self.__scan_files,
+                                                   files, db_mtimes,
+                                                   scan_type)
+                    threads.append(thread)
+                while threads:
+                    sleep(0.1)
+                    thread = threads[0]
+                    if not thread.is_alive():
+                        threads.remove(thread)
 
             SqlCursor.add(App().db)
             if scan_type == ScanType.EXTERNAL:
@@ -550,6 +689,9 @@ class CollectionScanner(GObject.GObject, TagReader):
             self.__items += self.__save_streams_in_db(streams, storage_type)
 
             self.__remove_old_tracks(db_uris, scan_type)
+            self.__search.clean()
+            if scan_type != ScanType.EXTERNAL and self.__thread is not None:
+                self.__save_dirs(scan_type, uris)
 
             if scan_type == ScanType.EXTERNAL:
                 albums = tracks_to_albums(
@@ -563,6 +705,13 @@ class CollectionScanner(GObject.GObject, TagReader):
             self.__pending_new_artist_ids = []
         except Exception as e:
             Logger.warning("CollectionScanner::__scan(): %s", e)
+        self.__listed_files = set()
+        self.__listed_dirs = {}
+        self.__unchanged_dirs = set()
+        self.__artworks = {}
+        if self.__artwork_dir is not None:
+            rmtree(self.__artwork_dir, True)
+            self.__artwork_dir = None
         SqlCursor.remove(App().db)
 
     def __scan_to_handle(self, uri):
@@ -593,6 +742,42 @@ class CollectionScanner(GObject.GObject, TagReader):
             Logger.error("CollectionScanner::__scan_to_handle(): %s" % e)
         return False
 
+    def __get_files_to_read(self, files, db_mtimes, scan_type):
+        """
+            Get files needing a tags update
+            @param files as [(int, str)]
+            @param db_mtimes as {}
+            @param scan_type as ScanType
+            @return [(int, str)]
+            @thread safe
+        """
+        for (mtime, uri) in files:
+            # Handle a stop request
+            if self.__thread is None and scan_type != ScanType.EXTERNAL:
+                raise Exception("cancelled")
+            try:
+                if not self.__scan_to_handle(uri):
+                    self.__progress_count += 2
+                    continue
+                db_mtime = db_mtimes.get(uri, 0)
+                if mtime > db_mtime:
+                    # Do not use mtime if not intial scan
+                    if db_mtimes:
+                        mtime = int(time())
+                    yield (mtime, uri)
+                else:
+                    # We want to play files, so put them in items
+                    if scan_type == ScanType.EXTERNAL:
+                        track_id = App().tracks.get_id_by_uri(uri)
+                        item = CollectionItem(track_id=track_id)
+                        self.__items.append(item)
+                    self.__progress_count += 2
+                    self.__update_progress(self.__progress_count,
+                                           self.__progress_total,
+                                           0.1)
+            except Exception as e:
+                Logger.error("Scanning file: %s, %s" % (uri, e))
+
     def __scan_files(self, files, db_mtimes, scan_type):
         """
             Scan music collection for new audio files
@@ -604,63 +789,94 @@ class CollectionScanner(GObject.GObject, TagReader):
         discoverer = Discoverer()
         try:
             # Scan new files
-            for (mtime, uri) in files:
+            for (mtime, uri) in self.__get_files_to_read(files, db_mtimes,
+                                                         scan_type):
+                try:
+                    self.__tags[uri] = self.__get_tags(discoverer, uri, mtime)
+                    self.__progress_count += 1
+                    self.__update_progress(self.__progress_count,
+                                           self.__progress_total,
+                                           0.001)
+                except Exception as e:
+                    Logger.error("Scanning file: %s, %s" % (uri, e))
+        except Exception as e:
+            Logger.warning("CollectionScanner::__scan_files(): % s" % e)
+
+    def __scan_files_in_pool(self, files, db_mtimes, scan_type, count):
+        """
+            Scan music collection for new audio files, tags are read by
+            worker processes, stats are restored in this thread
+            @param files as [str]
+            @param db_mtimes as {}
+            @param scan_type as ScanType
+            @param count as int => worker processes
+            @thread safe
+        """
+        pool = None
+        try:
+            compilations = not self.__disable_compilations
+            advanced_artist_tags = App().settings.get_value(
+                "import-advanced-artist-tags").get_boolean()
+            artwork = self.__artwork_dir is not None
+            args = [(uri, mtime, compilations, advanced_artist_tags, artwork)
+                    for (mtime, uri) in self.__get_files_to_read(
+                        files, db_mtimes, scan_type)]
+            if not args:
+                return
+            pool = new_pool(min(count, len(args)))
+            for (uri, mtime, tags, duration,
+                 data, error) in pool.imap_unordered(read_file_tags,
+                                                     args, 16):
                 # Handle a stop request
-                if self.__thread is None and scan_type != ScanType.EXTERNAL:
+                if self.__thread is None:
                     raise Exception("cancelled")
+                if tags is None:
+                    Logger.error("Scanning file: %s, %s" % (uri, error))
+                    continue
                 try:
-                    if not self.__scan_to_handle(uri):
-                        self.__progress_count += 2
-                        continue
-                    db_mtime = db_mtimes.get(uri, 0)
-                    if mtime > db_mtime:
-                        # Do not use mtime if not intial scan
-                        if db_mtimes:
-                            mtime = int(time())
-                        self.__tags[uri] = self.__get_tags(discoverer,
-                                                           uri, mtime)
-                        self.__progress_count += 1
-                        self.__update_progress(self.__progress_count,
-                                               self.__progress_total,
-                                               0.001)
-                    else:
-                        # We want to play files, so put them in items
-                        if scan_type == ScanType.EXTERNAL:
-                            track_id = App().tracks.get_id_by_uri(uri)
-                            item = CollectionItem(track_id=track_id)
-                            self.__items.append(item)
-                        self.__progress_count += 2
-                        self.__update_progress(self.__progress_count,
-                                               self.__progress_total,
-                                               0.1)
+                    if data is not None:
+                        self.__add_artwork(uri, tags, data)
+                    self.__tags[uri] = self.__restore_stats(uri, mtime,
+                                                            tags, duration)
+                    self.__progress_count += 1
+                    self.__update_progress(self.__progress_count,
+                                           self.__progress_total,
+                                           0.001)
                 except Exception as e:
                     Logger.error("Scanning file: %s, %s" % (uri, e))
         except Exception as e:
-            Logger.warning("CollectionScanner::__scan_files(): % s" % e)
+            Logger.warning("CollectionScanner::__scan_files_in_pool(): %s", e)
+        if pool is not None:
+            pool.terminate()
 
     def __save_in_db(self, storage_type):
         """
-            Save current tags into DB
+            Save current tags into DB, by chunks
             @param storage_type as StorageType
             @return [CollectionItem]
         """
         items = []
-        for uri in list(self.__tags.keys()):
+        ingest = CollectionIngest(self.__disable_compilations)
+        uris = list(self.__tags.keys())
+        for i in range(0, len(uris), self.__SAVE_CHUNK_SIZE):
             # Handle a stop request
             if self.__thread is None:
                 raise Exception("cancelled")
-            Logger.debug("Adding file: %s" % uri)
-            tags = self.__tags[uri]
-            item = self.__add2db(uri, *tags, storage_type)
-            items.append(item)
-            self.__progress_count += 1
+            chunk = [self.__get_item(uri, *self.__tags.pop(uri), storage_type)
+                     for uri in uris[i:i + self.__SAVE_CHUNK_SIZE]]
+            Logger.debug("Adding %s files" % len(chunk))
+            ingest.save(chunk)
+            if storage_type == StorageType.COLLECTION:
+                self.__save_artworks(chunk)
+            items += chunk
+            self.__progress_count += len(chunk)
             self.__update_progress(self.__progress_count,
                                    self.__progress_total,
                                    0.001)
-            if item.album_id not in self.__notified_ids:
-                self.__notified_ids.append(item.album_id)
-                self.__notify_ui(item)
-            del self.__tags[uri]
+            for item in chunk:
+                if item.album_id not in self.__notified_ids:
+                    self.__notified_ids.append(item.album_id)
+                    self.__notify_ui(item)
         # Handle a stop request
         if self.__thread is None:
             raise Exception("cancelled")
@@ -718,13 +934,12 @@ class CollectionScanner(GObject.GObject, TagReader):
                         if collection in uri:
                             in_collection = True
                             break
-                f = Gio.File.new_for_uri(uri)
                 if not in_collection:
                     Logger.warning(
                         "Removed, not in collection anymore: %s -> %s",
                         uri, collections)
                     self.del_from_db(uri, True)
-                elif not f.query_exists():
+                elif not self.__file_exists(uri):
                     Logger.warning("Removed, file has been deleted: %s", uri)
                     self.del_from_db(uri, True)
 
@@ -738,9 +953,73 @@ class CollectionScanner(GObject.GObject, TagReader):
         """
         f = Gio.File.new_for_uri(uri)
         info = discoverer.get_info(uri)
-        tags = info.get_tags()
-        name = f.get_basename()
         duration = int(info.get_duration() / 1000000)
+        Logger.debug("CollectionScanner::add2db(): Read tags")
+        tags = self.get_file_tags(info.get_tags(),
+                                  f.get_basename(),
+                                  not self.__disable_compilations,
+                                  App().settings.get_value(
+                                    "import-advanced-artist-tags"))
+        if self.__artwork_dir is not None and\
+                get_artwork_key(uri, tags) not in self.__artwork_keys:
+            data = self.get_artwork(info.get_tags())
+            if data is not None:
+                self.__add_artwork(uri, tags, data)
+        return self.__restore_stats(uri, track_mtime, tags, duration)
+
+    def __add_artwork(self, uri, tags, data):
+        """
+            Keep embedded artwork for track album until album is saved,
+            first one wins
+            Artworks are written to disk to not keep them in memory, same
+            artworks are only written once
+            @param uri as str
+            @param tags as (), see TagReader.get_file_tags()
+            @param data as bytes
+        """
+        key = get_artwork_key(uri, tags)
+        path = "%s/%s" % (self.__artwork_dir, md5(data).hexdigest())
+        # Tags are read by multiple threads
+        with self.__artwork_lock:
+            if key in self.__artwork_keys:
+                return
+            self.__artwork_keys.add(key)
+            if not GLib.file_test(path, GLib.FileTest.EXISTS):
+                with open(path, "wb") as f:
+                    f.write(data)
+            self.__artworks[uri] = path
+
+    def __save_artworks(self, items):
+        """
+            Save embedded artworks for albums without artwork
+            @param items as [CollectionItem]
+        """
+        for item in items:
+            with self.__artwork_lock:
+                path = self.__artworks.pop(item.uri, None)
+            if path is None:
+                continue
+            try:
+                album = Album(item.album_id)
+                if App().album_art.get_uri(album) is None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    App().album_art.add_embedded(album, data,
+                                                 self.__scale_factor)
+            except Exception as e:
+                Logger.error("CollectionScanner::__save_artworks(): %s", e)
+
+    def __restore_stats(self, uri, track_mtime, tags, duration):
+        """
+            Merge tags with stats from DB/history
+            @param uri as string
+            @param track_mtime as int
+            @param tags as (), see TagReader.get_file_tags()
+            @param duration as int
+            @return ()
+        """
+        f = Gio.File.new_for_uri(uri)
+        name = f.get_basename()
         Logger.debug("CollectionScanner::add2db(): Restore stats")
         # Restore stats
         track_id = App().tracks.get_id_by_uri(uri)
@@ -750,7 +1029,7 @@ class CollectionScanner(GObject.GObject, TagReader):
         if track_id is None:
             (track_pop, track_rate, track_ltime,
              album_mtime, track_loved, album_loved,
-             album_pop, album_rate, album_synced) = self.__history.get(
+             album_pop, album_rate, album_synced) = self.__get_history().get(
                 name, duration)
         # Delete track and restore from it
         else:
@@ -758,59 +1037,17 @@ class CollectionScanner(GObject.GObject, TagReader):
              album_mtime, track_loved, album_loved,
              album_pop, album_rate) = self.del_from_db(uri, False)
 
-        Logger.debug("CollectionScanner::add2db(): Read tags")
-        title = self.get_title(tags, name)
-        version = self.get_version(tags)
-        if version != "":
-            title += " (%s)" % version
-        artists = self.get_artists(tags)
-        a_sortnames = self.get_artist_sortnames(tags)
-        aa_sortnames = self.get_album_artist_sortnames(tags)
-        album_artists = self.get_album_artists(tags)
-        album_name = self.get_album_name(tags)
+        (title, artists, genres, a_sortnames, aa_sortnames,
+         album_artists, album_name, discname, discnumber,
+         year, timestamp, original_year, original_timestamp,
+         mb_album_id, mb_track_id, mb_artist_id,
+         mb_album_artist_id, tracknumber, popm, bpm, compilation) = tags
         album_synced = 0
-        mb_album_id = self.get_mb_album_id(tags)
-        mb_track_id = self.get_mb_track_id(tags)
-        mb_artist_id = self.get_mb_artist_id(tags)
-        mb_album_artist_id = self.get_mb_album_artist_id(tags)
-        genres = self.get_genres(tags)
-        discnumber = self.get_discnumber(tags)
-        discname = self.get_discname(tags)
-        tracknumber = self.get_tracknumber(tags, name)
         # We have popm in tags, override history one
-        tag_track_rate = self.get_popm(tags)
-        if tag_track_rate > 0:
-            track_rate = tag_track_rate
+        if popm > 0:
+            track_rate = popm
         if album_mtime == 0:
             album_mtime = track_mtime
-        bpm = self.get_bpm(tags)
-        compilation = not self.__disable_compilations and\
-            self.get_compilation(tags)
-        (original_year, original_timestamp) = self.get_original_year(tags)
-        (year, timestamp) = self.get_year(tags)
-        if year is None:
-            (year, timestamp) = (original_year, original_timestamp)
-        elif original_year is None:
-            (original_year, original_timestamp) = (year, timestamp)
-        # If no artists tag, use album artist
-        if artists == "":
-            artists = album_artists
-        if App().settings.get_value("import-advanced-artist-tags"):
-            composers = self.get_composers(tags)
-            conductors = self.get_conductors(tags)
-            performers = self.get_performers(tags)
-            remixers = self.get_remixers(tags)
-            artists += ";%s" % performers if performers != "" else ""
-            artists += ";%s" % conductors if conductors != "" else ""
-            artists += ";%s" % composers if composers != "" else ""
-            artists += ";%s" % remixers if remixers != "" else ""
-        if artists == "":
-            artists = _("Unknown")
-        # Reset album tags if we found a compilation
-        if compilation:
-            album_artists = ""
-            mb_album_artist_id = ""
-            aa_sortnames = ""
         return (title, artists, genres, a_sortnames, aa_sortnames,
                 album_artists, album_name, discname, album_loved, album_mtime,
                 album_synced, album_rate, album_pop, discnumber, year,
@@ -819,23 +1056,36 @@ class CollectionScanner(GObject.GObject, TagReader):
                 mb_album_artist_id, tracknumber, track_pop, track_rate, bpm,
                 track_mtime, track_ltime, track_loved, duration, compilation)
 
-    def __add2db(self, uri, name, artists,
-                 genres, a_sortnames, aa_sortnames, album_artists, album_name,
-                 discname, album_loved, album_mtime, album_synced, album_rate,
-                 album_pop, discnumber, year, timestamp,
-                 original_year, original_timestamp, mb_album_id,
-                 mb_track_id, mb_artist_id, mb_album_artist_id,
-                 tracknumber, track_pop, track_rate, bpm, track_mtime,
-                 track_ltime, track_loved, duration, compilation,
-                 storage_type=StorageType.COLLECTION):
+    def __add2db(self, uri, *tags):
         """
             Add new file to DB
             @param uri as str
             @param tags as *()
+            @return CollectionItem
+        """
+        item = self.__get_item(uri, *tags)
+        self.save_album(item)
+        self.save_track(item)
+        return item
+
+    def __get_item(self, uri, name, artists,
+                   genres, a_sortnames, aa_sortnames, album_artists,
+                   album_name, discname, album_loved, album_mtime,
+                   album_synced, album_rate, album_pop, discnumber, year,
+                   timestamp,
+                   original_year, original_timestamp, mb_album_id,
+                   mb_track_id, mb_artist_id, mb_album_artist_id,
+                   tracknumber, track_pop, track_rate, bpm, track_mtime,
+                   track_ltime, track_loved, duration, compilation,
+                   storage_type=StorageType.COLLECTION):
+        """
+            Get collection item for file
+            @param uri as str
+            @param tags as *()
             @param storage_type as StorageType
             @return CollectionItem
         """
-        item = CollectionItem(uri=uri,
+        return CollectionItem(uri=uri,
                               track_name=name,
                               artists=artists,
                               genres=genres,
@@ -868,9 +1118,6 @@ class CollectionScanner(GObject.GObject, TagReader):
                               duration=duration,
                               compilation=compilation,
                               storage_type=storage_type)
-        self.save_album(item)
-        self.save_track(item)
-        return item
 
     def __flatpak_migration(self):
         """
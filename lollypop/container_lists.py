@@ -15,6 +15,7 @@ from gi.repository import Gtk, GLib
 from lollypop.logger import Logger
 from lollypop.selectionlist import SelectionList
 from lollypop.define import App, Type, SelectionListMask, StorageType, ViewType
+from lollypop.define import TaskLane
 from lollypop.shown import ShownLists
 from lollypop.helper_gestures import GesturesHelper
 from lollypop.view import View
@@ -138,7 +139,8 @@ class ListsContainer:
             genres = App().genres.get()
             return genres
         selection_list.set_mask(SelectionListMask.GENRES)
-        App().task_helper.run(load, callback=(selection_list.populate,))
+        App().task_helper.run(load, callback=(selection_list.populate,),
+                              lane=TaskLane.DB)
 
     def _show_artists_list(self, selection_list, genre_ids=[]):
         """
@@ -151,7 +153,8 @@ class ListsContainer:
             artists = App().artists.get(genre_ids, storage_type)
             return artists
         selection_list.set_mask(SelectionListMask.ARTISTS)
-        App().task_helper.run(load, callback=(selection_list.populate,))
+        App().task_helper.run(load, callback=(selection_list.populate,),
+                              lane=TaskLane.DB)
 
     def _show_right_list(self):
         """
@@ -10,9 +10,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gio
+from gi.repository import Gio, GLib
 
 import sqlite3
+from locale import setlocale, LC_COLLATE
 from threading import Lock
 from random import shuffle
 import itertools
@@ -21,7 +22,7 @@ from lollypop.define import App, LOLLYPOP_DATA_PATH
 from lollypop.database_upgrade import DatabaseAlbumsUpgrade
 from lollypop.sqlcursor import SqlCursor
 from lollypop.logger import Logger
-from lollypop.localized import LocalizedCollation
+from lollypop.localized import LocalizedCollation, sort_key
 from lollypop.utils import noaccents, sql_escape
 
 
@@ -60,6 +61,7 @@ class Database:
     # this make VACUUM not destroy rowids...
     __create_albums = """CREATE TABLE albums (id INTEGER PRIMARY KEY,
                                               name TEXT NOT NULL,
+                                              sortkey TEXT,
                                               mb_album_id TEXT,
                                               lp_album_id TEXT,
                                               no_album_artist BOOLEAN NOT NULL,
@@ -71,10 +73,14 @@ class Database:
                                               loved INT NOT NULL,
                                               mtime INT NOT NULL,
                                               storage_type INT NOT NULL,
-                                              synced INT NOT NULL)"""
+                                              synced INT NOT NULL,
+                                              duration INT NOT NULL DEFAULT 0,
+                                              track_count INT NOT NULL
+                                                  DEFAULT 0)"""
     __create_artists = """CREATE TABLE artists (id INTEGER PRIMARY KEY,
                                                name TEXT NOT NULL,
                                                sortname TEXT NOT NULL,
+                                               sortkey TEXT,
                                                mb_artist_id TEXT)"""
     __create_featuring = """CREATE TABLE featuring (
                                                artist_id INT NOT NULL,
@@ -91,6 +97,13 @@ class Database:
                                                 album_id INT NOT NULL,
                                                 mtime INT NOT NULL,
                                                 popularity INT NOT NULL)"""
+    __create_album_discs = """CREATE TABLE album_discs (
+                                                album_id INT NOT NULL,
+                                                discnumber INT,
+                                                duration INT NOT NULL,
+                                                track_count INT NOT NULL)"""
+    __create_album_discs_idx = """CREATE UNIQUE index idx_album_discs
+                                  ON album_discs(album_id, discnumber)"""
     __create_tracks = """CREATE TABLE tracks (id INTEGER PRIMARY KEY,
                                               name TEXT NOT NULL,
                                               uri TEXT NOT NULL,
@@ -125,12 +138,36 @@ class Database:
                                                 album_id)"""
     __create_track_genres_idx = """CREATE index idx_tg ON track_genres(
                                                 track_id)"""
+    __create_dirs = """CREATE TABLE dirs (uri TEXT NOT NULL,
+                                          parent TEXT NOT NULL,
+                                          mtime INT NOT NULL,
+                                          count INT NOT NULL)"""
+    __create_dirs_idx = "CREATE UNIQUE index idx_dirs_uri ON dirs(uri)"
+    __create_search = """CREATE VIRTUAL TABLE search USING fts5(
+                                name, artists,
+                                tokenize="unicode61 remove_diacritics 2")"""
+    __create_hot_path_idx = [
+        "CREATE index idx_tracks_uri ON tracks(uri, mtime, storage_type)",
+        "CREATE index idx_tracks_album ON tracks(album_id)",
+        "CREATE index idx_albums_uri ON albums(uri)",
+        "CREATE index idx_albums_name ON albums(name COLLATE NOCASE)",
+        "CREATE index idx_artists_name ON artists(name COLLATE NOCASE)",
+        "CREATE index idx_aa_artist ON album_artists(artist_id, album_id)",
+        "CREATE index idx_ag_genre ON album_genres(genre_id, album_id)",
+        "CREATE index idx_albums_sortkey ON albums(sortkey)",
+        "CREATE index idx_artists_sortkey ON artists(sortkey)"]
 
     def __init__(self):
         """
             Create database tables or manage update if needed
         """
         self.thread_lock = MyLock()
+        # Read once, get_cursor() may be called from any thread
+        self.__wal = App().settings.get_value("db-wal").get_boolean()
+        self.__cache_size = App().settings.get_value(
+            "db-cache-size").get_int32()
+        self.__mmap_size = App().settings.get_value(
+            "db-mmap-size").get_int32()
         f = Gio.File.new_for_path(self.DB_PATH)
         upgrade = DatabaseAlbumsUpgrade()
         if not f.query_exists():
@@ -147,6 +184,8 @@ class Database:
                     sql.execute(self.__create_album_genres)
                     sql.execute(self.__create_album_artists)
                     sql.execute(self.__create_album_timed_popularity)
+                    sql.execute(self.__create_album_discs)
+                    sql.execute(self.__create_album_discs_idx)
                     sql.execute(self.__create_tracks)
                     sql.execute(self.__create_track_artists)
                     sql.execute(self.__create_track_genres)
@@ -154,11 +193,21 @@ class Database:
                     sql.execute(self.__create_track_artists_idx)
                     sql.execute(self.__create_album_genres_idx)
                     sql.execute(self.__create_track_genres_idx)
+                    for request in self.__create_hot_path_idx:
+                        sql.execute(request)
+                    sql.execute(self.__create_dirs)
+                    sql.execute(self.__create_dirs_idx)
+                    # SQLite may be built without FTS5
+                    try:
+                        sql.execute(self.__create_search)
+                    except Exception as e:
+                        Logger.warning("Database::__init__(): %s", e)
                     sql.execute("PRAGMA user_version=%s" % upgrade.version)
             except Exception as e:
                 Logger.error("Database::__init__(): %s" % e)
         else:
             upgrade.upgrade(self)
+        self.__set_journal_mode()
 
     def execute(self, request):
         """
@@ -200,15 +249,48 @@ class Database:
             Logger.error("Database::execute(): %s -> %s", e, request)
         return []
 
+    def update_sort_keys(self):
+        """
+            Set missing artists/albums sort keys, all keys if locale changed
+            @thread safe
+        """
+        try:
+            collate = setlocale(LC_COLLATE)
+            if collate == App().settings.get_value(
+                    "sort-keys-locale").get_string():
+                where = " WHERE sortkey IS NULL"
+            else:
+                Logger.info("Rebuilding sort keys for %s", collate)
+                where = ""
+            with SqlCursor(self, True) as sql:
+                sql.execute("UPDATE artists SET sortkey=sort_key(sortname)" +
+                            where)
+                sql.execute("UPDATE albums SET sortkey=sort_key(name)" +
+                            where)
+            if not where:
+                GLib.idle_add(App().settings.set_value, "sort-keys-locale",
+                              GLib.Variant("s", collate))
+        except Exception as e:
+            Logger.error("Database::update_sort_keys(): %s", e)
+
     def get_cursor(self):
         """
             Return a new sqlite cursor
         """
         try:
-            c = sqlite3.connect(self.DB_PATH, 600.0)
+            c = sqlite3.connect(self.DB_PATH, 600.0,
+                                check_same_thread=False)
             c.create_collation("LOCALIZED", LocalizedCollation())
             c.create_function("noaccents", 1, noaccents)
             c.create_function("sql_escape", 1, sql_escape)
+            c.create_function("sort_key", 1, sort_key)
+            # With WAL, readers use their own thread connection and
+            # never wait on scanner writes
+            if self.__wal:
+                c.execute("PRAGMA synchronous=NORMAL")
+            c.execute("PRAGMA cache_size=-%s" % (self.__cache_size * 1024))
+            c.execute("PRAGMA mmap_size=%s" % (self.__mmap_size * 1048576))
+            c.execute("PRAGMA temp_store=MEMORY")
             return c
         except:
             exit(-1)
@@ -216,3 +298,13 @@ class Database:
 #######################
 # PRIVATE             #
 #######################
+    def __set_journal_mode(self):
+        """
+            Enable/disable write-ahead logging, mode is persistent in db file
+        """
+        try:
+            mode = "WAL" if self.__wal else "DELETE"
+            with SqlCursor(self) as sql:
+                sql.execute("PRAGMA journal_mode=%s" % mode)
+        except Exception as e:
+            Logger.error("Database::__set_journal_mode(): %s" % e)
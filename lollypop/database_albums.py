@@ -24,6 +24,12 @@ class AlbumsDatabase:
     """
         Albums database helper
     """
+    # Attributes returned by get_rows() after album id, see Album.set_row()
+    ROW_ATTRIBUTES = ("name", "year", "timestamp", "uri", "popularity",
+                      "rate", "mtime", "synced", "loved", "storage_type",
+                      "mb_album_id", "lp_album_id", "artists", "artist_ids")
+    # Keep under SQLite host parameters limit
+    __ROWS_CHUNK = 500
 
     def __init__(self, db):
         """
@@ -52,12 +58,14 @@ class AlbumsDatabase:
         """
         with SqlCursor(self.__db, True) as sql:
             result = sql.execute("INSERT INTO albums\
-                                  (name, mb_album_id, lp_album_id,\
+                                  (name, sortkey, mb_album_id, lp_album_id,\
                                    no_album_artist, uri,\
                                    loved, popularity, rate, mtime, synced,\
                                    storage_type)\
-                                  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                                 (album_name, mb_album_id or None, lp_album_id,
+                                  VALUES (?, sort_key(?), ?, ?, ?, ?, ?, ?,\
+                                          ?, ?, ?, ?)",
+                                 (album_name, album_name,
+                                  mb_album_id or None, lp_album_id,
                                   artist_ids == [], uri, loved, popularity,
                                   rate, mtime, synced, storage_type))
             for artist_id in artist_ids:
@@ -223,11 +231,9 @@ class AlbumsDatabase:
                        AND (album_artists.artist_id = artists.rowid\
                             OR album_artists.artist_id=?)\
                        AND synced & (1 << ?) AND albums.storage_type & ?"
-            order = " ORDER BY artists.sortname\
-                     COLLATE NOCASE COLLATE LOCALIZED,\
+            order = " ORDER BY artists.sortkey,\
                      albums.timestamp,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
             filters = (Type.COMPILATIONS, index, StorageType.COLLECTION)
             result = sql.execute(request + order, filters)
             return list(itertools.chain(*result))
@@ -1022,6 +1028,44 @@ class AlbumsDatabase:
                 return v[0]
             return 0
 
+    def get_rows(self, album_ids):
+        """
+            Get albums attributes with one query per chunk of albums
+            @param album_ids as [int]
+            @return [(album_id, name, year, timestamp, uri, popularity, rate,
+                      mtime, synced, loved, storage_type, mb_album_id,
+                      lp_album_id, artists, artist_ids)], album_ids order
+        """
+        rows = {}
+        artists = {}
+        with SqlCursor(self.__db) as sql:
+            for i in range(0, len(album_ids), self.__ROWS_CHUNK):
+                chunk = album_ids[i:i + self.__ROWS_CHUNK]
+                subrequest = make_subrequest("?", ",", len(chunk))
+                result = sql.execute("SELECT rowid, name, NULLIF(year, 0),\
+                                      timestamp, uri, popularity, rate,\
+                                      mtime, synced, loved, storage_type,\
+                                      mb_album_id, IFNULL(lp_album_id, '')\
+                                      FROM albums\
+                                      WHERE rowid IN %s" % subrequest,
+                                     chunk)
+                for row in result:
+                    rows[row[0]] = row
+                result = sql.execute("SELECT album_artists.album_id,\
+                                      album_artists.artist_id, artists.name\
+                                      FROM album_artists, artists\
+                                      WHERE album_artists.album_id IN %s\
+                                      AND album_artists.artist_id=\
+                                      artists.rowid" % subrequest,
+                                     chunk)
+                for (album_id, artist_id, name) in result:
+                    if album_id not in artists.keys():
+                        artists[album_id] = ([], [])
+                    artists[album_id][0].append(name)
+                    artists[album_id][1].append(artist_id)
+        return [rows[album_id] + artists.get(album_id, ([], []))
+                for album_id in album_ids if album_id in rows.keys()]
+
     def get_ids(self, genre_ids, artist_ids, storage_type,
                 skipped=False, orderby=None):
         """
@@ -1038,34 +1082,26 @@ class AlbumsDatabase:
         if orderby is None:
             orderby = App().settings.get_enum("orderby")
         if orderby == OrderBy.ARTIST_YEAR:
-            order = " ORDER BY artists.sortname\
-                     COLLATE NOCASE COLLATE LOCALIZED,\
+            order = " ORDER BY artists.sortkey,\
                      albums.year,\
                      albums.timestamp,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         elif orderby == OrderBy.ARTIST_TITLE:
-            order = " ORDER BY artists.sortname\
-                     COLLATE NOCASE COLLATE LOCALIZED,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+            order = " ORDER BY artists.sortkey,\
+                     albums.sortkey"
         elif orderby == OrderBy.TITLE:
-            order = " ORDER BY albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+            order = " ORDER BY albums.sortkey"
         elif orderby == OrderBy.YEAR_DESC:
             order = " ORDER BY albums.year DESC,\
                      albums.timestamp DESC,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         elif orderby == OrderBy.YEAR_ASC:
             order = " ORDER BY albums.year ASC,\
                      albums.timestamp ASC,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         else:
             order = " ORDER BY albums.popularity DESC,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
 
         with SqlCursor(self.__db) as sql:
             result = []
@@ -1187,69 +1223,132 @@ class AlbumsDatabase:
                 result = sql.execute(request, filters)
             return list(itertools.chain(*result))
 
-    def get_duration(self, album_id, genre_ids, artist_ids, disc_number):
+    def get_durations(self, album_ids, genre_ids, artist_ids, disc_number):
         """
-            Album duration in seconds
-            @param album_id as int
+            Albums durations, one query per chunk of albums
+            Without filters, durations are read from albums/album_discs
+            @param album_ids as [int]
             @param genre_ids as [int]
             @param artist_ids as [int]
             @param disc_number as int/None
-            @return int
+            @return {int: int}: album id => duration in ms
         """
         genre_ids = remove_static(genre_ids)
         artist_ids = remove_static(artist_ids)
-        request = "SELECT SUM(duration) FROM ("
-        with SqlCursor(self.__db) as sql:
-            if genre_ids and artist_ids:
-                filters = (album_id,)
-                filters += tuple(genre_ids)
-                filters += tuple(artist_ids)
-                request += "SELECT duration\
-                           FROM tracks, track_genres, track_artists\
-                           WHERE tracks.album_id=?\
-                           AND track_genres.track_id = tracks.rowid\
-                           AND track_artists.track_id = tracks.rowid AND"
+        if not genre_ids and not artist_ids:
+            if disc_number is None:
+                request = "SELECT rowid, duration FROM albums\
+                           WHERE rowid IN %s"
+            else:
+                request = "SELECT album_id, duration FROM album_discs\
+                           WHERE album_id IN %s AND discnumber=?"
+        else:
+            tables = "tracks"
+            request = "WHERE tracks.album_id IN %s"
+            if genre_ids:
+                tables += ", track_genres"
+                request += " AND track_genres.track_id=tracks.rowid AND "
                 request += make_subrequest("track_genres.genre_id=?",
                                            "OR",
                                            len(genre_ids))
-                request += " AND "
-                request += make_subrequest("track_artists.artist_id=?",
-                                           "OR",
-                                           len(artist_ids))
-            elif artist_ids:
-                filters = (album_id,)
-                filters += tuple(artist_ids)
-                request += "SELECT duration\
-                           FROM tracks, track_artists\
-                           WHERE tracks.album_id=?\
-                           AND track_artists.track_id = tracks.rowid AND"
+            if artist_ids:
+                tables += ", track_artists"
+                request += " AND track_artists.track_id=tracks.rowid AND "
                 request += make_subrequest("track_artists.artist_id=?",
                                            "OR",
                                            len(artist_ids))
-            elif genre_ids:
-                filters = (album_id,)
-                filters += tuple(genre_ids)
-                request += "SELECT duration\
-                           FROM tracks, track_genres\
-                           WHERE tracks.album_id=?\
-                           AND track_genres.track_id = tracks.rowid AND"
-                request += make_subrequest("track_genres.genre_id=?",
-                                           "OR",
-                                           len(genre_ids))
-            else:
-                filters = (album_id,)
-                request += "SELECT duration\
-                           FROM tracks\
-                           WHERE tracks.album_id=?"
             if disc_number is not None:
-                filters += (disc_number,)
                 request += " AND discnumber=?"
-            request += " GROUP BY tracks.id)"
-            result = sql.execute(request, filters)
-            v = result.fetchone()
-            if v and v[0] is not None:
-                return v[0]
-            return 0
+            request = "SELECT album_id, SUM(duration) FROM (\
+                       SELECT tracks.album_id, tracks.duration\
+                       FROM %s %s GROUP BY tracks.rowid)\
+                       GROUP BY album_id" % (tables, request)
+        filters = tuple(genre_ids) + tuple(artist_ids)
+        if disc_number is not None:
+            filters += (disc_number,)
+        durations = {}
+        with SqlCursor(self.__db) as sql:
+            for i in range(0, len(album_ids), self.__ROWS_CHUNK):
+                chunk = album_ids[i:i + self.__ROWS_CHUNK]
+                subrequest = make_subrequest("?", ",", len(chunk))
+                result = sql.execute(request % subrequest,
+                                     tuple(chunk) + filters)
+                for (album_id, duration) in result:
+                    durations[album_id] = duration or 0
+        return durations
+
+    def get_tracks_uris(self, album_ids, genre_ids, artist_ids, skipped):
+        """
+            Albums track uris, one query per chunk of albums
+            @param album_ids as [int]
+            @param genre_ids as [int]
+            @param artist_ids as [int]
+            @param skipped as bool
+            @return {int: [str]}: album id => uris in album order
+        """
+        genre_ids = remove_static(genre_ids)
+        artist_ids = remove_static(artist_ids)
+        tables = "tracks"
+        request = "WHERE tracks.album_id IN %s"
+        if genre_ids:
+            tables += ", track_genres"
+            request += " AND track_genres.track_id=tracks.rowid AND "
+            request += make_subrequest("track_genres.genre_id=?",
+                                       "OR",
+                                       len(genre_ids))
+        if artist_ids:
+            tables += ", track_artists"
+            request += " AND track_artists.track_id=tracks.rowid AND "
+            request += make_subrequest("track_artists.artist_id=?",
+                                       "OR",
+                                       len(artist_ids))
+        filters = tuple(genre_ids) + tuple(artist_ids)
+        if not skipped:
+            request += " AND NOT tracks.loved & ?"
+            filters += (LovedFlags.SKIPPED,)
+        request = "SELECT DISTINCT tracks.rowid, tracks.album_id, tracks.uri\
+                   FROM %s %s\
+                   ORDER BY discnumber, tracknumber, tracks.name" % (
+            tables, request)
+        uris = {}
+        with SqlCursor(self.__db) as sql:
+            for i in range(0, len(album_ids), self.__ROWS_CHUNK):
+                chunk = album_ids[i:i + self.__ROWS_CHUNK]
+                subrequest = make_subrequest("?", ",", len(chunk))
+                result = sql.execute(request % subrequest,
+                                     tuple(chunk) + filters)
+                for (track_id, album_id, uri) in result:
+                    uris.setdefault(album_id, []).append(uri)
+        return uris
+
+    def update_durations(self, album_ids):
+        """
+            Update albums and discs durations/track counts from tracks
+            @param album_ids as [int]
+            @warning: commit needed
+        """
+        album_ids = list(dict.fromkeys(album_ids))
+        with SqlCursor(self.__db, True) as sql:
+            for i in range(0, len(album_ids), self.__ROWS_CHUNK):
+                chunk = album_ids[i:i + self.__ROWS_CHUNK]
+                subrequest = make_subrequest("?", ",", len(chunk))
+                sql.execute("DELETE FROM album_discs\
+                             WHERE album_id IN %s" % subrequest, chunk)
+                sql.execute("INSERT INTO album_discs\
+                             (album_id, discnumber, duration, track_count)\
+                             SELECT album_id, discnumber,\
+                             IFNULL(SUM(duration), 0), COUNT(*)\
+                             FROM tracks WHERE album_id IN %s\
+                             GROUP BY album_id, discnumber" % subrequest,
+                            chunk)
+                sql.execute("UPDATE albums SET\
+                             duration=IFNULL((\
+                                SELECT SUM(duration) FROM album_discs\
+                                WHERE album_discs.album_id=albums.rowid), 0),\
+                             track_count=IFNULL((\
+                                SELECT SUM(track_count) FROM album_discs\
+                                WHERE album_discs.album_id=albums.rowid), 0)\
+                             WHERE rowid IN %s" % subrequest, chunk)
 
     def get_genres(self, album_id):
         """
@@ -1377,6 +1476,9 @@ class AlbumsDatabase:
             sql.execute("DELETE FROM albums_timed_popularity\
                          WHERE albums_timed_popularity.album_id NOT IN (\
                             SELECT albums.rowid FROM albums)")
+            sql.execute("DELETE FROM album_discs\
+                         WHERE album_discs.album_id NOT IN (\
+                            SELECT albums.rowid FROM albums)")
             # We clear timed popularity based on mtime
             # For now, we don't need to keep more data than a month
             month = int(time()) - 2678400
@@ -1395,12 +1497,7 @@ class AlbumsDatabase:
             Update MAX(COUNT(tracks)) for albums
         """
         with SqlCursor(self.__db) as sql:
-            result = sql.execute("SELECT MAX(num_tracks)\
-                                  FROM (SELECT COUNT(t.rowid)\
-                                  AS num_tracks FROM albums\
-                                  INNER JOIN tracks t\
-                                  ON albums.rowid=t.album_id\
-                                  GROUP BY albums.rowid)")
+            result = sql.execute("SELECT MAX(track_count) FROM albums")
             v = result.fetchone()
             if v and v[0] is not None:
                 self.__max_count = v[0]
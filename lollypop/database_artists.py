@@ -44,9 +44,9 @@ class ArtistsDatabase:
             sortname = format_artist_name(name)
         with SqlCursor(self.__db, True) as sql:
             result = sql.execute("INSERT INTO artists (name, sortname,\
-                                  mb_artist_id)\
-                                  VALUES (?, ?, ?)",
-                                 (name, sortname, mb_artist_id))
+                                  sortkey, mb_artist_id)\
+                                  VALUES (?, ?, sort_key(?), ?)",
+                                 (name, sortname, sortname, mb_artist_id))
             return result.lastrowid
 
     def set_sortname(self, artist_id, sort_name):
@@ -58,9 +58,9 @@ class ArtistsDatabase:
         """
         with SqlCursor(self.__db, True) as sql:
             sql.execute("UPDATE artists\
-                         SET sortname=?\
+                         SET sortname=?, sortkey=sort_key(?)\
                          WHERE rowid=?",
-                        (sort_name, artist_id))
+                        (sort_name, sort_name, artist_id))
 
     def get_sortname(self, artist_id):
         """
@@ -85,18 +85,28 @@ class ArtistsDatabase:
         """
         with SqlCursor(self.__db) as sql:
             request = "SELECT rowid, name from artists\
-                     WHERE name=?"
+                     WHERE name=? COLLATE NOCASE"
             params = [name]
             if mb_artist_id:
                 request += " AND (mb_artist_id=? OR mb_artist_id IS NULL)"
                 params.append(mb_artist_id)
-            request += " COLLATE NOCASE"
             result = sql.execute(request, params)
             v = result.fetchone()
             if v is not None:
                 return (v[0], v[1])
             return (None, None)
 
+    def get_all_rows(self):
+        """
+            Get all artists
+            @return [(int, str, str, str)]:
+                    (artist_id, name, sortname, mb_artist_id)
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT rowid, name, sortname, mb_artist_id\
+                                  FROM artists ORDER BY rowid")
+            return list(result)
+
     def get_id_for_escaped_string(self, name):
         """
             Get artist id
@@ -209,8 +219,7 @@ class ArtistsDatabase:
                                   WHERE album_artists.artist_id=artists.rowid\
                                   AND album_artists.album_id=albums.rowid\
                                   AND albums.storage_type & ?\
-                                  ORDER BY artists.sortname\
-                                  COLLATE NOCASE COLLATE LOCALIZED" % select,
+                                  ORDER BY artists.sortkey" % select,
                     (storage_type,))
             else:
                 filters = (storage_type,)
@@ -224,8 +233,7 @@ class ArtistsDatabase:
                 request += make_subrequest("album_genres.genre_id=?",
                                            "OR",
                                            len(genre_ids))
-                request += " ORDER BY artists.sortname\
-                            COLLATE NOCASE COLLATE LOCALIZED"
+                request += " ORDER BY artists.sortkey"
                 result = sql.execute(request % select, filters)
             return [(row[0], row[1], row[2]) for row in result]
 
@@ -267,8 +275,7 @@ class ArtistsDatabase:
                                   WHERE album_artists.artist_id=artists.rowid\
                                   AND album_artists.album_id=albums.rowid\
                                   AND albums.storage_type & ?\
-                                  ORDER BY artists.sortname\
-                                  COLLATE NOCASE COLLATE LOCALIZED",
+                                  ORDER BY artists.sortkey",
                     (storage_type,))
             else:
                 filters = (storage_type,)
@@ -282,8 +289,7 @@ class ArtistsDatabase:
                 request += make_subrequest("album_genres.genre_id=?",
                                            "OR",
                                            len(genre_ids))
-                request += " ORDER BY artists.sortname\
-                            COLLATE NOCASE COLLATE LOCALIZED"
+                request += " ORDER BY artists.sortkey"
                 result = sql.execute(request, filters)
             return list(itertools.chain(*result))
 
@@ -336,31 +342,23 @@ class ArtistsDatabase:
         """
         orderby = App().settings.get_enum("orderby")
         if orderby == OrderBy.ARTIST_YEAR:
-            order = " ORDER BY artists.sortname\
-                     COLLATE NOCASE COLLATE LOCALIZED,\
+            order = " ORDER BY artists.sortkey,\
                      albums.timestamp,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         elif orderby == OrderBy.ARTIST_TITLE:
-            order = " ORDER BY artists.sortname\
-                     COLLATE NOCASE COLLATE LOCALIZED,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+            order = " ORDER BY artists.sortkey,\
+                     albums.sortkey"
         elif orderby == OrderBy.TITLE:
-            order = " ORDER BY albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+            order = " ORDER BY albums.sortkey"
         elif orderby == OrderBy.YEAR_DESC:
             order = " ORDER BY albums.timestamp DESC,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         elif orderby == OrderBy.YEAR_ASC:
             order = " ORDER BY albums.timestamp ASC,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         else:
             order = " ORDER BY albums.popularity DESC,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         with SqlCursor(self.__db) as sql:
             request = "SELECT DISTINCT featuring.album_id\
                        FROM featuring, album_genres, albums, artists\
@@ -0,0 +1,68 @@
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from lollypop.sqlcursor import SqlCursor
+
+
+class DirsDatabase:
+    """
+        Collection directories database helper
+        Used by scanner to skip directories not modified since last scan
+    """
+
+    def __init__(self, db):
+        """
+            Init dirs database object
+            @param db as Database
+        """
+        self.__db = db
+
+    def get(self):
+        """
+            Get all directories
+            @return {str: (str, int, int)}: {uri: (parent, mtime, count)}
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT uri, parent, mtime, count FROM dirs")
+            return {row[0]: row[1:] for row in result}
+
+    def set(self, dirs):
+        """
+            Add or update directories
+            @param dirs as {str: (str, int, int)}:
+                   {uri: (parent, mtime, count)}
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db, True) as sql:
+            sql.executemany("INSERT OR REPLACE INTO dirs\
+                             (uri, parent, mtime, count)\
+                             VALUES (?, ?, ?, ?)",
+                            [(uri,) + tuple(values)
+                             for (uri, values) in dirs.items()])
+
+    def remove(self, uris):
+        """
+            Remove directories
+            @param uris as [str]
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db, True) as sql:
+            sql.executemany("DELETE FROM dirs WHERE uri=?",
+                            [(uri,) for uri in uris])
+
+    def clear(self):
+        """
+            Remove all directories, next scan will list them again
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db, True) as sql:
+            sql.execute("DELETE FROM dirs")
@@ -58,6 +58,16 @@ class GenresDatabase:
                 return v[0]
             return None
 
+    def get_all_rows(self):
+        """
+            Get all genres
+            @return [(int, str)]: (genre_id, name)
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT rowid, name FROM genres\
+                                  ORDER BY rowid")
+            return list(result)
+
     def get_name(self, genre_id):
         """
             Get genre name for genre id
@@ -82,27 +92,20 @@ class GenresDatabase:
         orderby = App().settings.get_enum("orderby")
         order = " ORDER BY genres.name, "
         if orderby == OrderBy.ARTIST_YEAR:
-            order += " artists.sortname\
-                     COLLATE NOCASE COLLATE LOCALIZED,\
+            order += " artists.sortkey,\
                      albums.timestamp,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         elif orderby == OrderBy.ARTIST_TITLE:
-            order += " artists.sortname\
-                     COLLATE NOCASE COLLATE LOCALIZED,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+            order += " artists.sortkey,\
+                     albums.sortkey"
         elif orderby == OrderBy.NAME:
-            order += " albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+            order += " albums.sortkey"
         elif orderby == OrderBy.YEAR_DESC:
             order += " albums.timestamp DESC,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         else:
             order += " albums.popularity DESC,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED"
+                     albums.sortkey"
         with SqlCursor(self.__db) as sql:
             filters = ()
             request = "SELECT albums.rowid\
@@ -0,0 +1,131 @@
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import sqlite3
+from threading import Lock
+
+from lollypop.sqlcursor import SqlCursor
+from lollypop.define import LOLLYPOP_DATA_PATH, Type
+
+
+class ScrobblesDatabase:
+    """
+        Listens waiting to be submitted to scrobbling services
+        Only plain metadata is stored, tracks may not exist anymore when
+        listens are submitted
+    """
+    __DB_PATH = "%s/scrobbles.db" % LOLLYPOP_DATA_PATH
+    __create_scrobbles = """CREATE TABLE IF NOT EXISTS scrobbles (
+                            id INTEGER PRIMARY KEY,
+                            service TEXT NOT NULL,
+                            timestamp INT NOT NULL,
+                            artist TEXT NOT NULL,
+                            album_artist TEXT NOT NULL,
+                            title TEXT NOT NULL,
+                            album TEXT NOT NULL,
+                            tracknumber INT NOT NULL,
+                            duration INT NOT NULL,
+                            mb_track_id TEXT,
+                            mb_album_id TEXT,
+                            mb_artist_ids TEXT NOT NULL)"""
+    __create_scrobbles_idx = """CREATE INDEX IF NOT EXISTS idx_service
+                                ON scrobbles(service, id)"""
+
+    def __init__(self):
+        """
+            Init scrobbles database object
+        """
+        self.thread_lock = Lock()
+        with SqlCursor(self, True) as sql:
+            sql.execute(self.__create_scrobbles)
+            sql.execute(self.__create_scrobbles_idx)
+
+    def add(self, service, track, timestamp):
+        """
+            Add a listen for service
+            @param service as str
+            @param track as Track
+            @param timestamp as int
+            @thread safe
+        """
+        artists = track.artists
+        artist = artists[0] if artists else ""
+        if not track.album.artist_ids or\
+                track.album.artist_ids[0] == Type.COMPILATIONS:
+            album_artist = artist
+        else:
+            album_artist = track.album.artists[0]
+        mb_artist_ids = ";".join([mbid for mbid in track.mb_artist_ids
+                                  if mbid])
+        with SqlCursor(self, True) as sql:
+            sql.execute("INSERT INTO scrobbles\
+                         (service, timestamp, artist, album_artist, title,\
+                         album, tracknumber, duration, mb_track_id,\
+                         mb_album_id, mb_artist_ids)\
+                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (service, timestamp, artist, album_artist,
+                         track.name, track.album.name, track.number,
+                         track.duration, track.mb_track_id,
+                         track.album.mb_album_id, mb_artist_ids))
+
+    def get(self, service, limit):
+        """
+            Get oldest listens for service
+            @param service as str
+            @param limit as int
+            @return [(int, int, str, str, str, str, int, int, str, str, str)]:
+                    (id, timestamp, artist, album artist, title, album,
+                     track number, duration, mb track id, mb album id,
+                     mb artist ids separated by ;)
+        """
+        with SqlCursor(self) as sql:
+            result = sql.execute("SELECT id, timestamp, artist, album_artist,\
+                                  title, album, tracknumber, duration,\
+                                  mb_track_id, mb_album_id, mb_artist_ids\
+                                  FROM scrobbles WHERE service=?\
+                                  ORDER BY id LIMIT ?",
+                                 (service, limit))
+            return list(result)
+
+    def remove(self, scrobble_ids):
+        """
+            Remove submitted listens
+            @param scrobble_ids as [int]
+            @thread safe
+        """
+        with SqlCursor(self, True) as sql:
+            sql.executemany("DELETE FROM scrobbles WHERE id=?",
+                            [(scrobble_id,) for scrobble_id in scrobble_ids])
+
+    def count(self, service):
+        """
+            Get listens count for service
+            @param service as str
+            @return int
+        """
+        with SqlCursor(self) as sql:
+            result = sql.execute("SELECT COUNT(*) FROM scrobbles\
+                                  WHERE service=?", (service,))
+            v = result.fetchone()
+            if v is not None:
+                return v[0]
+            return 0
+
+    def get_cursor(self):
+        """
+            Return a new sqlite cursor
+        """
+        try:
+            return sqlite3.connect(self.__DB_PATH, 600.0,
+                                   check_same_thread=False)
+        except:
+            exit(-1)
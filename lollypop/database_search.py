@@ -0,0 +1,269 @@
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import re
+
+from lollypop.sqlcursor import SqlCursor
+from lollypop.logger import Logger
+from lollypop.utils import noaccents
+
+
+class SearchDatabase:
+    """
+        Full text search index for tracks, albums and artists
+        Accents and case are folded by FTS5 tokenizer
+        Row id is item id * 4 + item kind, see __TRACK/__ALBUM/__ARTIST
+        - tracks: name, track artists (performers)
+        - albums: name, album artists
+        - artists: name
+    """
+
+    __TRACK = 0
+    __ALBUM = 1
+    __ARTIST = 2
+
+    # Same separators as unicode61 tokenizer
+    __TOKENS = re.compile(r"[^\W_]+")
+
+    # name column is more relevant than artists column
+    __SEARCH = "SELECT rowid, name, artists FROM (\
+                SELECT search.rowid AS rowid, search.name AS name,\
+                search.artists AS artists, ROW_NUMBER() OVER (\
+                    PARTITION BY search.rowid % 4\
+                    ORDER BY bm25(search, 10.0, 1.0)) AS position\
+                FROM search WHERE search MATCH ? AND\
+                CASE search.rowid % 4\
+                    WHEN 0 THEN EXISTS (\
+                        SELECT 1 FROM tracks\
+                        WHERE tracks.rowid=search.rowid / 4\
+                        AND tracks.storage_type & ?)\
+                    WHEN 1 THEN EXISTS (\
+                        SELECT 1 FROM albums\
+                        WHERE albums.rowid=search.rowid / 4\
+                        AND albums.storage_type & ?)\
+                    ELSE EXISTS (\
+                        SELECT 1 FROM album_artists, albums\
+                        WHERE album_artists.artist_id=search.rowid / 4\
+                        AND albums.rowid=album_artists.album_id\
+                        AND albums.storage_type & ?) END)\
+                WHERE position <= ? ORDER BY position"
+    __ADD_TRACK = "INSERT INTO search (rowid, name, artists)\
+                   SELECT tracks.rowid * 4, tracks.name, (\
+                        SELECT group_concat(artists.name, ' ')\
+                        FROM track_artists, artists\
+                        WHERE track_artists.track_id=tracks.rowid\
+                        AND artists.rowid=track_artists.artist_id)\
+                   FROM tracks"
+    __ADD_ALBUM = "INSERT INTO search (rowid, name, artists)\
+                   SELECT albums.rowid * 4 + 1, albums.name, (\
+                        SELECT group_concat(artists.name, ' ')\
+                        FROM album_artists, artists\
+                        WHERE album_artists.album_id=albums.rowid\
+                        AND artists.rowid=album_artists.artist_id)\
+                   FROM albums"
+    __ADD_ARTIST = "INSERT INTO search (rowid, name, artists)\
+                    SELECT artists.rowid * 4 + 2, artists.name, ''\
+                    FROM artists"
+
+    def __init__(self, db):
+        """
+            Init search database object
+            @param db as Database
+        """
+        self.__db = db
+        self.__available = None
+
+    def get(self, search, storage_type, limit):
+        """
+            Get items matching search, best matches first
+            @param search as str
+            @param storage_type as StorageType
+            @param limit as int: max items for each kind
+            @return ([int], [int], [int]): artist ids, album ids, track ids
+        """
+        rows = self.get_rows(search, storage_type, limit)
+        return self.split(rows or [])
+
+    def get_rows(self, search, storage_type, limit, cancellable=None):
+        """
+            Get rows matching search, best matches first
+            Words are prefixes, one character words must match a word
+            @param search as str
+            @param storage_type as StorageType
+            @param limit as int: max items for each kind
+            @param cancellable as Gio.Cancellable: interrupts query
+            @return [(int, str)]: (rowid, indexed text), None if cancelled
+        """
+        words = []
+        for word in noaccents(search).split():
+            phrase = '"%s"' % word.replace('"', '""')
+            words.append(phrase + "*" if len(word) > 1 else phrase)
+        if not words:
+            return []
+        try:
+            with SqlCursor(self.__db) as sql:
+                if cancellable is not None:
+                    sql.set_progress_handler(cancellable.is_cancelled, 1000)
+                try:
+                    result = sql.execute(self.__SEARCH,
+                                         (" ".join(words), storage_type,
+                                          storage_type, storage_type, limit))
+                    return [(rowid, "%s %s" % (name, artists or ""))
+                            for (rowid, name, artists) in result]
+                finally:
+                    if cancellable is not None:
+                        sql.set_progress_handler(None, 0)
+        except Exception as e:
+            if cancellable is None or not cancellable.is_cancelled():
+                Logger.error("SearchDatabase::get_rows(): %s", e)
+        return None
+
+    def refine(self, rows, search):
+        """
+            Filter rows from a previous search, same matching as index
+            @param rows as [(int, str)]
+            @param search as str
+            @return [(int, str)]
+        """
+        words = [(self.__TOKENS.findall(word), len(word) > 1)
+                 for word in noaccents(search).split()]
+        refined = []
+        for (rowid, text) in rows:
+            tokens = self.__TOKENS.findall(noaccents(text))
+            for (word, prefix) in words:
+                if not self.__match(tokens, word, prefix):
+                    break
+            else:
+                refined.append((rowid, text))
+        return refined
+
+    def is_refinement(self, previous, search):
+        """
+            True if search results are a subset of previous search results
+            @param previous as str
+            @param search as str
+            @return bool
+        """
+        previous_words = noaccents(previous).split()
+        words = noaccents(search).split()
+        if not previous_words or len(words) < len(previous_words):
+            return False
+        for (previous_word, word) in zip(previous_words, words):
+            # One character words are not prefixes
+            if not word.startswith(previous_word) or\
+                    (len(previous_word) == 1 and word != previous_word):
+                return False
+        return True
+
+    def split(self, rows):
+        """
+            Split rows by kind
+            @param rows as [(int, str)]
+            @return ([int], [int], [int]): artist ids, album ids, track ids
+        """
+        artist_ids = []
+        album_ids = []
+        track_ids = []
+        for (rowid, text) in rows:
+            kind = rowid % 4
+            if kind == self.__TRACK:
+                track_ids.append(rowid // 4)
+            elif kind == self.__ALBUM:
+                album_ids.append(rowid // 4)
+            else:
+                artist_ids.append(rowid // 4)
+        return (artist_ids, album_ids, track_ids)
+
+    def update(self, track_ids, album_ids, artist_ids):
+        """
+            Index items again from DB, missing items are removed
+            @param track_ids as [int]
+            @param album_ids as [int]
+            @param artist_ids as [int]
+            @warning: commit needed
+        """
+        if not self.available:
+            return
+        with SqlCursor(self.__db, True) as sql:
+            for (ids, kind, table, request) in [
+                    (track_ids, self.__TRACK, "tracks", self.__ADD_TRACK),
+                    (album_ids, self.__ALBUM, "albums", self.__ADD_ALBUM),
+                    (artist_ids, self.__ARTIST, "artists",
+                     self.__ADD_ARTIST)]:
+                ids = list(dict.fromkeys(ids))
+                sql.executemany("DELETE FROM search WHERE rowid=?",
+                                [(item_id * 4 + kind,) for item_id in ids])
+                sql.executemany("%s WHERE %s.rowid=?" % (request, table),
+                                [(item_id,) for item_id in ids])
+
+    def clean(self):
+        """
+            Remove removed items from index
+            @warning: commit needed
+        """
+        if not self.available:
+            return
+        with SqlCursor(self.__db, True) as sql:
+            sql.execute("DELETE FROM search WHERE rowid % 4 = 0\
+                         AND rowid / 4 NOT IN (SELECT rowid FROM tracks)")
+            sql.execute("DELETE FROM search WHERE rowid % 4 = 1\
+                         AND rowid / 4 NOT IN (SELECT rowid FROM albums)")
+            sql.execute("DELETE FROM search WHERE rowid % 4 = 2\
+                         AND rowid / 4 NOT IN (SELECT rowid FROM artists)")
+
+    def rebuild(self):
+        """
+            Index all items
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db, True) as sql:
+            sql.execute("DELETE FROM search")
+            for request in [self.__ADD_TRACK,
+                            self.__ADD_ALBUM,
+                            self.__ADD_ARTIST]:
+                sql.execute(request)
+
+    @property
+    def available(self):
+        """
+            True if index exists, SQLite may be built without FTS5
+            @return bool
+        """
+        if self.__available is None:
+            with SqlCursor(self.__db) as sql:
+                result = sql.execute("SELECT COUNT(*) FROM sqlite_master\
+                                      WHERE type='table' AND name='search'")
+                self.__available = result.fetchone()[0] != 0
+        return self.__available
+
+#######################
+# PRIVATE             #
+#######################
+    def __match(self, tokens, word, prefix):
+        """
+            True if word tokens follow each other in tokens
+            @param tokens as [str]
+            @param word as [str]
+            @param prefix as bool: last word token is a prefix
+            @return bool
+        """
+        # Like FTS5, ignore words without tokens
+        if not word:
+            return True
+        count = len(word)
+        for i in range(0, len(tokens) - count + 1):
+            if tokens[i:i + count - 1] != word[:-1]:
+                continue
+            if tokens[i + count - 1] == word[-1] or\
+                    (prefix and tokens[i + count - 1].startswith(word[-1])):
+                return True
+        return False
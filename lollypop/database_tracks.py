@@ -24,6 +24,13 @@ class TracksDatabase:
         All functions take a sqlite cursor as last parameter,
         set another one if you"re in a thread
     """
+    # Attributes returned by get_rows() after track id, see Track.set_row()
+    ROW_ATTRIBUTES = ("name", "uri", "duration", "number", "discnumber",
+                      "discname", "album_id", "year", "timestamp",
+                      "popularity", "rate", "loved", "mtime", "storage_type",
+                      "mb_track_id", "lp_track_id")
+    # Keep under SQLite host parameters limit
+    __ROWS_CHUNK = 500
 
     def __init__(self, db):
         """
@@ -70,6 +77,51 @@ class TracksDatabase:
                  bpm, storage_type))
             return result.lastrowid
 
+    def add_many(self, values):
+        """
+            Add new tracks to database
+            @param values as [()]: same parameters as add()
+            @return inserted rowids as [int]
+            @warning: commit needed
+        """
+        if not values:
+            return []
+        with SqlCursor(self.__db, True) as sql:
+            sql.executemany(
+                "INSERT INTO tracks (name, uri, duration, tracknumber,\
+                discnumber, discname, album_id,\
+                year, timestamp, popularity, rate, loved,\
+                ltime, mtime, mb_track_id, lp_track_id, bpm, storage_type)\
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values)
+            # New rowids are MAX(rowid) + 1 and DB is write locked until
+            # commit: inserted tracks are the last ones
+            result = sql.execute("SELECT MAX(rowid) FROM tracks")
+            last = result.fetchone()[0]
+            return list(range(last - len(values) + 1, last + 1))
+
+    def add_many_artists(self, values):
+        """
+            Add artists to new tracks
+            @param values as [(int, int)]: (track_id, artist_id)
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db, True) as sql:
+            sql.executemany("INSERT INTO\
+                             track_artists (track_id, artist_id)\
+                             VALUES (?, ?)", values)
+
+    def add_many_genres(self, values):
+        """
+            Add genres to new tracks
+            @param values as [(int, int)]: (track_id, genre_id)
+            @warning: commit needed
+        """
+        with SqlCursor(self.__db, True) as sql:
+            sql.executemany("INSERT INTO\
+                             track_genres (track_id, genre_id)\
+                             VALUES (?, ?)", values)
+
     def add_artist(self, track_id, artist_id):
         """
             Add artist to track
@@ -265,6 +317,33 @@ class TracksDatabase:
                 return v[0]
             return ""
 
+    def get_rows(self, track_ids):
+        """
+            Get tracks attributes with one query per chunk of tracks
+            @param track_ids as [int]
+            @return [(track_id, name, uri, duration, tracknumber, discnumber,
+                      discname, album_id, year, timestamp, popularity, rate,
+                      loved, mtime, storage_type, mb_track_id, lp_track_id)],
+                    track_ids order
+        """
+        rows = {}
+        with SqlCursor(self.__db) as sql:
+            for i in range(0, len(track_ids), self.__ROWS_CHUNK):
+                chunk = track_ids[i:i + self.__ROWS_CHUNK]
+                result = sql.execute("SELECT rowid, name, uri, duration,\
+                                      tracknumber, discnumber, discname,\
+                                      album_id, NULLIF(year, 0),\
+                                      NULLIF(timestamp, 0), popularity, rate,\
+                                      loved, mtime, storage_type, mb_track_id,\
+                                      IFNULL(lp_track_id, '')\
+                                      FROM tracks WHERE rowid IN %s" %
+                                     make_subrequest("?", ",", len(chunk)),
+                                     chunk)
+                for row in result:
+                    rows[row[0]] = row
+        return [rows[track_id] for track_id in track_ids
+                if track_id in rows.keys()]
+
     def set_uri(self, track_id, uri):
         """
             Set track uri
@@ -933,11 +1012,9 @@ class TracksDatabase:
             @return discs [(int, int)]
         """
         with SqlCursor(self.__db) as sql:
-            order = " ORDER BY artists.sortname\
-                     COLLATE NOCASE COLLATE LOCALIZED,\
+            order = " ORDER BY artists.sortkey,\
                      tracks.timestamp,\
-                     albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED LIMIT ?"
+                     albums.sortkey LIMIT ?"
             request = "SELECT DISTINCT tracks.album_id,\
                        discnumber,\
                        discname,\
@@ -968,8 +1045,7 @@ class TracksDatabase:
             @return discs [(int, int)]
         """
         with SqlCursor(self.__db) as sql:
-            order = " ORDER BY albums.timestamp, albums.name\
-                     COLLATE NOCASE COLLATE LOCALIZED LIMIT ?"
+            order = " ORDER BY albums.timestamp, albums.sortkey LIMIT ?"
             request = "SELECT DISTINCT tracks.album_id,\
                        discnumber,\
                        discname,\
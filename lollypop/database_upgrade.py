@@ -20,6 +20,7 @@ from lollypop.sqlcursor import SqlCursor
 from lollypop.utils import translate_artist_name
 from lollypop.database_history import History
 from lollypop.define import App, Type, StorageType, LOLLYPOP_DATA_PATH
+from lollypop.define import CACHE_PATH
 from lollypop.logger import Logger
 from lollypop.helper_task import TaskHelper
 
@@ -175,6 +176,11 @@ class DatabaseAlbumsUpgrade(DatabaseUpgrade):
             46: self.__upgrade_46,
             47: self.__upgrade_47,
             48: self.__upgrade_48,
+            49: self.__upgrade_49,
+            50: self.__upgrade_50,
+            51: self.__upgrade_51,
+            52: self.__upgrade_52,
+            53: self.__upgrade_53,
         }
 
 #######################
@@ -837,3 +843,85 @@ class DatabaseAlbumsUpgrade(DatabaseUpgrade):
             sql.execute("UPDATE albums set loved=2 where loved=1")
             sql.execute("UPDATE albums set loved=1 where loved=0")
             sql.execute("UPDATE albums set loved=4 where loved=-1")
+
+    def __upgrade_49(self, db):
+        """
+            Add indexes for lookups done once per file/album
+        """
+        with SqlCursor(db, True) as sql:
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_tracks_uri\
+                         ON tracks(uri, mtime, storage_type)")
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_tracks_album\
+                         ON tracks(album_id)")
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_albums_uri\
+                         ON albums(uri)")
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_albums_name\
+                         ON albums(name COLLATE NOCASE)")
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_artists_name\
+                         ON artists(name COLLATE NOCASE)")
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_aa_artist\
+                         ON album_artists(artist_id, album_id)")
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_ag_genre\
+                         ON album_genres(genre_id, album_id)")
+
+    def __upgrade_50(self, db):
+        """
+            Add collection directories table
+        """
+        with SqlCursor(db, True) as sql:
+            sql.execute("CREATE TABLE IF NOT EXISTS dirs (\
+                         uri TEXT NOT NULL,\
+                         parent TEXT NOT NULL,\
+                         mtime INT NOT NULL,\
+                         count INT NOT NULL)")
+            sql.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_dirs_uri\
+                         ON dirs(uri)")
+
+    def __upgrade_51(self, db):
+        """
+            Add full text search index
+        """
+        from lollypop.database_search import SearchDatabase
+        with SqlCursor(db, True) as sql:
+            sql.execute("CREATE VIRTUAL TABLE IF NOT EXISTS search\
+                         USING fts5(name, artists,\
+                         tokenize='unicode61 remove_diacritics 2')")
+        SearchDatabase(db).rebuild()
+
+    def __upgrade_52(self, db):
+        """
+            Add locale sort keys, filled by Database.update_sort_keys()
+        """
+        with SqlCursor(db, True) as sql:
+            sql.execute("ALTER TABLE albums ADD sortkey TEXT")
+            sql.execute("ALTER TABLE artists ADD sortkey TEXT")
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_albums_sortkey\
+                         ON albums(sortkey)")
+            sql.execute("CREATE INDEX IF NOT EXISTS idx_artists_sortkey\
+                         ON artists(sortkey)")
+
+    def __upgrade_53(self, db):
+        """
+            Add albums/discs durations, remove durations cache
+        """
+        from lollypop.database_albums import AlbumsDatabase
+        try:
+            f = Gio.File.new_for_path(CACHE_PATH + "/cache_v1.db")
+            f.delete(None)
+        except:
+            pass
+        with SqlCursor(db, True) as sql:
+            sql.execute("ALTER TABLE albums\
+                         ADD duration INT NOT NULL DEFAULT 0")
+            sql.execute("ALTER TABLE albums\
+                         ADD track_count INT NOT NULL DEFAULT 0")
+            sql.execute("CREATE TABLE IF NOT EXISTS album_discs (\
+                         album_id INT NOT NULL,\
+                         discnumber INT,\
+                         duration INT NOT NULL,\
+                         track_count INT NOT NULL)")
+            sql.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_album_discs\
+                         ON album_discs(album_id, discnumber)")
+            result = sql.execute("SELECT rowid FROM albums")
+            album_ids = [row[0] for row in result]
+        AlbumsDatabase(db).update_durations(album_ids)
@@ -159,6 +159,14 @@ class LoadingState:
     FINISHED = 3
 
 
+class TaskLane:
+    # Lower lanes run first
+    UI_ARTWORK = 0
+    ARTWORK = 1
+    DB = 2
+    NETWORK = 3
+
+
 class IndicatorType:
     NONE = 1 << 0
     PLAY = 1 << 1
@@ -14,8 +14,7 @@ from gi.repository import GObject, GLib, Gtk, Gdk
 
 import cairo
 
-from lollypop.define import App, ArtBehaviour
-from lollypop.utils import get_round_surface
+from lollypop.define import App, ArtBehaviour, TaskLane
 
 
 class ArtHelper(GObject.Object):
@@ -71,7 +70,9 @@ class ArtHelper(GObject.Object):
                                         scale_factor,
                                         effect,
                                         callback,
-                                        *args))
+                                        *args),
+                              lane=TaskLane.UI_ARTWORK,
+                              widget=self.__get_widget(callback))
 
     def set_artist_artwork(self, name, width, height, scale_factor,
                            effect, callback, *args):
@@ -96,7 +97,9 @@ class ArtHelper(GObject.Object):
                                         scale_factor,
                                         effect,
                                         callback,
-                                        *args))
+                                        *args),
+                              lane=TaskLane.UI_ARTWORK,
+                              widget=self.__get_widget(callback))
 
 #######################
 # PROTECTED           #
@@ -112,21 +115,28 @@ class ArtHelper(GObject.Object):
             @param callback as function
         """
         surface = None
+        # Pixbuf is already rounded by artwork manager
         if pixbuf is not None:
-            if effect & ArtBehaviour.ROUNDED:
-                radius = pixbuf.get_width() / 2
-                surface = get_round_surface(pixbuf, scale_factor, radius)
-            elif effect & ArtBehaviour.ROUNDED_BORDER:
-                surface = get_round_surface(pixbuf, scale_factor, 5)
-            else:
-                surface = Gdk.cairo_surface_create_from_pixbuf(
-                        pixbuf, scale_factor, None)
+            surface = Gdk.cairo_surface_create_from_pixbuf(
+                    pixbuf, scale_factor, None)
         App().task_helper.run(self.__surface_effects, surface, width, height,
-                              scale_factor, effect, callback, *args)
+                              scale_factor, effect, callback, *args,
+                              lane=TaskLane.UI_ARTWORK)
 
 #######################
 # PRIVATE             #
 #######################
+    def __get_widget(self, callback):
+        """
+            Get widget waiting for artwork, hidden widgets load it later
+            @param callback as function
+            @return Gtk.Widget/None
+        """
+        widget = getattr(callback, "__self__", None)
+        if isinstance(widget, Gtk.Widget):
+            return widget
+        return None
+
     def __surface_effects(self, surface, width, height, scale_factor,
                           effect, callback, *args):
         """
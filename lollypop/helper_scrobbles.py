@@ -0,0 +1,152 @@
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import GLib
+
+from pickle import load
+import os
+
+from lollypop.database_scrobbles import ScrobblesDatabase
+from lollypop.define import App, LOLLYPOP_DATA_PATH, TaskLane
+from lollypop.logger import Logger
+
+
+class ScrobblesHelper:
+    """
+        Listens queue for a scrobbling service
+        Listens are written to disk as soon as they happen and submitted by
+        batches, a failed batch is retried later with an exponential backoff
+    """
+
+    __BACKOFF = 30  # First retry delay in seconds
+    __MAX_BACKOFF = 3600
+
+    def __init__(self, name, batch_size, submit):
+        """
+            Init helper
+            @param name as str: service name
+            @param batch_size as int: max listens by submission
+            @param submit as function: called in a thread with
+                   ScrobblesDatabase.get() rows, returns True on success
+        """
+        self.__name = name
+        self.__batch_size = batch_size
+        self.__submit = submit
+        self.__db = ScrobblesDatabase()
+        self.__submitting = False
+        self.__stopped = False
+        self.__failures = 0
+        self.__retry_id = None
+        self.__import_queue()
+
+    def add(self, track, timestamp):
+        """
+            Add a listen to queue
+            @param track as Track
+            @param timestamp as int
+        """
+        try:
+            self.__db.add(self.__name, track, timestamp)
+        except Exception as e:
+            Logger.error("ScrobblesHelper::add(): %s", e)
+
+    def flush(self):
+        """
+            Submit waiting listens
+            Nothing is done if a retry is already scheduled
+        """
+        if self.__submitting or self.__retry_id is not None:
+            return
+        self.__stopped = False
+        self.__submitting = True
+        App().task_helper.run(self.__submit_all,
+                              callback=(self.__on_submitted,),
+                              lane=TaskLane.NETWORK)
+
+    def stop(self):
+        """
+            Stop scheduled retries
+        """
+        self.__stopped = True
+        if self.__retry_id is not None:
+            GLib.source_remove(self.__retry_id)
+            self.__retry_id = None
+
+    @property
+    def count(self):
+        """
+            Get waiting listens count
+            @return int
+        """
+        return self.__db.count(self.__name)
+
+#######################
+# PRIVATE             #
+#######################
+    def __import_queue(self):
+        """
+            Import listens from queue pickled by previous versions
+        """
+        path = "%s/%s_queue.bin" % (LOLLYPOP_DATA_PATH, self.__name)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "rb") as f:
+                for (track, timestamp) in load(f):
+                    self.__db.add(self.__name, track, timestamp)
+            os.remove(path)
+        except Exception as e:
+            Logger.error("ScrobblesHelper::__import_queue(): %s", e)
+
+    def __submit_all(self):
+        """
+            Submit listens by batches until queue is empty
+            @return bool: False if a batch failed
+        """
+        try:
+            while not self.__stopped:
+                rows = self.__db.get(self.__name, self.__batch_size)
+                if not rows:
+                    break
+                if not self.__submit(rows):
+                    return False
+                self.__db.remove([row[0] for row in rows])
+                Logger.debug("ScrobblesHelper::__submit_all(): %s: %s",
+                             self.__name, len(rows))
+            return True
+        except Exception as e:
+            Logger.error("ScrobblesHelper::__submit_all(): %s", e)
+            return False
+
+    def __on_submitted(self, success):
+        """
+            Schedule a retry on failure
+            @param success as bool
+        """
+        self.__submitting = False
+        if success:
+            self.__failures = 0
+        elif not self.__stopped:
+            delay = min(self.__BACKOFF * 2 ** self.__failures,
+                        self.__MAX_BACKOFF)
+            self.__failures += 1
+            Logger.info("%s: submission failed, retrying in %s seconds",
+                        self.__name, delay)
+            self.__retry_id = GLib.timeout_add_seconds(delay,
+                                                       self.__on_retry)
+
+    def __on_retry(self):
+        """
+            Retry submission
+        """
+        self.__retry_id = None
+        self.flush()
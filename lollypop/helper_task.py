@@ -12,14 +12,419 @@
 
 import gi
 gi.require_version("Soup", "3.0")
-from gi.repository import GLib, Soup
+from gi.repository import GLib, Gtk, Soup
 
-from threading import Thread
+from threading import Thread, Condition, Lock, local
 from urllib.parse import urlparse
-from time import time, sleep
+from time import time, sleep, monotonic
+from collections import deque
+from multiprocessing import cpu_count
 
-from lollypop.define import App
+from lollypop.define import App, TaskLane
 from lollypop.logger import Logger
+from lollypop.utils import is_widget_visible
+
+
+class TaskExecutor:
+    """
+        Run tasks in a bounded pool of threads
+        Tasks are queued by lane, lower lanes run first and each lane has a
+        maximum number of running tasks, so network tasks can't starve
+        artwork loading
+    """
+
+    __LOG_INTERVAL = 10
+
+    def __init__(self, count):
+        """
+            Init executor
+            @param count as int => max threads
+        """
+        self.__count = count
+        self.__limits = {TaskLane.UI_ARTWORK: count,
+                         TaskLane.ARTWORK: max(1, count // 4),
+                         TaskLane.DB: max(1, count // 2),
+                         TaskLane.NETWORK: max(1, count // 2)}
+        self.__queues = {lane: deque() for lane in self.__limits.keys()}
+        self.__running = {lane: 0 for lane in self.__limits.keys()}
+        # Wait times: (count, total, max)
+        self.__waits = {lane: (0, 0, 0) for lane in self.__limits.keys()}
+        self.__condition = Condition()
+        self.__threads = []
+        self.__idle = 0
+        self.__dropped = 0
+        self.__parked = 0
+        # Main thread only
+        self.__parked_tasks = {}
+        self.__scrolled_tasks = {}
+        self.__scrolled_handlers = {}
+        self.__last_log = monotonic()
+
+    def submit(self, lane, task, first=False):
+        """
+            Queue task
+            @param lane as TaskLane
+            @param task as [callable, Gio.Cancellable, Gtk.Widget, float]
+            @param first as bool => run before other lane tasks
+        """
+        task[3] = monotonic()
+        with self.__condition:
+            if first:
+                self.__queues[lane].appendleft(task)
+            else:
+                self.__queues[lane].append(task)
+            queued = sum([len(queue) for queue in self.__queues.values()])
+            if queued > self.__idle and len(self.__threads) < self.__count:
+                thread = Thread(target=self.__worker,
+                                name="TaskExecutor-%s" % len(self.__threads))
+                thread.daemon = True
+                self.__threads.append(thread)
+                thread.start()
+            else:
+                self.__condition.notify()
+
+    def pending(self, lane):
+        """
+            Get queued and running tasks count for lane
+            @param lane as TaskLane
+            @return int
+        """
+        with self.__condition:
+            return len(self.__queues[lane]) + self.__running[lane]
+
+    @property
+    def stats(self):
+        """
+            Get executor counters, wait times in milliseconds
+            @return {str: int/{}}
+        """
+        with self.__condition:
+            waits = {}
+            for (lane, (count, total, max_wait)) in self.__waits.items():
+                average = total / count if count else 0
+                waits[lane] = (int(average * 1000), int(max_wait * 1000))
+            return {"threads": len(self.__threads),
+                    "queued": {lane: len(queue)
+                               for (lane, queue) in self.__queues.items()},
+                    "running": dict(self.__running),
+                    "waits": waits,
+                    "dropped": self.__dropped,
+                    "parked": self.__parked}
+
+#######################
+# PRIVATE             #
+#######################
+    def __pop(self):
+        """
+            Get next task to run
+            Condition lock must be held
+            @return (TaskLane, [])/(None, None)
+        """
+        for lane in sorted(self.__queues.keys()):
+            queue = self.__queues[lane]
+            while queue and self.__running[lane] < self.__limits[lane]:
+                task = queue.popleft()
+                cancellable = task[1]
+                if cancellable is not None and cancellable.is_cancelled():
+                    self.__dropped += 1
+                    continue
+                return (lane, task)
+        return (None, None)
+
+    def __worker(self):
+        """
+            Run queued tasks
+        """
+        while True:
+            with self.__condition:
+                (lane, task) = self.__pop()
+                while task is None:
+                    self.__idle += 1
+                    self.__condition.wait()
+                    self.__idle -= 1
+                    (lane, task) = self.__pop()
+                self.__running[lane] += 1
+                (count, total, max_wait) = self.__waits[lane]
+                wait = monotonic() - task[3]
+                self.__waits[lane] = (count + 1, total + wait,
+                                      max(max_wait, wait))
+            try:
+                # Widgets can only be checked from main thread
+                if task[2] is not None:
+                    GLib.idle_add(self.__check, lane, task)
+                else:
+                    task[0]()
+            finally:
+                with self.__condition:
+                    self.__running[lane] -= 1
+                    self.__condition.notify()
+                    log = monotonic() - self.__last_log > self.__LOG_INTERVAL
+                    if log:
+                        self.__last_log = monotonic()
+                if log:
+                    Logger.debug("TaskExecutor: %s", self.stats)
+
+    def __check(self, lane, task):
+        """
+            Run task if widget is visible, else wait for widget
+            Main thread only
+            @param lane as TaskLane
+            @param task as []
+        """
+        cancellable = task[1]
+        widget = task[2]
+        if (cancellable is not None and cancellable.is_cancelled()) or\
+                widget.in_destruction():
+            with self.__condition:
+                self.__dropped += 1
+        elif is_widget_visible(widget):
+            task[2] = None
+            self.submit(lane, task, True)
+        else:
+            self.__park(lane, task)
+
+    def __park(self, lane, task):
+        """
+            Queue task again when widget gets visible: allocated or
+            scrolled into view. Task is dropped if widget is destroyed
+            Main thread only
+            @param lane as TaskLane
+            @param task as []
+        """
+        widget = task[2]
+        key = id(task)
+        handler_ids = [
+            widget.connect("size-allocate",
+                           lambda *ignore: self.__recheck(key)),
+            widget.connect("destroy",
+                           lambda *ignore: self.__drop(key))]
+        scrolleds = []
+        scrolled = widget.get_ancestor(Gtk.ScrolledWindow)
+        while scrolled is not None:
+            if scrolled not in self.__scrolled_tasks.keys():
+                self.__watch_scrolled(scrolled)
+            self.__scrolled_tasks[scrolled][key] = (lane, task)
+            scrolleds.append(scrolled)
+            parent = scrolled.get_parent()
+            scrolled = None if parent is None else\
+                parent.get_ancestor(Gtk.ScrolledWindow)
+        self.__parked_tasks[key] = (lane, task, handler_ids, scrolleds)
+        with self.__condition:
+            self.__parked += 1
+
+    def __unpark(self, key):
+        """
+            Forget parked task
+            Main thread only
+            @param key as int
+            @return (TaskLane, []) or None if not parked
+        """
+        parked = self.__parked_tasks.pop(key, None)
+        if parked is None:
+            return None
+        (lane, task, handler_ids, scrolleds) = parked
+        for handler_id in handler_ids:
+            task[2].disconnect(handler_id)
+        for scrolled in scrolleds:
+            tasks = self.__scrolled_tasks.get(scrolled, None)
+            if tasks is None:
+                continue
+            tasks.pop(key, None)
+            if not tasks:
+                self.__unwatch_scrolled(scrolled)
+        with self.__condition:
+            self.__parked -= 1
+        return (lane, task)
+
+    def __recheck(self, key):
+        """
+            Queue parked task again if widget is visible, drop it if
+            cancelled
+            Main thread only
+            @param key as int
+        """
+        parked = self.__parked_tasks.get(key, None)
+        if parked is None:
+            return
+        (lane, task) = parked[:2]
+        cancellable = task[1]
+        if cancellable is not None and cancellable.is_cancelled():
+            self.__drop(key)
+        elif is_widget_visible(task[2]):
+            self.__unpark(key)
+            task[2] = None
+            self.submit(lane, task, True)
+
+    def __drop(self, key):
+        """
+            Drop parked task
+            Main thread only
+            @param key as int
+        """
+        if self.__unpark(key) is not None:
+            with self.__condition:
+                self.__dropped += 1
+
+    def __watch_scrolled(self, scrolled):
+        """
+            Recheck tasks parked in scrolled when scrolled
+            Main thread only
+            @param scrolled as Gtk.ScrolledWindow
+        """
+        self.__scrolled_tasks[scrolled] = {}
+        handlers = []
+        for adjustment in [scrolled.get_vadjustment(),
+                           scrolled.get_hadjustment()]:
+            handlers.append((adjustment,
+                             adjustment.connect("value-changed",
+                                                self.__on_scrolled,
+                                                scrolled)))
+        handlers.append((scrolled,
+                         scrolled.connect("destroy",
+                                          self.__on_scrolled_destroy)))
+        self.__scrolled_handlers[scrolled] = handlers
+
+    def __unwatch_scrolled(self, scrolled):
+        """
+            Stop watching scrolled
+            Main thread only
+            @param scrolled as Gtk.ScrolledWindow
+        """
+        self.__scrolled_tasks.pop(scrolled, None)
+        for (obj, handler_id) in self.__scrolled_handlers.pop(scrolled, []):
+            obj.disconnect(handler_id)
+
+    def __on_scrolled(self, adjustment, scrolled):
+        """
+            Recheck tasks parked in scrolled
+            @param adjustment as Gtk.Adjustment
+            @param scrolled as Gtk.ScrolledWindow
+        """
+        tasks = self.__scrolled_tasks.get(scrolled, {})
+        for key in list(tasks.keys()):
+            self.__recheck(key)
+
+    def __on_scrolled_destroy(self, scrolled):
+        """
+            Drop tasks parked in scrolled
+            @param scrolled as Gtk.ScrolledWindow
+        """
+        tasks = self.__scrolled_tasks.get(scrolled, {})
+        for key in list(tasks.keys()):
+            self.__drop(key)
+        self.__unwatch_scrolled(scrolled)
+
+
+class SoupSessionPool:
+    """
+        Keep one Soup session per thread and per host, so connections
+        are kept alive between requests
+        Also handles servers rate limits
+    """
+
+    # Retries for a rate limited uri
+    __MAX_RETRIES = 5
+
+    def __init__(self, user_agent=None):
+        """
+            Init pool
+            @param user_agent as str/None => Lollypop user agent
+        """
+        self.__user_agent = user_agent
+        self.__local = local()
+        self.__lock = Lock()
+        self.__ratelimit = {}
+        self.__retries = {}
+        self.__created = 0
+        self.__requests = 0
+
+    def get(self, uri):
+        """
+            Get session for uri host in current thread
+            Soup sessions must not be shared between threads
+            @param uri as str
+            @return Soup.Session
+        """
+        netloc = urlparse(uri).netloc
+        sessions = getattr(self.__local, "sessions", None)
+        if sessions is None:
+            sessions = self.__local.sessions = {}
+        session = sessions.get(netloc, None)
+        with self.__lock:
+            self.__requests += 1
+            if session is None:
+                self.__created += 1
+        if session is None:
+            if self.__user_agent is None:
+                self.__user_agent =\
+                    "Lollypop/%s (cedric.bellegarde@adishatz.org)" %\
+                    App().version
+            session = Soup.Session.new()
+            session.set_property("accept-language-auto", True)
+            session.set_property("user-agent", self.__user_agent)
+            sessions[netloc] = session
+        return session
+
+    def get_delay(self, uri):
+        """
+            Get delay before next request to uri host
+            @param uri as str
+            @return int
+        """
+        delay = 0
+        now = time()
+        netloc = urlparse(uri).netloc
+        with self.__lock:
+            if netloc in self.__ratelimit.keys():
+                delay = self.__ratelimit[netloc] - now
+                if delay < 0:
+                    del self.__ratelimit[netloc]
+        return delay
+
+    def handle_ratelimit(self, response, uri):
+        """
+            Set rate limit for uri host from response
+            @param response as Soup.MessageHeaders
+            @param uri as str
+            @return True if request should be sent again
+        """
+        remaining_keys = ["X-RateLimit-Remaining", "X-Rate-Limit-Remaining"]
+        reset_keys = ["X-RateLimit-Reset", "X-Rate-Limit-Reset",
+                      "X-RateLimit-Reset-In", "X-RateLimit-Reset-At"]
+        for key in remaining_keys:
+            remaining = response.get_one(key)
+            if remaining is not None:
+                break
+        for key in reset_keys:
+            reset = response.get_one(key)
+            if reset is not None:
+                break
+        with self.__lock:
+            # No more request available
+            if remaining is not None and reset is not None and\
+                    int(remaining) < 1:
+                Logger.info(uri)
+                Logger.info("X-RateLimit-Remaining: %s" % remaining)
+                Logger.info("X-RateLimit-Reset: %s" % reset)
+                self.__ratelimit[urlparse(uri).netloc] = int(reset)
+                retries = self.__retries.get(uri, 0)
+                if retries < self.__MAX_RETRIES:
+                    self.__retries[uri] = retries + 1
+                    return True
+            if uri in self.__retries.keys():
+                del self.__retries[uri]
+            return False
+
+    @property
+    def stats(self):
+        """
+            Get pool counters
+            @return {str: int}
+        """
+        with self.__lock:
+            return {"sessions": self.__created,
+                    "requests": self.__requests,
+                    "ratelimited": len(self.__ratelimit)}
 
 
 class TaskHelper:
@@ -31,23 +436,54 @@ class TaskHelper:
         """
             Init helper
         """
-        self.__ratelimit = {}
-        self.__retries = {}
+        self.__sessions = SoupSessionPool()
+        self.__executor = TaskExecutor(max(4, min(8, cpu_count())))
 
     def run(self, command, *args, **kwargs):
         """
             Run command with params and return to callback
+            Without a lane, command runs in its own thread: use it for
+            long running tasks only
             @param command as function
             @param *args as command arguments
-            @param **kwargs
-            @return thread as Thread
+            @param **kwargs: callback as (function, *args)
+                             lane as TaskLane
+                             cancellable as Gio.Cancellable => do not run
+                                                               if cancelled
+                             widget as Gtk.Widget => run when visible
+            @return thread as Thread/None if queued in a lane
         """
+        lane = kwargs.pop("lane", None)
+        if lane is not None:
+            cancellable = kwargs.pop("cancellable", None)
+            widget = kwargs.pop("widget", None)
+            self.__executor.submit(
+                lane,
+                [lambda: self.__run(command, kwargs, *args),
+                 cancellable, widget, 0])
+            return None
         thread = Thread(target=self.__run,
                         args=(command, kwargs, *args))
         thread.daemon = True
         thread.start()
         return thread
 
+    def pending(self, lane):
+        """
+            Get queued and running tasks count for lane
+            @param lane as TaskLane
+            @return int
+        """
+        return self.__executor.pending(lane)
+
+    @property
+    def stats(self):
+        """
+            Get executor stats
+            @return {}
+        """
+        return self.__executor.stats
+
     def load_uri_content(self, uri, cancellable, callback, *args):
         """
             Load uri content async
@@ -72,7 +508,7 @@ class TaskHelper:
         if cancellable is not None and cancellable.is_cancelled():
             callback(uri, False, b"", *args)
         try:
-            delay = self.__get_delay_for_uri(uri)
+            delay = self.__sessions.get_delay(uri)
             if delay > 0:
                 GLib.timeout_add_seconds(
                                  delay,
@@ -81,17 +517,13 @@ class TaskHelper:
                                  callback, *args)
                 return
 
-            session = Soup.Session.new()
-            session.set_property('accept-language-auto', True)
-            session.set_property(
-                "user-agent",
-                "Lollypop/%s (cedric.bellegarde@adishatz.org)" % App().version)
+            session = self.__sessions.get(uri)
             msg = Soup.Message.new("GET", uri)
             if headers:
-                headers = msg.get_property("request-headers")
+                request_headers = msg.get_property("request-headers")
                 for header in headers:
-                    headers.append(header[0],
-                                   header[1])
+                    request_headers.append(header[0],
+                                           header[1])
             session.send_and_read_async(
                                msg, 0, cancellable,
                                self.__on_load_uri_content, msg, headers,
@@ -120,17 +552,13 @@ class TaskHelper:
             @return (loaded as bool, content as bytes)
         """
         try:
-            delay = self.__get_delay_for_uri(uri)
+            delay = self.__sessions.get_delay(uri)
             if delay > 0:
                 sleep(delay)
                 if cancellable is not None and cancellable.is_cancelled():
                     return (False, b"")
 
-            session = Soup.Session.new()
-            session.set_property('accept-language-auto', True)
-            session.set_property(
-                "user-agent",
-                "Lollypop/%s (cedric.bellegarde@adishatz.org)" % App().version)
+            session = self.__sessions.get(uri)
             msg = Soup.Message.new("GET", uri)
             if headers:
                 request_headers = msg.get_property("request-headers")
@@ -139,22 +567,15 @@ class TaskHelper:
             bytes = session.send_and_read(msg, cancellable).get_data()
             if bytes is None:
                 response_headers = msg.get_property("response-headers")
-                wait = self.__handle_ratelimit(response_headers, uri)
-                if wait is not None:
-                    retries = self.__get_retries_for_uri(uri)
-                    if retries < 5:
-                        parsed = urlparse(uri)
-                        self.__ratelimit[parsed.netloc] = wait
-                        return self.load_uri_content_sync_with_headers(
-                            uri, headers, cancellable)
-                    else:
-                        del self.__retries[uri]
+                if self.__sessions.handle_ratelimit(response_headers, uri):
+                    return self.load_uri_content_sync_with_headers(
+                        uri, headers, cancellable)
             else:
                 return (True, bytes)
         except Exception as e:
             Logger.warning(
                 "TaskHelper::load_uri_content_sync_with_headers(): %s" % e)
-            return (False, b"")
+        return (False, b"")
 
     def send_message(self, message, cancellable, callback, *args):
         """
@@ -166,7 +587,7 @@ class TaskHelper:
         """
         try:
             uri = message.get_uri().to_string(False)
-            delay = self.__get_delay_for_uri(uri)
+            delay = self.__sessions.get_delay(uri)
             if delay > 0:
                 GLib.timeout_add_seconds(delay,
                                          self.send_message,
@@ -174,7 +595,7 @@ class TaskHelper:
                                          callback, *args)
                 return
 
-            session = Soup.Session.new()
+            session = self.__sessions.get(uri)
             session.send_and_read_async(
                                message,
                                0,
@@ -197,94 +618,35 @@ class TaskHelper:
         """
         try:
             uri = message.get_uri().to_string()
-            delay = self.__get_delay_for_uri(uri)
+            delay = self.__sessions.get_delay(uri)
             if delay > 0:
                 sleep(delay)
                 if cancellable is not None and cancellable.is_cancelled():
                     return None
 
-            session = Soup.Session.new()
+            session = self.__sessions.get(uri)
             bytes = session.send_and_read(message, cancellable).get_data()
             if bytes is None:
                 response_headers = message.get_property("response-headers")
-                wait = self.__handle_ratelimit(response_headers, uri)
-                if wait is not None:
-                    retries = self.__get_retries_for_uri(uri)
-                    if retries < 5:
-                        parsed = urlparse(uri)
-                        self.__ratelimit[parsed.netloc] = wait
-                        return self.send_message_sync(message, cancellable)
-                    else:
-                        del self.__retries[uri]
+                if self.__sessions.handle_ratelimit(response_headers, uri):
+                    return self.send_message_sync(message, cancellable)
             else:
                 return bytes
         except Exception as e:
             Logger.warning("TaskHelper::send_message_sync(): %s" % e)
         return None
 
-#######################
-# PRIVATE             #
-#######################
-    def __get_delay_for_uri(self, uri):
-        """
-            Get delay for last ratelimit
-            @param uri as str
-            @return int
-        """
-        delay = 0
-        now = time()
-        parsed = urlparse(uri)
-        if parsed.netloc in self.__ratelimit.keys():
-            wait = self.__ratelimit[parsed.netloc]
-            delay = wait - now
-            if delay < 0:
-                del self.__ratelimit[parsed.netloc]
-        return delay
-
-    def __get_retries_for_uri(self, uri):
+    @property
+    def sessions(self):
         """
-            Get retries for uri
-            @param uri as str
-            @return int
+            Get HTTP sessions pool
+            @return SoupSessionPool
         """
-        retries = 0
-        if uri in self.__retries.keys():
-            retries = self.__retries[uri]
-        else:
-            self.__retries[uri] = 0
-        return retries
-
-    def __handle_ratelimit(self, response, uri):
-        """
-            Set rate limit from response
-            @param response as Soup.MessageHeaders
-            @param uri as str
-            @return next_time as int
-        """
-        remaining_keys = ["X-RateLimit-Remaining", "X-Rate-Limit-Remaining"]
-        reset_keys = ["X-RateLimit-Reset", "X-Rate-Limit-Reset",
-                      "X-RateLimit-Reset-In", "X-RateLimit-Reset-At"]
-        for key in remaining_keys:
-            remaining = response.get_one(key)
-            if remaining is not None:
-                break
-        for key in reset_keys:
-            reset = response.get_one(key)
-            if reset is not None:
-                break
-        if remaining is None or reset is None:
-            return None
-        # No more request available
-        if (int(remaining) < 1):
-            Logger.info(uri)
-            Logger.info("X-RateLimit-Remaining: %s" % remaining)
-            Logger.info("X-RateLimit-Reset: %s" % reset)
-            return int(reset)
-
-        if uri in self.__retries.keys():
-            del self.__retries[uri]
-        return None
+        return self.__sessions
 
+#######################
+# PRIVATE             #
+#######################
     def __run(self, command, kwd, *args):
         """
             Pass command result to callback
@@ -336,19 +698,11 @@ class TaskHelper:
         """
         try:
             response_headers = message.get_property("response-headers")
-            wait = self.__handle_ratelimit(response_headers, uri)
-            if wait is None:
+            if self.__sessions.handle_ratelimit(response_headers, uri):
+                self.send_message(message, cancellable, callback, *args)
+            else:
                 bytes = source.send_and_read_finish(result).get_data()
                 callback(uri, True, bytes, *args)
-            else:
-                parsed = urlparse(uri)
-                self.__ratelimit[parsed.netloc] = wait
-                retries = self.__get_retries_for_uri(uri)
-                if retries < 5:
-                    self.__retries[uri] += 1
-                    self.send_message(message, cancellable, callback, *args)
-                else:
-                    del self.__retries[uri]
         except Exception as e:
             Logger.warning("TaskHelper::__on_soup_msg_finished(): %s" % e)
             callback(uri, False, b"", *args)
@@ -367,20 +721,12 @@ class TaskHelper:
         """
         try:
             response_headers = msg.get_property("response-headers")
-            wait = self.__handle_ratelimit(response_headers, uri)
-            if wait is None:
+            if self.__sessions.handle_ratelimit(response_headers, uri):
+                self.load_uri_content_with_headers(uri, headers, cancellable,
+                                                   callback, *args)
+            else:
                 bytes = source.send_and_read_finish(result).get_data()
                 callback(uri, True, bytes, *args)
-            else:
-                parsed = urlparse(uri)
-                self.__ratelimit[parsed.netloc] = wait
-                retries = self.__get_retries_for_uri(uri)
-                if retries < 5:
-                    self.__retries[uri] += 1
-                    self.load_uri_content_sync_with_headers(uri, headers,
-                                                            callback, *args)
-                else:
-                    del self.__retries[uri]
         except Exception as e:
             Logger.warning("TaskHelper::__on_soup_msg_finished(): %s" % e)
             callback(uri, False, b"", *args)
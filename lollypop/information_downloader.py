@@ -15,7 +15,7 @@ from gi.repository import GLib
 import json
 from locale import getdefaultlocale
 
-from lollypop.define import App, AUDIODB_CLIENT_ID
+from lollypop.define import App, AUDIODB_CLIENT_ID, TaskLane
 from lollypop.utils import get_network_available
 from lollypop.logger import Logger
 
@@ -40,7 +40,8 @@ class InformationDownloader:
         if not get_network_available("DATA"):
             callback(None, *args)
             return
-        App().task_helper.run(self.__get_information, artist, callback, *args)
+        App().task_helper.run(self.__get_information, artist, callback, *args,
+                              lane=TaskLane.NETWORK)
 
 #######################
 # PROTECTED           #
@@ -10,6 +10,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from random import randrange
+
+from lollypop.define import App
+from lollypop.objects_album import Album
+
 
 class LinkedList:
     """
@@ -78,3 +83,416 @@ class LinkedList:
             @return value as int
         """
         return self.__value
+
+
+class ShuffleList:
+    """
+        Values in a random order, shuffled lazily (Fisher-Yates)
+        Values before position have been drawn, others have not
+        next(), choice(), add() and remove() are O(1)
+    """
+
+    def __init__(self, values=[]):
+        """
+            Init list
+            @param values as [int]: duplicates are ignored
+        """
+        self.__values = list(dict.fromkeys(values))
+        self.__indexes = {value: index
+                          for (index, value) in enumerate(self.__values)}
+        self.__position = 0
+
+    def next(self):
+        """
+            Draw a random value, each value is drawn once until reset()
+            @return int/None
+        """
+        if self.__position >= len(self.__values):
+            return None
+        index = randrange(self.__position, len(self.__values))
+        value = self.__values[index]
+        self.__move(self.__position, index)
+        self.__values[self.__position] = value
+        self.__indexes[value] = self.__position
+        self.__position += 1
+        return value
+
+    def choice(self):
+        """
+            Get a random value not drawn yet, value is not drawn
+            @return int/None
+        """
+        if self.__position >= len(self.__values):
+            return None
+        return self.__values[randrange(self.__position, len(self.__values))]
+
+    def add(self, value):
+        """
+            Add a value, not drawn yet
+            @param value as int
+        """
+        if value not in self.__indexes.keys():
+            self.__indexes[value] = len(self.__values)
+            self.__values.append(value)
+
+    def remove(self, value):
+        """
+            Remove value
+            @param value as int
+        """
+        index = self.__indexes.pop(value, None)
+        if index is None:
+            return
+        # Keep drawn values before position
+        if index < self.__position:
+            self.__position -= 1
+            self.__move(self.__position, index)
+            index = self.__position
+        self.__move(len(self.__values) - 1, index)
+        self.__values.pop()
+
+    def reset(self):
+        """
+            Mark all values as not drawn
+        """
+        self.__position = 0
+
+    def __contains__(self, value):
+        return value in self.__indexes.keys()
+
+    def __len__(self):
+        return len(self.__values)
+
+    @property
+    def remaining(self):
+        """
+            Get values count not drawn yet
+            @return int
+        """
+        return len(self.__values) - self.__position
+
+#######################
+# PRIVATE             #
+#######################
+    def __move(self, src, dst):
+        """
+            Move value at src to dst, value at dst is lost
+            @param src as int
+            @param dst as int
+        """
+        if src != dst:
+            value = self.__values[src]
+            self.__values[dst] = value
+            self.__indexes[value] = dst
+
+
+class PlaybackList:
+    """
+        Playback albums as parallel arrays: album ids, album filters and
+        albums. Albums added by id are only created when accessed, a
+        playback over the whole collection only holds ids
+        - index() and in are O(1), albums are compared by identity
+        - next/prev tracks are O(1) and only load tracks for current and
+          next/prev albums
+    """
+
+    def __init__(self, albums=[]):
+        """
+            Init list
+            @param albums as [Album]
+        """
+        self.__album_ids = []
+        # (genre ids, artist ids, skipped) for albums added by id,
+        # shared by albums added together, None for others
+        self.__filters = []
+        self.__albums = []
+        # {id(album): index} for created albums
+        self.__indexes = None
+        # {album id: [index]}
+        self.__id_indexes = None
+        self.__positions = {}
+        self.extend(albums)
+
+    def add_album_ids(self, album_ids, genre_ids=[], artist_ids=[],
+                      skipped=True):
+        """
+            Add albums by id, albums are created when accessed
+            @param album_ids as [int]
+            @param genre_ids as [int]
+            @param artist_ids as [int]
+            @param skipped as bool
+        """
+        filters = (genre_ids, artist_ids, skipped)
+        for album_id in album_ids:
+            self.__add(album_id, filters, None)
+
+    def append(self, album):
+        """
+            Append album
+            @param album as Album
+        """
+        self.__add(album.id, None, album)
+
+    def extend(self, albums):
+        """
+            Append albums
+            @param albums as [Album]
+        """
+        for album in albums:
+            self.append(album)
+
+    def remove(self, album):
+        """
+            Remove album
+            @param album as Album
+            @raise ValueError if album not in list
+        """
+        index = self.index(album)
+        del self.__album_ids[index]
+        del self.__filters[index]
+        del self.__albums[index]
+        self.__indexes = None
+        self.__id_indexes = None
+        self.__positions.pop(id(album), None)
+
+    def index(self, album):
+        """
+            Get album index
+            @param album as Album
+            @return int
+            @raise ValueError if album not in list
+        """
+        index = self.__get_indexes().get(id(album), None)
+        if index is None:
+            raise ValueError("album not in list")
+        return index
+
+    def get_albums(self, album_id):
+        """
+            Get albums for album id, albums are created if needed
+            @param album_id as int
+            @return [Album]
+        """
+        indexes = self.__get_id_indexes().get(album_id, [])
+        self.__create(indexes)
+        return [self.__albums[index] for index in indexes]
+
+    def has_album_id(self, album_id):
+        """
+            True if list contains album id
+            @param album_id as int
+            @return bool
+        """
+        return album_id in self.__get_id_indexes().keys()
+
+    def get_state(self):
+        """
+            Get albums state without creating albums
+            Track ids are None for albums not created: all album tracks
+            @return [[int, [int], [int], bool, [int]/None]]
+        """
+        state = []
+        for (album_id, filters, album) in zip(self.__album_ids,
+                                              self.__filters,
+                                              self.__albums):
+            if album is None:
+                (genre_ids, artist_ids, skipped) = filters
+                state.append([album_id, genre_ids, artist_ids,
+                              skipped, None])
+            else:
+                if filters is None:
+                    artist_ids = album.artist_ids
+                else:
+                    artist_ids = filters[1]
+                state.append([album.id, album.genre_ids, artist_ids,
+                              album.skipped, album.track_ids])
+        return state
+
+    def get_track_uris(self):
+        """
+            Get track uris in playback order, albums are not created
+            @return [str]
+        """
+        # Albums added together share filters, one query per filters
+        groups = {}
+        for (album_id, filters, album) in zip(self.__album_ids,
+                                              self.__filters,
+                                              self.__albums):
+            if album is None:
+                groups.setdefault(id(filters), (filters, []))[1].append(
+                    album_id)
+        uris = {}
+        for (key, (filters, album_ids)) in groups.items():
+            (genre_ids, artist_ids, skipped) = filters
+            uris[key] = App().albums.get_tracks_uris(
+                list(set(album_ids)), genre_ids, artist_ids, skipped)
+        track_uris = []
+        for (album_id, filters, album) in zip(self.__album_ids,
+                                              self.__filters,
+                                              self.__albums):
+            if album is None:
+                track_uris += uris[id(filters)].get(album_id, [])
+            else:
+                track_uris += album.track_uris
+        return track_uris
+
+    def get_next_track(self, album, track, repeat):
+        """
+            Get track after track in album or first track of next album
+            @param album as Album
+            @param track as Track
+            @param repeat as bool: go back to first album at end
+            @return Track/None
+        """
+        tracks = album.tracks
+        position = self.__get_position(album, track) + 1
+        if position < len(tracks):
+            return tracks[position]
+        index = self.index(album)
+        count = len(self)
+        for i in range(index + 1, index + count + 1):
+            if i >= count and not repeat:
+                break
+            tracks = self[i % count].tracks
+            if tracks:
+                return tracks[0]
+        return None
+
+    def get_prev_track(self, album, track, repeat):
+        """
+            Get track before track in album or last track of prev album
+            @param album as Album
+            @param track as Track
+            @param repeat as bool: go to last album at start
+            @return Track/None
+        """
+        tracks = album.tracks
+        position = self.__get_position(album, track) - 1
+        if position >= 0 and position < len(tracks):
+            return tracks[position]
+        index = self.index(album)
+        count = len(self)
+        for i in range(index - 1, index - count - 1, -1):
+            if i < 0 and not repeat:
+                break
+            tracks = self[i % count].tracks
+            if tracks:
+                return tracks[-1]
+        return None
+
+    @property
+    def album_ids(self):
+        """
+            Get album ids
+            @return [int]
+        """
+        return list(self.__album_ids)
+
+    def __contains__(self, album):
+        return id(album) in self.__get_indexes().keys()
+
+    def __len__(self):
+        return len(self.__album_ids)
+
+    def __getitem__(self, index):
+        """
+            Get albums, albums are created if needed
+            @param index as int/slice
+            @return Album/[Album]
+        """
+        if isinstance(index, slice):
+            indexes = range(len(self))[index]
+            self.__create(indexes)
+            return [self.__albums[i] for i in indexes]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("list index out of range")
+        self.__create([index])
+        return self.__albums[index]
+
+    def __iter__(self):
+        return iter(self[:])
+
+#######################
+# PRIVATE             #
+#######################
+    def __add(self, album_id, filters, album):
+        """
+            Add a new album slot, indexes are updated if needed
+            @param album_id as int
+            @param filters as ([int], [int], bool)/None
+            @param album as Album/None
+        """
+        index = len(self.__album_ids)
+        self.__album_ids.append(album_id)
+        self.__filters.append(filters)
+        self.__albums.append(album)
+        if self.__indexes is not None and album is not None:
+            self.__indexes.setdefault(id(album), index)
+        if self.__id_indexes is not None:
+            self.__id_indexes.setdefault(album_id, []).append(index)
+
+    def __create(self, indexes):
+        """
+            Create missing albums at indexes, one query for all albums
+            @param indexes as [int]
+        """
+        missing = [index for index in indexes
+                   if self.__albums[index] is None]
+        if not missing:
+            return
+        rows = {}
+        album_ids = list(set([self.__album_ids[index]
+                              for index in missing]))
+        for row in App().albums.get_rows(album_ids):
+            rows[row[0]] = row
+        for index in missing:
+            album_id = self.__album_ids[index]
+            (genre_ids, artist_ids, skipped) = self.__filters[index]
+            album = Album(album_id, genre_ids, artist_ids, skipped,
+                          rows.get(album_id, None))
+            self.__albums[index] = album
+            if self.__indexes is not None:
+                self.__indexes.setdefault(id(album), index)
+
+    def __get_indexes(self):
+        """
+            Get created album indexes, first index for an album
+            @return {int: int}: {id(album): index}
+        """
+        if self.__indexes is None:
+            self.__indexes = {}
+            for (index, album) in enumerate(self.__albums):
+                if album is not None:
+                    self.__indexes.setdefault(id(album), index)
+        return self.__indexes
+
+    def __get_id_indexes(self):
+        """
+            Get album indexes by album id
+            @return {int: [int]}
+        """
+        if self.__id_indexes is None:
+            self.__id_indexes = {}
+            for (index, album_id) in enumerate(self.__album_ids):
+                self.__id_indexes.setdefault(album_id, []).append(index)
+        return self.__id_indexes
+
+    def __get_position(self, album, track):
+        """
+            Get track position in album
+            @param album as Album
+            @param track as Track
+            @return int: tracks count if track not in album
+        """
+        tracks = album.tracks
+        (cached, count, positions) = self.__positions.get(id(album),
+                                                          (None, 0, {}))
+        # Album tracks changed
+        if cached is not tracks or count != len(tracks):
+            positions = {}
+            for (position, album_track) in enumerate(tracks):
+                positions.setdefault(album_track.id, position)
+            self.__positions[id(album)] = (tracks, len(tracks), positions)
+        return positions.get(track.id, len(tracks))
@@ -10,7 +10,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from locale import getlocale, strcoll
+from locale import getlocale, strcoll, strxfrm
 from importlib import import_module
 
 # Ugly magic to dynamically adapt to the current locale...
@@ -34,6 +34,22 @@ except:
             return ""
 
 
+def sort_key(string):
+    """
+        Get a key sorting like LocalizedCollation with binary comparison
+        @param string as str
+        @return str
+    """
+    if not string:
+        return ""
+    try:
+        # NUL separator: a shorter index sorts first
+        return "%s\0%s" % (strxfrm(index_of(string).upper()),
+                           strxfrm(string))
+    except Exception:
+        return string
+
+
 class LocalizedCollation(object):
     """
         COLLATE LOCALIZED missing from default sqlite installation
@@ -49,13 +49,11 @@ class CurrentAlbumsMenu(Gio.Menu):
             @param GLib.Variant
         """
         def albums_to_playlist():
-            tracks = []
-            for album in App().player.albums:
-                tracks += album.tracks
-            if tracks:
+            uris = App().player.playback.get_track_uris()
+            if uris:
                 import datetime
                 now = datetime.datetime.now()
                 date_string = now.strftime("%Y-%m-%d-%H:%M:%S")
                 playlist_id = App().playlists.add(date_string)
-                App().playlists.add_tracks(playlist_id, tracks)
+                App().playlists.add_uris(playlist_id, uris)
         App().task_helper.run(albums_to_playlist)
@@ -449,8 +449,7 @@ class GenrePlaybackMenu(PlaybackMenu):
             @param GLib.Variant
         """
         album_ids = self.__get_album_ids()
-        albums = [Album(album_id) for album_id in album_ids]
-        App().player.play_albums(albums)
+        App().player.play_album_ids(album_ids)
 
 
 class DecadePlaybackMenu(PlaybackMenu):
@@ -530,8 +529,7 @@ class DecadePlaybackMenu(PlaybackMenu):
             @param GLib.Variant
         """
         album_ids = self.__get_album_ids()
-        albums = [Album(album_id) for album_id in album_ids]
-        App().player.play_albums(albums)
+        App().player.play_album_ids(album_ids)
 
 
 class AlbumPlaybackMenu(PlaybackMenu):
@@ -657,10 +655,9 @@ class TrackPlaybackMenu(PlaybackMenu):
             True if current object in player
             return bool
         """
-        for album in App().player.albums:
-            if self.__track.album.id == album.id:
-                if self.__track.id in album.track_ids:
-                    return True
+        for album in App().player.get_albums_for_id(self.__track.album.id):
+            if self.__track.id in album.track_ids:
+                return True
         return False
 
 #######################
@@ -686,13 +683,12 @@ class TrackPlaybackMenu(PlaybackMenu):
             @param Gio.SimpleAction
             @param GLib.Variant
         """
-        for album in App().player.albums:
-            if album.id == self.__track.album.id:
-                if self.__track.id in album.track_ids:
-                    index = album.track_ids.index(self.__track.id)
-                    track = album.tracks[index]
-                    App().player.remove_track_from_album(track, album)
-                    break
+        for album in App().player.get_albums_for_id(self.__track.album.id):
+            if self.__track.id in album.track_ids:
+                index = album.track_ids.index(self.__track.id)
+                track = album.tracks[index]
+                App().player.remove_track_from_album(track, album)
+                break
 
 #######################
 # PRIVATE             #
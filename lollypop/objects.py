@@ -23,6 +23,7 @@ class Base:
 
     def __init__(self, db):
         self.db = db
+        self._row_attributes = set()
 
     def __dir__(self, *args, **kwargs):
         """
@@ -39,7 +40,10 @@ class Base:
             # Actual value of "attr_name" is stored in "_attr_name"
             attr_name = "_" + attr
             attr_value = getattr(self, attr_name)
-            if attr_value is None:
+            # Attributes loaded from a row are valid even if None
+            # (unset for objects restored from an older pickle)
+            if attr_value is None and\
+                    attr not in (self._row_attributes or []):
                 attr_value = getattr(self.db, "get_" + attr)(self.id)
                 setattr(self, attr_name, attr_value)
             # Return default value if None
@@ -48,6 +52,15 @@ class Base:
             else:
                 return attr_value
 
+    def set_row(self, row):
+        """
+            Set attributes from a database row, no more lazy DB calls for them
+            @param row as tuple, see get_rows()
+        """
+        for (attr, value) in zip(self.db.ROW_ATTRIBUTES, row[1:]):
+            setattr(self, "_" + attr, value)
+        self._row_attributes = set(self.db.ROW_ATTRIBUTES)
+
     def reset(self, attr):
         """
             Reset attr
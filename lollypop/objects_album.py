@@ -11,8 +11,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from hashlib import md5
-
 from lollypop.define import App, StorageType, ScanUpdate, Type
 from lollypop.objects_track import Track
 from lollypop.objects import Base
@@ -94,14 +92,14 @@ class Disc:
             @return [Track]
         """
         if not self.__tracks and self.album.id is not None:
-            self.__tracks = [Track(track_id, self.album)
-                             for track_id in self.db.get_disc_track_ids(
-                                    self.album.id,
-                                    self.album.genre_ids,
-                                    self.album.artist_ids,
-                                    self.number,
-                                    self.__storage_type,
-                                    self.__skipped)]
+            track_ids = self.db.get_disc_track_ids(self.album.id,
+                                                   self.album.genre_ids,
+                                                   self.album.artist_ids,
+                                                   self.number,
+                                                   self.__storage_type,
+                                                   self.__skipped)
+            self.__tracks = [Track(row[0], self.album, row)
+                             for row in App().tracks.get_rows(track_ids)]
         return self.__tracks
 
 
@@ -124,13 +122,14 @@ class Album(Base):
                 "lp_album_id": None}
 
     def __init__(self, album_id=None, genre_ids=[], artist_ids=[],
-                 skipped=True):
+                 skipped=True, row=None):
         """
             Init album
             @param album_id as int
             @param genre_ids as [int]
             @param artist_ids as [int]
             @param skipped as bool
+            @param row as tuple, see AlbumsDatabase.get_rows()
         """
         Base.__init__(self, App().albums)
         self.id = album_id
@@ -140,13 +139,26 @@ class Album(Base):
         self.__name = None
         self.__skipped = skipped
         self.__disc_number = None
+        self.__duration = None
         self.__original_year = Type.NONE
-        self.__tracks_storage_type = self.storage_type
+        # Album artists are loaded lazily: only passed ones filter tracks
+        self.__filtered = bool(artist_ids)
+        if row is not None:
+            self.set_row(row)
+        # Album storage type if None, loaded when tracks are needed
+        self.__tracks_storage_type = None
         # Use artist ids from db else
         if artist_ids:
+            # Artist names already loaded from row
+            names = {}
+            if row is not None:
+                names = dict(zip(self.artist_ids, self.artists))
             artists = []
             for artist_id in set(artist_ids) | set(self.artist_ids):
-                artists.append(App().artists.get_name(artist_id))
+                if artist_id in names.keys():
+                    artists.append(names[artist_id])
+                else:
+                    artists.append(App().artists.get_name(artist_id))
             self.artists = artists
             self.artist_ids = artist_ids
 
@@ -164,6 +176,61 @@ class Album(Base):
     def __setstate__(self, d):
         self.__dict__.update(d)
         self.db = App().albums
+        # Durations are not cached by older versions
+        self.__duration = None
+        # Keep previous behaviour for older versions
+        if "_Album__filtered" not in d.keys():
+            self.__filtered = True
+
+    @staticmethod
+    def prefetch(albums):
+        """
+            Load albums attributes with one query instead of one per attribute
+            @param albums as [Album]
+        """
+        album_ids = list(set([album.id for album in albums
+                              if album.id is not None and album.id >= 0]))
+        rows = {}
+        for row in App().albums.get_rows(album_ids):
+            rows[row[0]] = row
+        for album in albums:
+            if album.id in rows.keys():
+                album.set_row(rows[album.id])
+
+    @staticmethod
+    def prefetch_durations(albums):
+        """
+            Load albums durations with one query per filter instead of one
+            query per album
+            @param albums as [Album]
+        """
+        groups = {}
+        for album in albums:
+            if album.id is None or album.id < 0 or album.__tracks or\
+                    album.__duration is not None:
+                continue
+            # Stored durations are used for unfiltered albums
+            artist_ids = album.artist_ids if album.__filtered else []
+            key = (tuple(album.genre_ids), tuple(artist_ids),
+                   album.__disc_number)
+            if key not in groups.keys():
+                groups[key] = []
+            groups[key].append(album)
+        for ((genre_ids, artist_ids, disc_number), group) in groups.items():
+            durations = App().albums.get_durations(
+                list(dict.fromkeys([album.id for album in group])),
+                list(genre_ids), list(artist_ids), disc_number)
+            for album in group:
+                album.__duration = durations.get(album.id, 0)
+
+    def set_row(self, row):
+        """
+            Set attributes from a database row
+            @param row as tuple, see AlbumsDatabase.get_rows()
+        """
+        Base.set_row(self, row)
+        if self.__disc_number is None:
+            self.__name = row[1]
 
     def set_discs(self, discs):
         """
@@ -178,6 +245,7 @@ class Album(Base):
             @param disc_number as int
         """
         self.__original_year = Type.NONE
+        self.__duration = None
         self.__disc_number = disc_number
 
     def set_tracks(self, tracks, clone=True):
@@ -196,6 +264,7 @@ class Album(Base):
         # Detach those tracks
         elif self.__tracks:
             new_album = Album(self.id, self.genre_ids, self.artist_ids)
+            new_album.__filtered = self.__filtered
             new__tracks = []
             for track in self.__tracks:
                 if track not in tracks:
@@ -248,6 +317,7 @@ class Album(Base):
         """
         self.__tracks = []
         self.__discs = []
+        self.__duration = None
         self.reset("artists")
         self.reset("artist_ids")
         self.reset("lp_album_id")
@@ -350,6 +420,7 @@ class Album(Base):
             @return album
         """
         album = Album(self.id, self.genre_ids, self.artist_ids, skipped)
+        album.__filtered = self.__filtered
         if skipped:
             album.set_tracks(self.tracks)
         return album
@@ -374,7 +445,8 @@ class Album(Base):
         """
         self.__original_year = None
         tracks = self.tracks
-        disc = Disc(self, 0, self.__tracks_storage_type, self.__skipped)
+        disc = Disc(self, 0, self.__get_tracks_storage_type(),
+                    self.__skipped)
         disc.set_tracks(tracks)
         self.__discs = [disc]
 
@@ -389,6 +461,14 @@ class Album(Base):
                 self.id, self.__disc_number)
         return self.__original_year
 
+    @property
+    def skipped(self):
+        """
+            True if album tracks include skipped tracks
+            @return bool
+        """
+        return self.__skipped
+
     @property
     def collection_item(self):
         """
@@ -491,7 +571,7 @@ class Album(Base):
             disc_numbers = [self.__disc_number]
         for disc_number in disc_numbers:
             disc = Disc(self, disc_number,
-                        self.__tracks_storage_type,
+                        self.__get_tracks_storage_type(),
                         self.__skipped)
             if disc.tracks:
                 discs.append(disc)
@@ -503,37 +583,27 @@ class Album(Base):
     @property
     def duration(self):
         """
-            Get album duration and handle caching
+            Get album duration
             @return int
         """
         if self.__tracks:
-            track_ids = [track.lp_track_id for track in self.tracks]
-            track_str = "%s" % sorted(track_ids)
-            track_hash = md5(track_str.encode("utf-8")).hexdigest()
-            album_hash = "%s-%s-%s" % (
-                self.lp_album_id, track_hash, self.__disc_number)
-        else:
-            album_hash = "%s-%s-%s-%s" % (self.lp_album_id,
-                                          self.genre_ids,
-                                          self.artist_ids,
-                                          self.__disc_number)
-        duration = App().cache.get_duration(album_hash)
-        if duration is None:
-            if self.__tracks:
-                duration = 0
-                for track in self.__tracks:
-                    duration += track.duration
-            else:
-                duration = self.db.get_duration(self.id,
-                                                self.genre_ids,
-                                                self.artist_ids,
-                                                self.__disc_number)
-            App().cache.set_duration(self.id, album_hash, duration)
-        return duration
+            return sum([track.duration for track in self.__tracks])
+        if self.__duration is None:
+            Album.prefetch_durations([self])
+        return self.__duration or 0
 
 #######################
 # PRIVATE             #
 #######################
+    def __get_tracks_storage_type(self):
+        """
+            Get storage type for tracks, album one if not set
+            @return StorageType
+        """
+        if self.__tracks_storage_type is None:
+            self.__tracks_storage_type = self.storage_type
+        return self.__tracks_storage_type
+
     def __save(self, save):
         """
             Save album to collection.
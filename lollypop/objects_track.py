@@ -44,16 +44,19 @@ class Track(Base):
                 "lp_track_id": None,
                 "mb_artist_ids": []}
 
-    def __init__(self, track_id=None, album=None):
+    def __init__(self, track_id=None, album=None, row=None):
         """
             Init track
             @param track_id as int
             @param album as Album
+            @param row as tuple, see TracksDatabase.get_rows()
         """
         Base.__init__(self, App().tracks)
         self.id = track_id
         self._uri = None
         self.__uri_loaded = False
+        if row is not None:
+            self.set_row(row)
 
         if album is None:
             from lollypop.objects_album import Album
@@ -77,6 +80,21 @@ class Track(Base):
         self.__dict__.update(d)
         self.db = App().tracks
 
+    @staticmethod
+    def prefetch(tracks):
+        """
+            Load tracks attributes with one query instead of one per attribute
+            @param tracks as [Track]
+        """
+        track_ids = list(set([track.id for track in tracks
+                              if track.id is not None and track.id >= 0]))
+        rows = {}
+        for row in App().tracks.get_rows(track_ids):
+            rows[row[0]] = row
+        for track in tracks:
+            if track.id in rows.keys():
+                track.set_row(rows[track.id])
+
     def set_album(self, album):
         """
             Set track album
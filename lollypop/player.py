@@ -12,10 +12,13 @@
 
 from gi.repository import GLib, GObject
 
-from pickle import load
 from time import time
+from pickle import load
+import json
+import os
 
 from lollypop.player_albums import AlbumsPlayer
+from lollypop.list import PlaybackList
 from lollypop.player_auto_random import AutoRandomPlayer
 from lollypop.player_auto_similar import AutoSimilarPlayer
 from lollypop.player_bin import BinPlayer
@@ -25,7 +28,8 @@ from lollypop.player_shuffle import ShufflePlayer
 from lollypop.player_transitions import TransitionsPlayer
 from lollypop.logger import Logger
 from lollypop.objects_track import Track
-from lollypop.define import App, Type, LOLLYPOP_DATA_PATH
+from lollypop.objects_album import Album
+from lollypop.define import App, Type, StorageType, LOLLYPOP_DATA_PATH
 from lollypop.utils import emit_signal
 
 
@@ -58,6 +62,12 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
         "rate-changed": (GObject.SignalFlags.RUN_FIRST, None, (int, int))
     }
 
+    __STATE_VERSION = 1
+    __STATE_PATH = LOLLYPOP_DATA_PATH + "/player.json"
+    # Pickled state from previous versions
+    __LEGACY_STATE = ["Albums.bin", "track_id.bin", "player.bin",
+                      "queue.bin", "position.bin"]
+
     def __init__(self):
         """
             Init player
@@ -128,43 +138,75 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
             artists = ", ".join(self._current_track.album_artists)
         return artists
 
+    def save_state(self):
+        """
+            Save player state: ids, position and album filters only
+            File is replaced atomically
+        """
+        track = self._current_track
+        albums = []
+        if track.id is None or track.storage_type & StorageType.EPHEMERAL:
+            track_id = None
+        else:
+            track_id = track.id
+            for item in self._albums.get_state():
+                if item[0] is None or item[0] < 0:
+                    continue
+                albums.append(item)
+        state = {"version": self.__STATE_VERSION,
+                 "track_id": track_id,
+                 "position": self.position if track.id is not None else 0,
+                 "playing": self.is_playing,
+                 "party": self.is_party,
+                 "queue": self.queue,
+                 "albums": albums}
+        self.__write_state(state)
+
     def restore_state(self):
         """
-            Restore player state
+            Restore player state, tracks are loaded from DB on demand
         """
         try:
-            if App().settings.get_value("save-state"):
-                self._current_track = Track(
-                    load(open(LOLLYPOP_DATA_PATH + "/track_id.bin", "rb")))
-                self.set_queue(load(open(LOLLYPOP_DATA_PATH +
-                                         "/queue.bin", "rb")))
-                albums = load(open(LOLLYPOP_DATA_PATH + "/Albums.bin", "rb"))
-                (is_playing, was_party) = load(open(LOLLYPOP_DATA_PATH +
-                                                    "/player.bin", "rb"))
-                if self._current_track.uri:
-                    if albums:
-                        if was_party:
-                            # Tips: prevents player from loading albums
-                            self._is_party = True
-                            App().lookup_action("party").change_state(
-                                GLib.Variant("b", True))
-                        self.set_albums(albums)
-                        # Load track from player albums
-                        index = self.album_ids.index(
-                            self._current_track.album.id)
-                        for track in self._albums[index].tracks:
-                            if track.id == self._current_track.id:
-                                self._load_track(track)
-                                break
-                    if is_playing:
-                        self.play()
-                    else:
-                        self.pause()
-                    position = load(open(LOLLYPOP_DATA_PATH + "/position.bin",
-                                    "rb"))
-                    self.seek(position)
-                else:
-                    Logger.debug("Player::restore_state(): track missing")
+            if not App().settings.get_value("save-state"):
+                return
+            if os.path.exists(self.__STATE_PATH):
+                with open(self.__STATE_PATH, "r") as f:
+                    state = json.load(f)
+            else:
+                state = self.__import_legacy_state()
+                if state is None:
+                    return
+            if state.get("version") != self.__STATE_VERSION:
+                Logger.info("Player::restore_state(): unknown version %s",
+                            state.get("version"))
+                return
+            self._current_track = Track(state["track_id"])
+            self.set_queue(state["queue"])
+            if not self._current_track.uri:
+                Logger.debug("Player::restore_state(): track missing")
+                return
+            playback = self.__get_state_playback(state["albums"])
+            if playback:
+                if state["party"]:
+                    # Tips: prevents player from loading albums
+                    self._is_party = True
+                    App().lookup_action("party").change_state(
+                        GLib.Variant("b", True))
+                self._albums = playback
+                emit_signal(self, "playback-setted", playback)
+                self.update_next_prev()
+                # Load track from player albums
+                album_id = self._current_track.album_id
+                for album in playback.get_albums(album_id):
+                    track = album.get_track(self._current_track.id)
+                    if track.id is not None:
+                        self._load_track(track)
+                        break
+            if state["playing"]:
+                self.play()
+            else:
+                self.pause()
+            self.seek(state["position"])
         except Exception as e:
             Logger.error("Player::restore_state(): %s" % e)
 
@@ -298,6 +340,101 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
 #######################
 # PRIVATE             #
 #######################
+    def __get_state_playback(self, items):
+        """
+            Get playback from saved state, one query for albums with
+            tracks, albums without tracks are only created when needed
+            Removed albums with tracks are ignored
+            @param items as [[int, [int], [int], bool, [int]/None]]
+            @return PlaybackList
+        """
+        rows = {}
+        album_ids = [item[0] for item in items if item[4] is not None]
+        for row in App().albums.get_rows(album_ids):
+            rows[row[0]] = row
+        playback = PlaybackList()
+        for (album_id, genre_ids, artist_ids, skipped, track_ids) in items:
+            if track_ids is None:
+                playback.add_album_ids([album_id], genre_ids,
+                                       artist_ids, skipped)
+                continue
+            if album_id not in rows.keys():
+                continue
+            album = Album(album_id, genre_ids, artist_ids, skipped,
+                          rows[album_id])
+            album.set_tracks([Track(track_id, album)
+                              for track_id in track_ids], False)
+            playback.append(album)
+        return playback
+
+    def __write_state(self, state):
+        """
+            Write state, file is replaced atomically
+            @param state as {}
+            @return bool
+        """
+        try:
+            tmp_path = self.__STATE_PATH + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp_path, self.__STATE_PATH)
+            return True
+        except Exception as e:
+            Logger.error("Player::__write_state(): %s", e)
+            return False
+
+    def __import_legacy_state(self):
+        """
+            Import state pickled by previous versions, pickled files are
+            removed once state is written
+            @return {}/None
+        """
+        path = "%s/track_id.bin" % LOLLYPOP_DATA_PATH
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                track_id = load(f)
+            with open(LOLLYPOP_DATA_PATH + "/queue.bin", "rb") as f:
+                queue = load(f)
+            with open(LOLLYPOP_DATA_PATH + "/player.bin", "rb") as f:
+                (is_playing, was_party) = load(f)
+            with open(LOLLYPOP_DATA_PATH + "/position.bin", "rb") as f:
+                position = load(f)
+            albums = []
+            # Not saved by previous versions without a current track
+            path = "%s/Albums.bin" % LOLLYPOP_DATA_PATH
+            if track_id is not None and os.path.exists(path):
+                with open(path, "rb") as f:
+                    for item in PlaybackList(load(f)).get_state():
+                        if item[0] is not None and item[0] >= 0:
+                            albums.append(item)
+            state = {"version": self.__STATE_VERSION,
+                     "track_id": track_id,
+                     "position": position,
+                     "playing": is_playing,
+                     "party": was_party,
+                     "queue": queue,
+                     "albums": albums}
+        except Exception as e:
+            Logger.error("Player::__import_legacy_state(): %s", e)
+            return None
+        if self.__write_state(state):
+            self.__remove_legacy_state()
+        return state
+
+    def __remove_legacy_state(self):
+        """
+            Remove state pickled by previous versions
+        """
+        for name in self.__LEGACY_STATE:
+            path = "%s/%s" % (LOLLYPOP_DATA_PATH, name)
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except Exception as e:
+                Logger.error("Player::__remove_legacy_state(): %s", e)
+
     def __scrobble(self, track, finished_start_time):
         """
             Scrobble on lastfm
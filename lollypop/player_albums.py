@@ -12,11 +12,11 @@
 
 from gi.repository import GLib
 
-from random import choice
+from random import choice, randrange
 from gettext import gettext as _
 
 from lollypop.logger import Logger
-from lollypop.objects_album import Album
+from lollypop.list import PlaybackList
 from lollypop.player_auto_similar import AutoSimilarPlayer
 from lollypop.player_auto_random import AutoRandomPlayer
 from lollypop.define import App, Repeat
@@ -33,7 +33,7 @@ class AlbumsPlayer:
             Init player
         """
         # Albums in current playlist
-        self._albums = []
+        self._albums = PlaybackList()
 
     def add_album(self, album):
         """
@@ -42,12 +42,22 @@ class AlbumsPlayer:
         """
         self.add_albums([album])
 
-    def add_album_ids(self, album_ids):
+    def add_album_ids(self, album_ids, genre_ids=[], artist_ids=[],
+                      skipped=True):
         """
-            Add album ids to player
+            Add album ids to player, albums are created in one query
             @param album_ids as [int]
+            @param genre_ids as [int]
+            @param artist_ids as [int]
+            @param skipped as bool
         """
-        self.add_albums([Album(album_id) for album_id in album_ids])
+        if not album_ids:
+            App().notify.send(_("No album available"))
+            return
+        playback = PlaybackList()
+        playback.add_album_ids(album_ids, genre_ids, artist_ids, skipped)
+        # Views need albums
+        self.add_albums(playback[:])
 
     def add_albums(self, albums):
         """
@@ -104,10 +114,9 @@ class AlbumsPlayer:
         """
         try:
             for album_id in album_ids:
-                for album in self._albums:
-                    if album.id == album_id:
-                        self.remove_album(album)
-                        emit_signal(self, "playback-removed", album)
+                for album in self._albums.get_albums(album_id):
+                    self.remove_album(album)
+                    emit_signal(self, "playback-removed", album)
             self.update_next_prev()
         except Exception as e:
             Logger.error("Player::remove_album_by_ids(): %s" % e)
@@ -150,6 +159,28 @@ class AlbumsPlayer:
             album = albums[0]
         self.play_album_for_albums(album, albums)
 
+    def play_album_ids(self, album_ids, genre_ids=[], artist_ids=[],
+                       skipped=True):
+        """
+            Play albums by id, albums are only created when needed
+            @param album_ids as [int]
+            @param genre_ids as [int]
+            @param artist_ids as [int]
+            @param skipped as bool
+        """
+        if not album_ids:
+            App().notify.send(_("No album available"))
+            return
+        if self.is_party:
+            App().lookup_action("party").change_state(GLib.Variant("b", False))
+        playback = PlaybackList()
+        playback.add_album_ids(album_ids, genre_ids, artist_ids, skipped)
+        if App().settings.get_value("shuffle"):
+            album = playback[randrange(len(playback))]
+            self.__play_shuffle_tracks(album, playback)
+        else:
+            self.__play_albums(playback[0], playback)
+
     def play_track_for_albums(self, track, albums):
         """
             Play track and set albums as current playlist
@@ -158,9 +189,9 @@ class AlbumsPlayer:
         """
         if self.is_party:
             App().lookup_action("party").change_state(GLib.Variant("b", False))
-        self._albums = albums
+        self._albums = PlaybackList(albums)
         self.load(track)
-        emit_signal(self, "playback-setted", list(albums))
+        emit_signal(self, "playback-setted", self._albums)
 
     def play_album_for_albums(self, album, albums):
         """
@@ -174,9 +205,9 @@ class AlbumsPlayer:
         if self.is_party:
             App().lookup_action("party").change_state(GLib.Variant("b", False))
         if App().settings.get_value("shuffle"):
-            self.__play_shuffle_tracks(album, albums)
+            self.__play_shuffle_tracks(album, PlaybackList(albums))
         else:
-            self.__play_albums(album, albums)
+            self.__play_albums(album, PlaybackList(albums))
 
     def set_albums(self, albums, signal=True):
         """
@@ -187,17 +218,17 @@ class AlbumsPlayer:
         if not albums:
             App().notify.send(_("No album available"))
             return
-        self._albums = albums
+        self._albums = PlaybackList(albums)
         if signal:
-            emit_signal(self, "playback-setted", list(albums))
+            emit_signal(self, "playback-setted", self._albums)
         self.update_next_prev()
 
     def clear_albums(self):
         """
             Clear all albums
         """
-        self._albums = []
-        emit_signal(self, "playback-setted", [])
+        self._albums = PlaybackList()
+        emit_signal(self, "playback-setted", self._albums)
         self.update_next_prev()
 
     def skip_album(self):
@@ -240,11 +271,10 @@ class AlbumsPlayer:
             @param track as Track
             @return Track/None
         """
-        for album in self._albums:
-            if album.id == track.album.id:
-                for _track in album.tracks:
-                    if track.id == _track.id:
-                        return _track
+        for album in self._albums.get_albums(track.album.id):
+            for _track in album.tracks:
+                if track.id == _track.id:
+                    return _track
         return None
 
     def get_albums_for_id(self, album_id):
@@ -253,12 +283,20 @@ class AlbumsPlayer:
             @param album_id as int
             @return [Album]
         """
-        return [album for album in self._albums if album.id == album_id]
+        return self._albums.get_albums(album_id)
+
+    @property
+    def playback(self):
+        """
+            Return playback, albums are created when accessed
+            @return PlaybackList
+        """
+        return self._albums
 
     @property
     def albums(self):
         """
-            Return albums
+            Return albums, all albums get created
             @return albums as [Album]
         """
         return list(self._albums)
@@ -269,44 +307,44 @@ class AlbumsPlayer:
             Return albums ids
             @return albums ids as [int]
         """
-        return [album.id for album in self._albums]
+        return self._albums.album_ids
 
 #######################
 # PRIVATE             #
 #######################
-    def __play_shuffle_tracks(self, album, albums):
+    def __play_shuffle_tracks(self, album, playback):
         """
             Start shuffle tracks playback.
             @param album as Album
-            @param albums as [albums]
+            @param playback as PlaybackList
         """
         if album is None:
-            album = choice(albums)
+            album = playback[randrange(len(playback))]
         if album.tracks:
             track = choice(album.tracks)
         else:
             track = None
-        self._albums = albums
-        emit_signal(self, "playback-setted", list(albums))
+        self._albums = playback
+        emit_signal(self, "playback-setted", playback)
         if track is not None:
             self.load(track)
         else:
             self.update_next_prev()
 
-    def __play_albums(self, album, albums):
+    def __play_albums(self, album, playback):
         """
             Start albums playback.
             @param album as Album
-            @param albums as [albums]
+            @param playback as PlaybackList
         """
         if album is None:
-            album = albums[0]
+            album = playback[0]
         if album.tracks:
             track = album.tracks[0]
         else:
             track = None
-        self._albums = albums
-        emit_signal(self, "playback-setted", list(albums))
+        self._albums = playback
+        emit_signal(self, "playback-setted", playback)
         if track is not None:
             self.load(track)
         else:
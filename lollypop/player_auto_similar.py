@@ -278,7 +278,7 @@ class AutoSimilarPlayer:
         """
         track = Track(track_id)
         album = track.album
-        if self.albums:
+        if self._albums:
             self.add_album(album)
         else:
             self.play_album(album)
@@ -390,6 +390,7 @@ class BinPlayer:
             duration = discoverer.get_info(track.uri).get_duration() / 1000000
             if duration != track.duration and duration > 0:
                 App().tracks.set_duration(track.id, int(duration))
+                App().albums.update_durations([track.album.id])
                 track.reset("duration")
                 emit_signal(self, "duration-changed", track.id)
         except Exception as e:
@@ -10,12 +10,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from random import shuffle, random
-
 from lollypop.define import Repeat, App
 from lollypop.objects_track import Track
-from lollypop.objects_album import Album
-from lollypop.list import LinkedList
+from lollypop.list import LinkedList, ShuffleList, PlaybackList
 from lollypop.utils import emit_signal, get_default_storage_type
 from lollypop.logger import Logger
 
@@ -30,19 +27,20 @@ class ShufflePlayer:
         """
             Init shuffle player
         """
-        # Albums to play, different from _albums for a better shuffle
-        self.__to_play_albums = []
-        # Albums who never have been played
-        self.__not_played_albums = []
+        # Album ids to play, drawn once by round
+        self.__to_play_albums = ShuffleList()
+        # Track ids not played by album ids, loaded when album is drawn
+        self.__not_played_tracks = {}
         # Tracks already played
         self.__history = []
-        # Tracks already played by albums
-        self.__already_played_tracks = {}
+        # Track ids already played
+        self.__already_played_tracks = set()
         # Party mode
         self._is_party = False
         App().settings.connect("changed::shuffle", self.__set_shuffle)
         self.connect("playback-added", self.__on_playback_added)
         self.connect("playback-setted", self.__on_playback_setted)
+        self.connect("playback-updated", self.__on_playback_updated)
         self.connect("playback-removed", self.__on_playback_removed)
 
     def next(self):
@@ -95,7 +93,7 @@ class ShufflePlayer:
             App().task_helper.run(self.set_party_ids, callback=(start_party,))
         else:
             # We want current album to continue playback
-            self._albums = [self._current_track.album]
+            self._albums = PlaybackList([self._current_track.album])
             emit_signal(self, "playback-setted", [])
             emit_signal(self, "playback-added",
                         self._current_track.album)
@@ -113,13 +111,13 @@ class ShufflePlayer:
         storage_type = get_default_storage_type()
         album_ids = App().albums.get_ids(party_ids, [], storage_type, False)
         emit_signal(self, "playback-setted", [])
-        self._albums = []
         if album_ids:
             emit_signal(self, "loading-changed", True, Track())
-        for album_id in album_ids:
-            album = Album(album_id, [], [], False)
-            self._albums.append(album)
-        emit_signal(self, "playback-setted", list(self._albums))
+        # Albums are only created when drawn
+        playback = PlaybackList()
+        playback.add_album_ids(album_ids, [], [], False)
+        self._albums = playback
+        emit_signal(self, "playback-setted", playback)
 
     @property
     def is_party(self):
@@ -193,7 +191,7 @@ class ShufflePlayer:
             @param settings as Gio.Settings
             @param value as GLib.Variant
         """
-        self.__on_playback_setted(self, self.albums)
+        self.__on_playback_setted(self, self._albums)
         if self._current_track.id is not None:
             self.set_next()
 
@@ -209,15 +207,16 @@ class ShufflePlayer:
                     # All tracks done
                     # Try to get another one track after reseting history
                     if track.id is None:
-                        self.__to_play_albums = list(self._albums)
-                        shuffle(self.__to_play_albums)
+                        self.__to_play_albums = ShuffleList(
+                            self._albums.album_ids)
                         repeat = App().settings.get_enum("repeat")
                         # Do not reset history if a new album is going to
                         # be added
                         if repeat not in [Repeat.AUTO_SIMILAR,
                                           Repeat.AUTO_RANDOM]:
                             self.__history = []
-                            self.__already_played_tracks = {}
+                            self.__already_played_tracks = set()
+                            self.__not_played_tracks = {}
                         if repeat == Repeat.ALL:
                             return self.__get_next()
                     return track
@@ -230,41 +229,53 @@ class ShufflePlayer:
             Return a random track and make sure it has never been played
             @return Track
         """
-        # True if all albums have been played on time
-        if not self.__not_played_albums:
-            self.__not_played_albums = list(self.__to_play_albums)
-        while self.__not_played_albums:
-            album = self.__not_played_albums.pop(0)
-            if not album.tracks:
+        while self.__to_play_albums:
+            album_id = self.__to_play_albums.next()
+            # All albums have been played one time
+            if album_id is None:
+                self.__to_play_albums.reset()
                 continue
-            for track in sorted(album.tracks,
-                                key=lambda *args: random()):
-                if not self.__in_shuffle_history(track):
-                    return track
-            self.__to_play_albums.remove(album)
-        if self.__to_play_albums:
-            return self.__get_tracks_random()
-        else:
-            return Track()
+            track = self.__get_album_track_random(album_id)
+            if track is not None:
+                return track
+            self.__to_play_albums.remove(album_id)
+        return Track()
 
-    def __in_shuffle_history(self, track):
-        """
-            True if track in shuffle history
-            @param track as Track
-            @return bool
-        """
-        return track.album.id in self.__already_played_tracks.keys() and\
-            track.id in self.__already_played_tracks[track.album.id]
+    def __get_album_track_random(self, album_id):
+        """
+            Return a random track never played for album
+            Albums and album tracks are only loaded here
+            @param album_id as int
+            @return Track/None
+        """
+        albums = self._albums.get_albums(album_id)
+        track_ids = self.__not_played_tracks.get(album_id, None)
+        if track_ids is None:
+            track_ids = ShuffleList()
+            for album in albums:
+                for track_id in album.track_ids:
+                    if track_id not in self.__already_played_tracks:
+                        track_ids.add(track_id)
+            self.__not_played_tracks[album_id] = track_ids
+        track_id = track_ids.choice()
+        if track_id is None:
+            return None
+        for album in albums:
+            track = album.get_track(track_id)
+            if track.id is not None:
+                return track
+        track_ids.remove(track_id)
+        return self.__get_album_track_random(album_id)
 
     def __add_to_shuffle_history(self, track):
         """
             Add a track to shuffle history
             @param track as Track
         """
-        if track.album.id not in self.__already_played_tracks.keys():
-            self.__already_played_tracks[track.album.id] = []
-        if track not in self.__already_played_tracks[track.album.id]:
-            self.__already_played_tracks[track.album.id].append(track.id)
+        self.__already_played_tracks.add(track.id)
+        track_ids = self.__not_played_tracks.get(track.album.id, None)
+        if track_ids is not None:
+            track_ids.remove(track.id)
 
     def __on_playback_added(self, player, album):
         """
@@ -273,14 +284,11 @@ class ShufflePlayer:
             @param album as Album
         """
         if App().settings.get_value("shuffle") or self._is_party:
-            if album not in self.__to_play_albums:
-                self.__to_play_albums.append(album)
-                shuffle(self.__to_play_albums)
-            if album not in self.__not_played_albums:
-                self.__not_played_albums.append(album)
+            self.__to_play_albums.add(album.id)
+            self.__not_played_tracks.pop(album.id, None)
             # If album already playing or
             # if current track was last one
-            if App().player.current_track.album == album or\
+            if App().player.current_track.album.id == album.id or\
                     not self.__already_played_tracks:
                 self.__add_to_shuffle_history(App().player.current_track)
 
@@ -288,17 +296,24 @@ class ShufflePlayer:
         """
             Update shuffle for album
             @param player as Player
-            @param albums as [Album]
+            @param albums as PlaybackList
         """
         if App().settings.get_value("shuffle") or self._is_party:
-            self.__to_play_albums = albums
-            if albums:
-                shuffle(self.__to_play_albums)
-            self.__not_played_albums = []
-            self.__already_played_tracks = {}
-            if App().player.current_track.album in albums:
+            self.__to_play_albums = ShuffleList(self._albums.album_ids)
+            self.__not_played_tracks = {}
+            self.__already_played_tracks = set()
+            album_id = App().player.current_track.album.id
+            if self._albums.has_album_id(album_id):
                 self.__add_to_shuffle_history(App().player.current_track)
 
+    def __on_playback_updated(self, player, album):
+        """
+            Reload album tracks on next draw
+            @param player as Player
+            @param album as Album
+        """
+        self.__not_played_tracks.pop(album.id, None)
+
     def __on_playback_removed(self, player, album):
         """
             Update shuffle for album
@@ -306,7 +321,6 @@ class ShufflePlayer:
             @param album as Album
         """
         if App().settings.get_value("shuffle") or self._is_party:
-            if album in self.__to_play_albums:
-                self.__to_play_albums.remove(album)
-            if album in self.__not_played_albums:
-                self.__not_played_albums.remove(album)
+            if not self._albums.has_album_id(album.id):
+                self.__to_play_albums.remove(album.id)
+            self.__not_played_tracks.pop(album.id, None)
@@ -699,7 +699,8 @@ class Playlists(GObject.GObject):
             Return a new sqlite cursor
         """
         try:
-            sql = sqlite3.connect(self._DB_PATH, 600.0)
+            sql = sqlite3.connect(self._DB_PATH, 600.0,
+                                  check_same_thread=False)
             sql.execute('ATTACH DATABASE "%s" AS music' % Database.DB_PATH)
             sql.create_collation("LOCALIZED", LocalizedCollation())
             return sql
@@ -0,0 +1,115 @@
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import builtins
+import sys
+from threading import current_thread, main_thread
+from time import perf_counter
+
+
+class StartupProfiler:
+    """
+        Startup timings, enabled with --profile-startup
+        - stages: time spent between two stage() calls
+        - imports: time spent importing each module, nested imports excluded
+        Only modules imported from main thread are measured
+    """
+
+    __IMPORTS_COUNT = 25
+
+    __enabled = False
+    __start_time = 0
+    __stage_time = 0
+    __stages = []
+    __imports = {}
+    __import_stack = []
+    __import = None
+
+    @classmethod
+    def enable(cls):
+        """
+            Start profiling, call it before importing application
+        """
+        if cls.__enabled:
+            return
+        cls.__enabled = True
+        cls.__start_time = cls.__stage_time = perf_counter()
+        cls.__import = builtins.__import__
+        builtins.__import__ = cls.__import_module
+
+    @classmethod
+    def stage(cls, name):
+        """
+            Mark end of a startup stage
+            @param name as str
+        """
+        if not cls.__enabled:
+            return
+        now = perf_counter()
+        cls.__stages.append((name, now - cls.__stage_time))
+        cls.__stage_time = now
+
+    @classmethod
+    def report(cls):
+        """
+            Print timings and stop profiling
+        """
+        if not cls.__enabled:
+            return
+        builtins.__import__ = cls.__import
+        cls.__enabled = False
+        print("Startup stages:")
+        for (name, elapsed) in cls.__stages:
+            print("  %-24s %8.1f ms" % (name, elapsed * 1000))
+        print("  %-24s %8.1f ms" % ("total",
+                                    (cls.__stage_time - cls.__start_time) *
+                                    1000))
+        imports = sorted(cls.__imports.items(),
+                         key=lambda item: item[1],
+                         reverse=True)
+        print("Slowest imports (%s modules, %.1f ms):" % (
+            len(imports), sum(cls.__imports.values()) * 1000))
+        for (name, elapsed) in imports[:cls.__IMPORTS_COUNT]:
+            print("  %-40s %8.1f ms" % (name, elapsed * 1000))
+
+    @classmethod
+    def enabled(cls):
+        """
+            True if profiling
+            @return bool
+        """
+        return cls.__enabled
+
+#######################
+# PRIVATE             #
+#######################
+    @classmethod
+    def __import_module(cls, name, *args, **kwargs):
+        """
+            Measure import time for modules not already loaded
+            Same signature as builtins.__import__
+        """
+        level = args[3] if len(args) > 3 else kwargs.get("level", 0)
+        if level != 0 or name in sys.modules or\
+                current_thread() is not main_thread():
+            return cls.__import(name, *args, **kwargs)
+        cls.__import_stack.append(0)
+        start_time = perf_counter()
+        try:
+            return cls.__import(name, *args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start_time
+            nested = cls.__import_stack.pop()
+            cls.__imports[name] = cls.__imports.get(name, 0) +\
+                elapsed - nested
+            if cls.__import_stack:
+                cls.__import_stack[-1] += elapsed
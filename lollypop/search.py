@@ -10,7 +10,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import GObject
+from gi.repository import GObject, GLib, Gio
 
 from lollypop.define import StorageType, App
 from lollypop.utils import emit_signal, get_network_available
@@ -19,23 +19,40 @@ from lollypop.search_local import LocalSearch
 
 class Search(GObject.Object):
     """
-        Local search
+        Search session:
+        - input is debounced with set_search()
+        - a new search cancels previous one
+        - matches are emitted in batches, one signal per kind
     """
     __gsignals__ = {
-        "match-artist": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
-        "match-album": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
-        "match-track": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
+        "match-artists": (GObject.SignalFlags.RUN_FIRST, None,
+                          (GObject.TYPE_PYOBJECT, int)),
+        "match-albums": (GObject.SignalFlags.RUN_FIRST, None,
+                         (GObject.TYPE_PYOBJECT, int)),
+        "match-tracks": (GObject.SignalFlags.RUN_FIRST, None,
+                         (GObject.TYPE_PYOBJECT, int)),
+        "started": (GObject.SignalFlags.RUN_FIRST, None, (str,)),
         "finished": (GObject.SignalFlags.RUN_FIRST, None, (bool,)),
     }
 
+    # Delay before searching while typing, in ms
+    __DELAY = 250
+
     def __init__(self):
         """
             Init search
         """
         GObject.Object.__init__(self)
         self.__search_count = 0
+        self.__timeout_id = None
+        self.__flush_id = None
+        # {(signal, storage_type): [ids]}
+        self.__matches = {}
+        self.__cancellable = Gio.Cancellable()
         self.__local_search = LocalSearch()
-        self.__connect_search_signals(self.__local_search)
+        for signal in ["match-artists", "match-albums", "match-tracks"]:
+            self.__local_search.connect(signal, self.__on_matches, signal)
+        self.__local_search.connect("finished", self.__on_finished)
         self.__web_search = None
 
     def set_web_search(self, name):
@@ -91,45 +108,114 @@ class Search(GObject.Object):
             from lollypop.search_spotify import SpotifySearch
             SpotifySearch().load_tracks(album, cancellable)
 
-    def get(self, search, cancellable):
+    def set_search(self, search):
         """
-            Get match for search
+            Search after a delay, previous call is dropped
+            @param search as str
+        """
+        if self.__timeout_id is not None:
+            GLib.source_remove(self.__timeout_id)
+        self.__timeout_id = GLib.timeout_add(self.__DELAY,
+                                             self.__on_search_timeout,
+                                             search)
+
+    def get(self, search):
+        """
+            Get match for search, cancel current search
             @param search as str
-            @param cancellable as Gio.Cancellable
         """
+        self.cancel()
+        emit_signal(self, "started", search)
         # Only local items
         storage_type = StorageType.COLLECTION |\
             StorageType.SAVED |\
             StorageType.SEARCH
         App().task_helper.run(self.__local_search.get,
-                              search, storage_type, cancellable)
-        self.__search_count += 1
+                              search, storage_type, self.__cancellable)
+        self.__search_count = 1
         if self.__web_search is not None:
             storage_type = StorageType.SEARCH | StorageType.EPHEMERAL
             App().task_helper.run(self.__web_search.get,
-                                  search, storage_type, cancellable)
+                                  search, storage_type, self.__cancellable)
             self.__search_count += 1
 
+    def cancel(self):
+        """
+            Cancel pending and current search
+        """
+        if self.__timeout_id is not None:
+            GLib.source_remove(self.__timeout_id)
+            self.__timeout_id = None
+        if self.__flush_id is not None:
+            GLib.source_remove(self.__flush_id)
+            self.__flush_id = None
+        self.__matches = {}
+        self.__search_count = 0
+        self.__cancellable.cancel()
+        self.__cancellable = Gio.Cancellable()
+
 #######################
 # PRIVATE             #
 #######################
+    def __flush(self):
+        """
+            Emit pending matches
+        """
+        self.__flush_id = None
+        matches = self.__matches
+        self.__matches = {}
+        for ((signal, storage_type), ids) in matches.items():
+            self.emit(signal, ids, storage_type)
+
+    def __on_search_timeout(self, search):
+        """
+            Search if pending
+            @param search as str
+        """
+        self.__timeout_id = None
+        self.get(search)
+
+    def __on_matches(self, search, ids, storage_type, signal):
+        """
+            Queue matches, emitted from an idle callback
+            @param search as Search provider
+            @param ids as [int]
+            @param storage_type as StorageType
+            @param signal as str
+        """
+        key = (signal, storage_type)
+        if key not in self.__matches.keys():
+            self.__matches[key] = []
+        self.__matches[key] += ids
+        if self.__flush_id is None:
+            self.__flush_id = GLib.idle_add(self.__flush)
+
     def __on_finished(self, search):
         """
             Emit finished signals if all search are finished
             @param search as Search provider
         """
+        # Cancelled search
+        if self.__search_count == 0:
+            return
+        if self.__flush_id is not None:
+            GLib.source_remove(self.__flush_id)
+            self.__flush()
         self.__search_count -= 1
         emit_signal(self, "finished", self.__search_count == 0)
 
     def __connect_search_signals(self, search):
         """
-            Connect search signals
+            Connect web search signals
             @param search as Search provider
         """
         search.connect("match-artist",
-                       lambda x, y, z: self.emit("match-artist", y, z))
+                       lambda x, y, z: self.__on_matches(
+                           x, [y], z, "match-artists"))
         search.connect("match-album",
-                       lambda x, y, z: self.emit("match-album", y, z))
+                       lambda x, y, z: self.__on_matches(
+                           x, [y], z, "match-albums"))
         search.connect("match-track",
-                       lambda x, y, z: self.emit("match-track", y, z))
+                       lambda x, y, z: self.__on_matches(
+                           x, [y], z, "match-tracks"))
         search.connect("finished", self.__on_finished)
@@ -15,25 +15,37 @@ from gi.repository import GObject, GLib
 from collections import Counter
 
 from lollypop.define import App
+from lollypop.database_search import SearchDatabase
 from lollypop.utils import noaccents
 
 
 class LocalSearch(GObject.Object):
     """
         Local search
+        Matches are emitted in batches, one signal per kind
+        A search extending previous search refines previous results
     """
     __gsignals__ = {
-        "match-artist": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
-        "match-album": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
-        "match-track": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
+        "match-artists": (GObject.SignalFlags.RUN_FIRST, None,
+                          (GObject.TYPE_PYOBJECT, int)),
+        "match-albums": (GObject.SignalFlags.RUN_FIRST, None,
+                         (GObject.TYPE_PYOBJECT, int)),
+        "match-tracks": (GObject.SignalFlags.RUN_FIRST, None,
+                         (GObject.TYPE_PYOBJECT, int)),
         "finished": (GObject.SignalFlags.RUN_FIRST, None, ()),
     }
 
+    # Max results for each kind when using search index
+    __LIMIT = 100
+
     def __init__(self):
         """
             Init search
         """
         GObject.Object.__init__(self)
+        self.__search_db = SearchDatabase(App().db)
+        # (search, storage_type, rows) for last complete search
+        self.__previous = None
 
     def get(self, search, storage_type, cancellable):
         """
@@ -42,15 +54,71 @@ class LocalSearch(GObject.Object):
             @param storage_type as StorageType
             @param cancellable as Gio.Cancellable
         """
-        search = noaccents(search)
-        self.__get_artists(search, storage_type, cancellable)
-        self.__get_albums(search, storage_type, cancellable)
-        self.__get_tracks(search, storage_type, cancellable)
-        GLib.idle_add(self.emit, "finished")
+        if self.__search_db.available:
+            (artist_ids, album_ids, track_ids) = self.__get_indexed(
+                search, storage_type, cancellable)
+        else:
+            search = noaccents(search)
+            artist_ids = self.__get_artists(search, storage_type,
+                                            cancellable)
+            album_ids = []
+            track_ids = []
+            if not cancellable.is_cancelled():
+                album_ids = self.__get_albums(search, storage_type,
+                                              cancellable)
+            if not cancellable.is_cancelled():
+                track_ids = self.__get_tracks(search, storage_type,
+                                              cancellable)
+        GLib.idle_add(self.__emit_matches, artist_ids, album_ids,
+                      track_ids, storage_type, cancellable)
 
 #######################
 # PRIVATE             #
 #######################
+    def __get_indexed(self, search, storage_type, cancellable):
+        """
+            Get match for search with search index
+            @param search as str
+            @param storage_type as StorageType
+            @param cancellable as Gio.Cancellable
+        """
+        previous = self.__previous
+        if previous is not None and previous[1] == storage_type and\
+                self.__search_db.is_refinement(previous[0], search):
+            rows = self.__search_db.refine(previous[2], search)
+        else:
+            rows = self.__search_db.get_rows(search, storage_type,
+                                             self.__LIMIT, cancellable)
+        if rows is None or cancellable.is_cancelled():
+            return ([], [], [])
+        result = self.__search_db.split(rows)
+        # Only a complete result can be refined
+        if max([len(ids) for ids in result]) < self.__LIMIT:
+            self.__previous = (search, storage_type, rows)
+        else:
+            self.__previous = None
+        return result
+
+    def __emit_matches(self, artist_ids, album_ids, track_ids,
+                       storage_type, cancellable):
+        """
+            Emit matches and finished if search is still wanted
+            @param artist_ids as [int]
+            @param album_ids as [int]
+            @param track_ids as [int]
+            @param storage_type as StorageType
+            @param cancellable as Gio.Cancellable
+        """
+        if cancellable.is_cancelled():
+            return
+        if artist_ids:
+            self.emit("match-artists", artist_ids, storage_type)
+        if album_ids:
+            self.emit("match-albums", album_ids, storage_type)
+        if track_ids:
+            self.emit("match-tracks", track_ids, storage_type)
+        self.emit("finished")
+
     def __split_string(self, string):
         """
             Split string for search
@@ -165,15 +233,14 @@ class LocalSearch(GObject.Object):
             @param search as str
             @param storage_type as StorageType
             @param cancellable as Gio.Cancellable
+            @return [int]
         """
         artist_ids = self.__search_artists(search, storage_type, cancellable)
         counter = Counter(artist_ids)
         artist_ids = sorted(artist_ids,
                             key=lambda x: (counter[x], x),
                             reverse=True)
-        artist_ids = list(dict.fromkeys(artist_ids))
-        for artist_id in artist_ids:
-            GLib.idle_add(self.emit, "match-artist", artist_id, storage_type)
+        return list(dict.fromkeys(artist_ids))
 
     def __get_albums(self, search, storage_type, cancellable):
         """
@@ -181,15 +248,14 @@ class LocalSearch(GObject.Object):
             @param search as str
             @param storage_type as StorageType
             @param cancellable as Gio.Cancellable
+            @return [int]
         """
         album_ids = self.__search_albums(search, storage_type, cancellable)
         counter = Counter(album_ids)
         album_ids = sorted(album_ids,
                            key=lambda x: (counter[x], x),
                            reverse=True)
-        album_ids = list(dict.fromkeys(album_ids))
-        for album_id in album_ids:
-            GLib.idle_add(self.emit, "match-album", album_id, storage_type)
+        return list(dict.fromkeys(album_ids))
 
     def __get_tracks(self, search, storage_type, cancellable):
         """
@@ -197,12 +263,11 @@ class LocalSearch(GObject.Object):
             @param search as str
             @param storage_type as StorageType
             @param cancellable as Gio.Cancellable
+            @return [int]
         """
         track_ids = self.__search_tracks(search, storage_type, cancellable)
         counter = Counter(track_ids)
         track_ids = sorted(track_ids,
                            key=lambda x: (counter[x], x),
                            reverse=True)
-        track_ids = list(dict.fromkeys(track_ids))
-        for track_id in track_ids:
-            GLib.idle_add(self.emit, "match-track", track_id, storage_type)
+        return list(dict.fromkeys(track_ids))
@@ -11,42 +11,191 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from threading import current_thread
+from threading import current_thread, get_ident, Lock
+from time import monotonic
 
-from lollypop.define import App
+from lollypop.logger import Logger
+
+
+class SqlConnection:
+    """
+        A pooled sqlite connection owned by a thread
+    """
+
+    def __init__(self, connection, thread):
+        """
+            Init connection
+            @param connection as sqlite3.Connection
+            @param thread as threading.Thread
+        """
+        self.connection = connection
+        self.thread = thread
+        # Nested SqlCursor depth
+        self.depth = 0
+        # True if inside a SqlCursor.add()/remove() scope
+        self.scoped = False
+        self.last_used = monotonic()
+
+    @property
+    def busy(self):
+        """
+            True if connection is currently in use
+            @return bool
+        """
+        return self.depth > 0 or self.scoped
+
+
+class SqlConnectionPool:
+    """
+        Keep one long-lived sqlite connection per thread and per database
+        Databases objects open connections with get_cursor(), so collations
+        and functions are registered once per pooled connection
+    """
+
+    # Close connections unused for this many seconds
+    __IDLE_TIMEOUT = 60
+    __SWEEP_INTERVAL = 10
+
+    def __init__(self):
+        """
+            Init pool
+        """
+        self.__lock = Lock()
+        self.__connections = {}
+        self.__last_sweep = monotonic()
+        self.__opened = 0
+        self.__reused = 0
+        self.__evicted = 0
+
+    def acquire(self, obj):
+        """
+            Get connection for current thread, open it if needed
+            @param obj as Database/Playlists/History
+            @return SqlConnection
+        """
+        key = (get_ident(), obj.__class__.__name__)
+        with self.__lock:
+            self.__sweep()
+            pooled = self.__connections.get(key, None)
+            if pooled is None:
+                pooled = SqlConnection(obj.get_cursor(), current_thread())
+                self.__connections[key] = pooled
+                self.__opened += 1
+            else:
+                self.__reused += 1
+            pooled.depth += 1
+            pooled.last_used = monotonic()
+            return pooled
+
+    def release(self, pooled):
+        """
+            Release connection for current thread
+            @param pooled as SqlConnection
+        """
+        with self.__lock:
+            pooled.depth -= 1
+            pooled.last_used = monotonic()
+
+    def get_scoped(self, obj):
+        """
+            Get connection for current thread if inside an add() scope
+            @param obj as Database/Playlists/History
+            @return SqlConnection/None
+        """
+        key = (get_ident(), obj.__class__.__name__)
+        pooled = self.__connections.get(key, None)
+        if pooled is not None and pooled.scoped:
+            return pooled
+        return None
+
+    def close_all(self):
+        """
+            Close all unused connections
+        """
+        with self.__lock:
+            for key in list(self.__connections.keys()):
+                if not self.__connections[key].busy:
+                    self.__evict(key)
+
+    @property
+    def stats(self):
+        """
+            Get pool counters
+            @return {str: int}
+        """
+        return {"opened": self.__opened,
+                "reused": self.__reused,
+                "evicted": self.__evicted,
+                "pooled": len(self.__connections)}
+
+#######################
+# PRIVATE             #
+#######################
+    def __sweep(self):
+        """
+            Close connections for dead threads or idle for too long
+            Pool lock must be held
+        """
+        now = monotonic()
+        if now - self.__last_sweep < self.__SWEEP_INTERVAL:
+            return
+        self.__last_sweep = now
+        for key in list(self.__connections.keys()):
+            pooled = self.__connections[key]
+            if pooled.busy:
+                continue
+            if not pooled.thread.is_alive() or\
+                    now - pooled.last_used > self.__IDLE_TIMEOUT:
+                self.__evict(key)
+
+    def __evict(self, key):
+        """
+            Close connection for key
+            Pool lock must be held
+            @param key as (int, str)
+        """
+        pooled = self.__connections.pop(key)
+        try:
+            pooled.connection.close()
+        except Exception as e:
+            Logger.error("SqlConnectionPool::__evict(): %s", e)
+        self.__evicted += 1
 
 
 class SqlCursor:
     """
         Context manager to get the SQL cursor
     """
+    pool = SqlConnectionPool()
+
     def add(obj):
         """
-            Add cursor to thread list
+            Pin thread connection, cursors will not commit until remove()
         """
-        name = current_thread().getName() + obj.__class__.__name__
-        App().cursors[name] = obj.get_cursor()
+        if SqlCursor.pool.get_scoped(obj) is None:
+            pooled = SqlCursor.pool.acquire(obj)
+            pooled.scoped = True
 
     def remove(obj):
         """
-            Remove cursor from thread list and commit
+            Unpin thread connection and commit
         """
-        name = current_thread().getName() + obj.__class__.__name__
-        if name in App().cursors.keys():
+        pooled = SqlCursor.pool.get_scoped(obj)
+        if pooled is not None:
             obj.thread_lock.acquire()
-            App().cursors[name].commit()
+            pooled.connection.commit()
             obj.thread_lock.release()
-            App().cursors[name].close()
-            del App().cursors[name]
+            pooled.scoped = False
+            SqlCursor.pool.release(pooled)
 
     def commit(obj):
         """
             Commit current obj
         """
-        name = current_thread().getName() + obj.__class__.__name__
-        if name in App().cursors.keys():
+        pooled = SqlCursor.pool.get_scoped(obj)
+        if pooled is not None:
             obj.thread_lock.acquire()
-            App().cursors[name].commit()
+            pooled.connection.commit()
             obj.thread_lock.release()
 
     def __init__(self, obj, commit=False):
@@ -57,28 +206,33 @@ class SqlCursor:
         """
         self.__obj = obj
         self.__commit = commit
-        self.__cursor = None
+        self.__pooled = None
 
     def __enter__(self):
         """
-            Get thread cursor or a new one
+            Get thread connection
         """
-        name = current_thread().getName() + self.__obj.__class__.__name__
-        if name in App().cursors.keys():
-            cursor = App().cursors[name]
-            return cursor
-        else:
-            self.__cursor = self.__obj.get_cursor()
-            return self.__cursor
+        self.__pooled = self.pool.acquire(self.__obj)
+        return self.__pooled.connection
 
     def __exit__(self, type, value, traceback):
         """
-            Close cursor if not thread cursor
+            Commit or rollback if not in a thread scope
         """
-        if self.__cursor is not None:
-            if self.__commit:
-                self.__obj.thread_lock.acquire()
-                self.__cursor.commit()
-                self.__obj.thread_lock.release()
-            self.__cursor.close()
-        self.__cursor = None
+        pooled = self.__pooled
+        self.__pooled = None
+        if pooled is None:
+            return
+        try:
+            if not pooled.scoped:
+                connection = pooled.connection
+                if self.__commit:
+                    self.__obj.thread_lock.acquire()
+                    connection.commit()
+                    self.__obj.thread_lock.release()
+                # Uncommitted changes were lost when connections were
+                # closed, keep this behaviour for outer cursor
+                elif pooled.depth == 1 and connection.in_transaction:
+                    connection.rollback()
+        finally:
+            self.pool.release(pooled)
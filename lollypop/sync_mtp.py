@@ -12,16 +12,21 @@
 
 from gi.repository import GLib, Gio, Gst, GObject
 
-from time import sleep
 from re import match
+from time import time
 from random import shuffle
+from queue import Queue, Empty
+from collections import OrderedDict
+from hashlib import md5
+from threading import Lock
 import json
 import os
 import tempfile
 
 from lollypop.logger import Logger
-from lollypop.utils import escape, emit_signal
-from lollypop.define import App, Type
+from lollypop.utils import escape, emit_signal, get_workers_count
+from lollypop.utils_file import create_dir
+from lollypop.define import App, Type, CACHE_PATH
 from lollypop.objects_track import Track
 from lollypop.objects_album import Album
 
@@ -166,6 +171,168 @@ class MtpSyncDb:
         return uri
 
 
+class TranscodeCache:
+    """
+        Local cache for converted files, shared by all devices
+        Files are named after source URI, source mtime and encoder settings
+        Least recently used files are removed when cache is over budget
+    """
+
+    __PATH = CACHE_PATH + "/transcodes"
+
+    def __init__(self):
+        """
+            Init cache
+        """
+        self.__lock = Lock()
+        # Files by last use: {name: size}
+        self.__files = OrderedDict()
+        self.__size = 0
+        self.__budget = 0
+
+    def load(self):
+        """
+            Load cache content from disk
+        """
+        budget = App().settings.get_value("transcode-cache-size").get_int32()
+        files = []
+        if budget > 0:
+            create_dir(self.__PATH)
+            try:
+                with os.scandir(self.__PATH) as entries:
+                    for entry in entries:
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, entry.name,
+                                      stat.st_size))
+            except Exception as e:
+                Logger.error("TranscodeCache::load(): %s", e)
+        with self.__lock:
+            self.__budget = max(0, budget) * 1024 * 1024
+            self.__files = OrderedDict()
+            self.__size = 0
+            for (mtime, name, size) in sorted(files):
+                # Encodes running or interrupted a day ago
+                if name.startswith("."):
+                    if mtime < time() - 86400:
+                        self.__remove(name, size)
+                    continue
+                self.__files[name] = size
+                self.__size += size
+            self.__evict()
+
+    def get_name(self, uri, mtime, encoder, bitrate, normalize, extension):
+        """
+            Get cache file name
+            @param uri as str: source URI
+            @param mtime as int: source mtime
+            @param encoder as str
+            @param bitrate as int
+            @param normalize as bool
+            @param extension as str
+            @return str
+        """
+        key = "%s|%s|%s|%s|%s" % (uri, mtime, encoder, bitrate, normalize)
+        return md5(key.encode("utf-8")).hexdigest() + extension
+
+    def get(self, name):
+        """
+            Get cached file, mark it as recently used
+            @param name as str
+            @return Gio.File/None
+        """
+        with self.__lock:
+            if name not in self.__files.keys():
+                return None
+            self.__files.move_to_end(name)
+        path = "%s/%s" % (self.__PATH, name)
+        try:
+            os.utime(path)
+        except Exception as e:
+            Logger.warning("TranscodeCache::get(): %s", e)
+            with self.__lock:
+                self.__size -= self.__files.pop(name, 0)
+            return None
+        return Gio.File.new_for_path(path)
+
+    def get_temporary(self, extension):
+        """
+            Get a new temporary file in cache, add() it once written
+            @param extension as str
+            @return Gio.File
+        """
+        (fd, path) = tempfile.mkstemp(prefix=".lollypop_convert_",
+                                      suffix=extension,
+                                      dir=self.__PATH)
+        os.close(fd)
+        return Gio.File.new_for_path(path)
+
+    def add(self, name, f):
+        """
+            Add temporary file to cache as name
+            @param name as str
+            @param f as Gio.File
+        """
+        path = "%s/%s" % (self.__PATH, name)
+        os.replace(f.get_path(), path)
+        size = os.path.getsize(path)
+        with self.__lock:
+            self.__size -= self.__files.pop(name, 0)
+            self.__files[name] = size
+            self.__size += size
+            self.__evict()
+
+    def clear(self):
+        """
+            Remove all cached files
+        """
+        with self.__lock:
+            for (name, size) in list(self.__files.items()):
+                self.__remove(name, size)
+
+    @property
+    def enabled(self):
+        """
+            True if cache is enabled
+            @return bool
+        """
+        return self.__budget > 0
+
+    @property
+    def usage(self):
+        """
+            Get cache usage in bytes
+            @return (int, int): (size, budget)
+        """
+        with self.__lock:
+            return (self.__size, self.__budget)
+
+#######################
+# PRIVATE             #
+#######################
+    def __remove(self, name, size):
+        """
+            Remove file from cache
+            @param name as str
+            @param size as int
+            @warning: lock needed
+        """
+        if self.__files.pop(name, None) is not None:
+            self.__size -= size
+        try:
+            os.remove("%s/%s" % (self.__PATH, name))
+        except Exception as e:
+            Logger.warning("TranscodeCache::__remove(): %s", e)
+
+    def __evict(self):
+        """
+            Remove least recently used files until cache fits budget
+            @warning: lock needed
+        """
+        while self.__files and self.__size > self.__budget:
+            (name, size) = next(iter(self.__files.items()))
+            self.__remove(name, size)
+
+
 class MtpSync(GObject.Object):
     """
         Synchronisation to MTP devices
@@ -213,6 +380,15 @@ class MtpSync(GObject.Object):
         self.__total = 0  # Total files to sync
         self.__done = 0   # Handled files on sync
         self.__mtp_syncdb = MtpSyncDb()
+        self.__cache = TranscodeCache()
+        # Running encodes:
+        # {Gst.Pipeline: (Gio.File, Gio.File, str, int, str)}
+        # (encoded file, dst, dst uri, mtime, cache name)
+        self.__encodes = {}
+        # Files waiting for an encoder: [(Gio.File, Gio.File, str, int, str)]
+        self.__pending_encodes = []
+        # Finished encodes: (Gst.Pipeline, error as str)
+        self.__encoded = Queue()
 
     def check_encoder_status(self, encoder):
         """
@@ -272,16 +448,7 @@ class MtpSync(GObject.Object):
                 self.__delete_old_uris(uris)
 
             Logger.info("Copying files")
-            for (src_uri, dst_uri) in uris:
-                try:
-                    if self.__cancellable.is_cancelled():
-                        break
-                    self.__copy_file(src_uri, dst_uri)
-                    self.__done += 1
-                    emit_signal(self, "sync-progress",
-                                self.__done / self.__total)
-                except Exception as e:
-                    Logger.error("MtpSync::__copy_files(): %s", e)
+            self.__copy_files(uris)
             Logger.debug("Writing playlists")
             if not self.__cancellable.is_cancelled():
                 self.__write_playlists(playlist_ids)
@@ -313,6 +480,8 @@ class MtpSync(GObject.Object):
         """
         Logger.info("MtpSync::cancel()")
         self.__cancellable.cancel()
+        # Wake up sync waiting for an encode
+        self.__encoded.put((None, ""))
 
     @property
     def db(self):
@@ -321,6 +490,14 @@ class MtpSync(GObject.Object):
         """
         return self.__mtp_syncdb
 
+    @property
+    def cache(self):
+        """
+            Get transcode cache
+            @return TranscodeCache
+        """
+        return self.__cache
+
 ############
 # PRIVATE  #
 ############
@@ -503,9 +680,42 @@ class MtpSync(GObject.Object):
             convertion_needed = False
         return (convertion_needed, dst_uri)
 
+    def __copy_files(self, uris):
+        """
+            Copy files to device
+            Files needing a convertion are encoded by concurrent pipelines,
+            other files are copied while pipelines are running
+            @param uris as [(str, str)]
+        """
+        workers = get_workers_count(
+            App().settings.get_value("sync-workers").get_int32())
+        self.__encoded = Queue()
+        self.__pending_encodes = []
+        self.__cache.load()
+        try:
+            for (src_uri, dst_uri) in uris:
+                if self.__cancellable.is_cancelled():
+                    break
+                try:
+                    self.__copy_file(src_uri, dst_uri)
+                except Exception as e:
+                    Logger.error("MtpSync::__copy_files(): %s", e)
+                    self.__on_file_done()
+                self.__handle_encodes(workers, False)
+            while (self.__encodes or self.__pending_encodes) and\
+                    not self.__cancellable.is_cancelled():
+                self.__handle_encodes(workers, True)
+        finally:
+            for (pipeline, (convert_file, dst, dst_uri, mtime, name)) in\
+                    list(self.__encodes.items()):
+                self.__stop_encode(pipeline)
+                self.__delete_file(convert_file)
+            self.__encodes = {}
+            self.__pending_encodes = []
+
     def __copy_file(self, src_uri, dst_uri):
         """
-            Copy source to destination
+            Copy source to destination, add an encode if convertion needed
             @param src_uri as str
             @param dst_uri as str
         """
@@ -525,31 +735,135 @@ class MtpSync(GObject.Object):
             Logger.debug("MtpSync::__copy_file(): %s -> %s"
                          % (src_uri, dst_uri))
             if convertion_needed:
-                path = "{}/lollypop_convert".format(GLib.get_tmp_dir())
+                name = self.__get_cache_name(src_uri, mtime)
+                cached = None if name is None else self.__cache.get(name)
+                if cached is None:
+                    self.__pending_encodes.append(
+                        (src, dst, dst_uri, mtime, name))
+                    return
+                Logger.debug("MtpSync::__copy_file(): cached %s", src_uri)
+                src = cached
+            src.copy(dst, Gio.FileCopyFlags.OVERWRITE, None, None)
+            self.__mtp_syncdb.set_mtime(dst_uri, mtime)
+        self.__on_file_done()
+
+    def __handle_encodes(self, workers, wait):
+        """
+            Start pending encodes and copy encoded files to device
+            @param workers as int: max running encodes
+            @param wait as bool: wait for an encode to finish
+        """
+        while self.__pending_encodes and len(self.__encodes) < workers:
+            (src, dst, dst_uri, mtime, name) = self.__pending_encodes.pop(0)
+            # Each encode gets its own temporary file
+            extension = self.__EXTENSION[self.__mtp_syncdb.encoder]
+            if name is None:
+                (fd, path) = tempfile.mkstemp(prefix="lollypop_convert_",
+                                              suffix=extension,
+                                              dir=GLib.get_tmp_dir())
+                os.close(fd)
                 convert_file = Gio.File.new_for_path(path)
-                pipeline = self.__convert(src, convert_file)
-                # Check if encoding is finished
-                if pipeline is not None:
-                    bus = pipeline.get_bus()
-                    bus.add_signal_watch()
-                    bus.connect("message::eos", self.__on_bus_eos)
-                    self.__encoding = True
-                    while self.__encoding and\
-                            not self.__cancellable.is_cancelled():
-                        sleep(1)
-                    bus.disconnect_by_func(self.__on_bus_eos)
-                    bus.remove_signal_watch()
-                    pipeline.set_state(Gst.State.NULL)
+            else:
+                convert_file = self.__cache.get_temporary(extension)
+            pipeline = self.__convert(src, convert_file)
+            if pipeline is None:
+                self.__delete_file(convert_file)
+                self.__on_file_done()
+                continue
+            bus = pipeline.get_bus()
+            bus.add_signal_watch()
+            bus.connect("message::eos", self.__on_bus_eos, pipeline)
+            bus.connect("message::error", self.__on_bus_error, pipeline)
+            self.__encodes[pipeline] = (convert_file, dst, dst_uri,
+                                        mtime, name)
+        try:
+            # Wake up every second to report encodes progress
+            (pipeline, error) = self.__encoded.get(wait, 1)
+        except Empty:
+            if wait:
+                self.__emit_progress()
+            return
+        if pipeline not in self.__encodes.keys():
+            return
+        (convert_file, dst, dst_uri,
+         mtime, name) = self.__encodes.pop(pipeline)
+        self.__stop_encode(pipeline)
+        if error:
+            Logger.error("MtpSync::__handle_encodes(): %s", error)
+            self.__errors_count += 1
+            self.__last_error = error
+        else:
+            try:
+                if name is None:
                     convert_file.move(
                         dst, Gio.FileCopyFlags.OVERWRITE, None, None)
-                    # To be sure
-                    try:
-                        convert_file.delete(None)
-                    except:
-                        pass
-            else:
-                src.copy(dst, Gio.FileCopyFlags.OVERWRITE, None, None)
-            self.__mtp_syncdb.set_mtime(dst_uri, mtime)
+                else:
+                    convert_file.copy(
+                        dst, Gio.FileCopyFlags.OVERWRITE, None, None)
+                    self.__cache.add(name, convert_file)
+                self.__mtp_syncdb.set_mtime(dst_uri, mtime)
+            except Exception as e:
+                Logger.error("MtpSync::__handle_encodes(): %s", e)
+        # To be sure
+        self.__delete_file(convert_file)
+        self.__on_file_done()
+
+    def __get_cache_name(self, src_uri, mtime):
+        """
+            Get transcode cache name for current encoder settings
+            @param src_uri as str
+            @param mtime as int
+            @return str/None if cache disabled
+        """
+        if not self.__cache.enabled:
+            return None
+        encoder = self.__mtp_syncdb.encoder
+        return self.__cache.get_name(src_uri, mtime, encoder,
+                                     self.__convert_bitrate,
+                                     self.__mtp_syncdb.normalize,
+                                     self.__EXTENSION[encoder])
+
+    def __stop_encode(self, pipeline):
+        """
+            Stop encode pipeline
+            @param pipeline as Gst.Pipeline
+        """
+        bus = pipeline.get_bus()
+        bus.disconnect_by_func(self.__on_bus_eos)
+        bus.disconnect_by_func(self.__on_bus_error)
+        bus.remove_signal_watch()
+        pipeline.set_state(Gst.State.NULL)
+
+    def __delete_file(self, f):
+        """
+            Delete file, ignore errors
+            @param f as Gio.File
+        """
+        try:
+            f.delete(None)
+        except:
+            pass
+
+    def __on_file_done(self):
+        """
+            Update progress for a handled file
+        """
+        self.__done += 1
+        self.__emit_progress()
+
+    def __emit_progress(self):
+        """
+            Emit sync progress, running encodes count for their progress
+        """
+        done = self.__done
+        for pipeline in list(self.__encodes.keys()):
+            (has_position,
+             position) = pipeline.query_position(Gst.Format.TIME)
+            (has_duration,
+             duration) = pipeline.query_duration(Gst.Format.TIME)
+            if has_position and has_duration and duration > 0:
+                done += min(1, position / duration)
+        emit_signal(self, "sync-progress", done / self.__total)
 
     def __convert(self, src, dst):
         """
@@ -585,10 +899,21 @@ class MtpSync(GObject.Object):
             Logger.error("MtpSync::__convert(): %s" % e)
             return None
 
-    def __on_bus_eos(self, bus, message):
+    def __on_bus_eos(self, bus, message, pipeline):
+        """
+            Mark encode as finished
+            @param bus as Gst.Bus
+            @param message as Gst.Message
+            @param pipeline as Gst.Pipeline
+        """
+        self.__encoded.put((pipeline, ""))
+
+    def __on_bus_error(self, bus, message, pipeline):
         """
-            Stop encoding
+            Mark encode as failed
             @param bus as Gst.Bus
             @param message as Gst.Message
+            @param pipeline as Gst.Pipeline
         """
-        self.__encoding = False
+        (error, debug) = message.parse_error()
+        self.__encoded.put((pipeline, error.message))
@@ -497,6 +497,99 @@ class TagReader:
         lyrics = get_id3()
         return lyrics
 
+    def get_artwork(self, tags):
+        """
+            Get embedded artwork
+            @param tags as Gst.TagList
+            @return bytes/None
+        """
+        try:
+            if tags is None:
+                return None
+            for key in ["image", "preview-image"]:
+                (exists, sample) = tags.get_sample_index(key, 0)
+                if not exists:
+                    continue
+                buffer = sample.get_buffer()
+                (exists, m) = buffer.map(Gst.MapFlags.READ)
+                if not exists:
+                    continue
+                try:
+                    # Gstreamer 1.18 API breakage
+                    try:
+                        return m.data.tobytes()
+                    except:
+                        return bytes(m.data)
+                finally:
+                    buffer.unmap(m)
+        except Exception as e:
+            Logger.warning("TagReader::get_artwork(): %s", e)
+        return None
+
+    def get_file_tags(self, tags, name, compilations, advanced_artist_tags):
+        """
+            Read all tags needed by collection, no DB access
+            @param tags as Gst.TagList
+            @param name as str => file basename
+            @param compilations as bool => compilations support
+            @param advanced_artist_tags as bool
+            @return (title, artists, genres, a_sortnames, aa_sortnames,
+                     album_artists, album_name, discname, discnumber,
+                     year, timestamp, original_year, original_timestamp,
+                     mb_album_id, mb_track_id, mb_artist_id,
+                     mb_album_artist_id, tracknumber, popm, bpm, compilation)
+        """
+        title = self.get_title(tags, name)
+        version = self.get_version(tags)
+        if version != "":
+            title += " (%s)" % version
+        artists = self.get_artists(tags)
+        a_sortnames = self.get_artist_sortnames(tags)
+        aa_sortnames = self.get_album_artist_sortnames(tags)
+        album_artists = self.get_album_artists(tags)
+        album_name = self.get_album_name(tags)
+        mb_album_id = self.get_mb_album_id(tags)
+        mb_track_id = self.get_mb_track_id(tags)
+        mb_artist_id = self.get_mb_artist_id(tags)
+        mb_album_artist_id = self.get_mb_album_artist_id(tags)
+        genres = self.get_genres(tags)
+        discnumber = self.get_discnumber(tags)
+        discname = self.get_discname(tags)
+        tracknumber = self.get_tracknumber(tags, name)
+        popm = self.get_popm(tags)
+        bpm = self.get_bpm(tags)
+        compilation = compilations and self.get_compilation(tags)
+        (original_year, original_timestamp) = self.get_original_year(tags)
+        (year, timestamp) = self.get_year(tags)
+        if year is None:
+            (year, timestamp) = (original_year, original_timestamp)
+        elif original_year is None:
+            (original_year, original_timestamp) = (year, timestamp)
+        # If no artists tag, use album artist
+        if artists == "":
+            artists = album_artists
+        if advanced_artist_tags:
+            composers = self.get_composers(tags)
+            conductors = self.get_conductors(tags)
+            performers = self.get_performers(tags)
+            remixers = self.get_remixers(tags)
+            artists += ";%s" % performers if performers != "" else ""
+            artists += ";%s" % conductors if conductors != "" else ""
+            artists += ";%s" % composers if composers != "" else ""
+            artists += ";%s" % remixers if remixers != "" else ""
+        if artists == "":
+            artists = _("Unknown")
+        # Reset album tags if we found a compilation
+        if compilation:
+            album_artists = ""
+            mb_album_artist_id = ""
+            aa_sortnames = ""
+        return (title, artists, genres, a_sortnames, aa_sortnames,
+                album_artists, album_name, discname, discnumber,
+                year, timestamp, original_year, original_timestamp,
+                mb_album_id, mb_track_id, mb_artist_id,
+                mb_album_artist_id, tracknumber, popm, bpm, compilation)
+
     def add_artists(self, artists, sortnames, mb_artist_id=""):
         """
             Add artists to db
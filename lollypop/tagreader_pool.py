@@ -0,0 +1,106 @@
+# Copyright (c) 2014-2021 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Functions running in tag reader worker processes:
+# - no App(), no DB access
+# - arguments and results are plain python values
+
+from gi.repository import Gio
+
+import gettext
+from multiprocessing import get_context
+
+# Per process objects, set by init_worker()
+_discoverer = None
+_tag_reader = None
+# Albums with an artwork already returned by this process
+_artwork_keys = set()
+
+
+def get_artwork_key(uri, tags):
+    """
+        Get a key identifying track album before it is saved
+        Same fields as get_lollypop_album_id(), plus track directory
+        for albums without album artists
+        @param uri as str
+        @param tags as (), see TagReader.get_file_tags()
+        @return (str, str, int, str, str)
+    """
+    # Album artists, album name, year, mb album id
+    (album_artists, album_name, year, mb_album_id) = (tags[5], tags[6],
+                                                      tags[9], tags[13])
+    directory = ""
+    if not album_artists:
+        parent = Gio.File.new_for_uri(uri).get_parent()
+        if parent is not None:
+            directory = parent.get_uri()
+    return (album_artists, album_name, year, mb_album_id, directory)
+
+
+def new_pool(count):
+    """
+        Create a new tag reader pool
+        We do not fork: GStreamer/GLib state is not fork safe
+        @param count as int
+        @return multiprocessing.Pool
+    """
+    localedir = gettext.bindtextdomain("lollypop")
+    return get_context("spawn").Pool(count, init_worker, (localedir,))
+
+
+def init_worker(localedir):
+    """
+        Init worker process
+        @param localedir as str
+    """
+    global _discoverer, _tag_reader
+    import gi
+    gi.require_version("Gst", "1.0")
+    gi.require_version("GstPbutils", "1.0")
+    from gi.repository import Gst, GstPbutils
+    Gst.init(None)
+    GstPbutils.pb_utils_init()
+    gettext.bindtextdomain("lollypop", localedir)
+    gettext.textdomain("lollypop")
+    from lollypop.tagreader import TagReader, Discoverer
+    _discoverer = Discoverer()
+    _tag_reader = TagReader()
+
+
+def read_file_tags(args):
+    """
+        Read tags for uri
+        @param args as (str, int, bool, bool, bool):
+                       (uri, mtime, compilations, advanced_artist_tags,
+                        artwork)
+        @return (str, int, (), int, bytes, str):
+                (uri, mtime, tags, duration, artwork, error)
+                tags is None on error, see TagReader.get_file_tags()
+                artwork is only returned for first track of an album
+    """
+    (uri, mtime, compilations, advanced_artist_tags, artwork) = args
+    try:
+        name = Gio.File.new_for_uri(uri).get_basename()
+        info = _discoverer.get_info(uri)
+        duration = int(info.get_duration() / 1000000)
+        tags = _tag_reader.get_file_tags(info.get_tags(), name,
+                                         compilations, advanced_artist_tags)
+        data = None
+        if artwork:
+            key = get_artwork_key(uri, tags)
+            if key not in _artwork_keys:
+                data = _tag_reader.get_artwork(info.get_tags())
+                if data is not None:
+                    _artwork_keys.add(key)
+        return (uri, mtime, tags, duration, data, "")
+    except Exception as e:
+        return (uri, mtime, None, 0, None, str(e))
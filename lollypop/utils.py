@@ -22,6 +22,7 @@ import re
 from hashlib import md5
 from threading import current_thread
 from functools import wraps
+from multiprocessing import cpu_count
 
 from lollypop.logger import Logger
 from lollypop.define import App, Type, NetworkAccessACL
@@ -554,3 +555,40 @@ def split_list(l, n=1):
     length = len(l)
     split = [l[i * length // n: (i + 1) * length // n] for i in range(n)]
     return [l for l in split if l]
+
+
+def get_workers_count(count):
+    """
+        Get workers count
+        @param count as int => 0 means automatic
+        @return int
+    """
+    if count > 0:
+        return count
+    return max(1, cpu_count())
+
+
+def is_widget_visible(widget):
+    """
+        True if widget intersects its scrolled windows viewports
+        Main thread only
+        @param widget as Gtk.Widget
+        @return bool
+    """
+    if not widget.get_mapped():
+        return False
+    scrolled = widget.get_ancestor(Gtk.ScrolledWindow)
+    while scrolled is not None:
+        coordinates = widget.translate_coordinates(scrolled, 0, 0)
+        if coordinates is None:
+            return False
+        (x, y) = coordinates
+        if x <= -widget.get_allocated_width() or\
+                x >= scrolled.get_allocated_width() or\
+                y <= -widget.get_allocated_height() or\
+                y >= scrolled.get_allocated_height():
+            return False
+        parent = scrolled.get_parent()
+        scrolled = None if parent is None else\
+            parent.get_ancestor(Gtk.ScrolledWindow)
+    return True
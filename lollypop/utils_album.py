@@ -12,6 +12,7 @@
 
 
 from lollypop.define import App, Type
+from lollypop.objects_album import Album
 
 
 def tracks_to_albums(tracks, skipped=True):
@@ -22,6 +23,7 @@ def tracks_to_albums(tracks, skipped=True):
         @return [Album]
     """
     albums = []
+    Album.prefetch([track.album for track in tracks])
     for track in tracks:
         if albums and albums[-1].id == track.album.id:
             albums[-1].append_track(track, False)
@@ -14,7 +14,6 @@ from gi.repository import GLib
 
 from lollypop.logger import Logger
 from lollypop.define import App
-from lollypop.objects_album import Album
 from lollypop.utils import get_default_storage_type
 
 
@@ -36,10 +35,7 @@ def play_artists(artist_ids, genre_ids):
                                                     artist_ids,
                                                     storage_type,
                                                     False)
-        albums = []
-        for album_id in album_ids:
-            albums.append(Album(album_id, genre_ids, artist_ids, False))
-        App().player.play_albums(albums)
+        App().player.play_album_ids(album_ids, genre_ids, artist_ids, False)
     except Exception as e:
         Logger.error("play_artists(): %s" % e)
 
@@ -61,15 +57,14 @@ def add_artist_to_playback(artist_ids, genre_ids, add):
                                                     storage_type,
                                                     False)
         if add:
-            albums = []
-            for album_id in album_ids:
-                if album_id not in App().player.album_ids:
-                    album = Album(album_id, genre_ids, artist_ids, False)
-                    albums.append(album)
-            App().player.add_albums(albums)
+            player_album_ids = set(App().player.album_ids)
+            album_ids = [album_id for album_id in album_ids
+                         if album_id not in player_album_ids]
+            App().player.add_album_ids(album_ids, genre_ids, artist_ids,
+                                       False)
         else:
             App().player.remove_album_by_ids(album_ids)
-            if len(App().player.albums) == 0:
+            if not App().player.album_ids:
                 App().player.stop()
             elif App().player.current_track.album.id\
                     not in App().player.album_ids:
@@ -19,6 +19,7 @@ from random import shuffle
 from lollypop.view_flowbox import FlowBoxView
 from lollypop.widgets_album_simple import AlbumSimpleWidget
 from lollypop.define import App, Type, ViewType, ScanUpdate, StorageType
+from lollypop.define import TaskLane
 from lollypop.objects_album import Album
 from lollypop.utils import get_icon_name, get_network_available, popup_widget
 from lollypop.utils import get_title_for_genres_artists
@@ -93,9 +94,9 @@ class AlbumsBoxView(FlowBoxView, SignalsHelper):
             album_ids = get_album_ids_for(self._genre_ids, self._artist_ids,
                                           self.storage_type, skipped)
             albums = []
-            for album_id in album_ids:
-                album = Album(album_id, self._genre_ids,
-                              self._artist_ids, True)
+            for row in App().albums.get_rows(album_ids):
+                album = Album(row[0], self._genre_ids,
+                              self._artist_ids, True, row)
                 album.set_storage_type(self.storage_type)
                 albums.append(album)
             return albums
@@ -103,7 +104,8 @@ class AlbumsBoxView(FlowBoxView, SignalsHelper):
         if albums:
             FlowBoxView.populate(self, albums)
         elif self.__populate_wanted:
-            App().task_helper.run(load, callback=(on_load,))
+            App().task_helper.run(load, callback=(on_load,),
+                                  lane=TaskLane.DB)
 
     def add_value(self, album):
         """
@@ -149,6 +151,17 @@ class AlbumsBoxView(FlowBoxView, SignalsHelper):
         widget.show()
         return widget
 
+    def _prewarm(self, children):
+        """
+            Prewarm artwork for children
+            @param children as [AlbumSimpleWidget], most wanted first
+        """
+        if children:
+            App().art_prewarmer.prewarm(
+                [child.data.id for child in children],
+                children[0].art_size,
+                self.get_scale_factor())
+
     def _get_menu_widget(self, child):
         """
             Get menu widget
@@ -387,7 +400,8 @@ class AlbumsForYearsBoxView(AlbumsForGenresBoxView):
                            for item in items]
             return albums
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
 
 class AlbumsDeviceBoxView(AlbumsBoxView):
@@ -418,7 +432,8 @@ class AlbumsDeviceBoxView(AlbumsBoxView):
             album_ids += App().albums.get_synced_ids(self.__index)
             return [Album(album_id) for album_id in album_ids]
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
     @property
     def args(self):
@@ -14,7 +14,7 @@ from gi.repository import GLib, Gtk, Gio, Pango
 
 from gettext import gettext as _
 
-from lollypop.define import App, Type, MARGIN, ViewType, StorageType
+from lollypop.define import App, Type, MARGIN, ViewType, StorageType, TaskLane
 from lollypop.objects_album import Album
 from lollypop.utils import get_network_available, get_default_storage_type
 from lollypop.helper_signals import signals
@@ -164,7 +164,8 @@ class AlbumsArtistLineView(AlbumsLineView):
             self._label.set_text(_("Others compilations"))
         else:
             self._label.set_text(App().artists.get_name(self.__artist_id))
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
 
 class AlbumsArtistAppearsOnLineView(AlbumsLineView):
@@ -197,7 +198,8 @@ class AlbumsArtistAppearsOnLineView(AlbumsLineView):
             return [Album(album_id) for album_id in album_ids]
 
         self._label.set_text(_("Appears on"))
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
 
 class AlbumsPopularsLineView(AlbumsLineView):
@@ -228,7 +230,8 @@ class AlbumsPopularsLineView(AlbumsLineView):
             return [Album(album_id) for album_id in album_ids]
 
         self._label.set_text(_("Popular albums at the moment"))
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
 
 class AlbumsRandomGenresLineView(AlbumsLineView):
@@ -261,7 +264,8 @@ class AlbumsRandomGenresLineView(AlbumsLineView):
                                                  self.ITEMS)
             return [Album(album_id) for album_id in album_ids]
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
 
 class AlbumsSearchLineView(AlbumsLineView):
@@ -335,7 +339,8 @@ class AlbumsStorageTypeLineView(AlbumsLineView):
             album_ids = App().albums.get_for_storage_type(storage_type, 20)
             return [Album(album_id) for album_id in album_ids]
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
         self.__storage_type |= storage_type
 
 #######################
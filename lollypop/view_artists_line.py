@@ -15,7 +15,7 @@ from gi.repository import Gtk, Pango, GLib
 from gettext import gettext as _
 
 from lollypop.utils import get_default_storage_type
-from lollypop.define import App, MARGIN, ViewType
+from lollypop.define import App, MARGIN, ViewType, TaskLane
 from lollypop.helper_horizontal_scrolling import HorizontalScrollingHelper
 from lollypop.view_artists_rounded import RoundedArtistsView
 
@@ -147,7 +147,8 @@ class ArtistsRandomLineView(ArtistsLineView):
             ids = App().artists.get_randoms(15, storage_type)
             return ids
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
 
 class ArtistsSearchLineView(ArtistsLineView):
@@ -169,10 +170,19 @@ class ArtistsSearchLineView(ArtistsLineView):
             Insert item
             @param item_id as int
         """
-        if item_id in self.__artist_ids:
+        self.add_values([item_id])
+
+    def add_values(self, item_ids):
+        """
+            Insert items
+            @param item_ids as [int]
+        """
+        item_ids = [item_id for item_id in dict.fromkeys(item_ids)
+                    if item_id not in self.__artist_ids]
+        if not item_ids:
             return
-        self.__artist_ids.append(item_id)
-        ArtistsLineView.populate(self, [item_id])
+        self.__artist_ids += item_ids
+        ArtistsLineView.populate(self, item_ids)
         self._box.set_min_children_per_line(len(self._box.get_children()))
 
     def clear(self):
@@ -15,7 +15,7 @@ from gettext import gettext as _
 from time import time
 
 from lollypop.view_flowbox import FlowBoxView
-from lollypop.define import App, Type, ViewType, OrderBy, ScanUpdate
+from lollypop.define import App, Type, ViewType, OrderBy, ScanUpdate, TaskLane
 from lollypop.widgets_artist_rounded import RoundedArtistWidget
 from lollypop.objects_album import Album
 from lollypop.utils import get_icon_name
@@ -59,7 +59,8 @@ class RoundedArtistsView(FlowBoxView, SignalsHelper):
         if artist_ids:
             FlowBoxView.populate(self, artist_ids)
         else:
-            App().task_helper.run(load, callback=(on_load,))
+            App().task_helper.run(load, callback=(on_load,),
+                                  lane=TaskLane.DB)
 
     @property
     def args(self):
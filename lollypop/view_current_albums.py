@@ -28,6 +28,9 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
         Popover showing Albums View
     """
 
+    # Albums added to view at once, more are added on scroll
+    __PAGE_SIZE = 50
+
     @signals_map
     def __init__(self, view_type):
         """
@@ -42,6 +45,9 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
         self.box.set_width(Size.MEDIUM)
         if view_type & ViewType.DND:
             self.dnd_helper.connect("dnd-finished", self.__on_dnd_finished)
+        self.__playback = None
+        # Playback albums added to view
+        self.__loaded = 0
         self.__banner = CurrentAlbumsBannerWidget(self)
         self.__banner.show()
         # Queue
@@ -68,13 +74,14 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
         """
             Populate view
         """
-        albums = App().player.albums
-        if albums:
-            if len(albums) == 1:
-                self.add_reveal_albums(albums)
-            AlbumsListView.populate(self, albums)
+        playback = App().player.playback
+        if playback:
+            if len(playback) == 1:
+                self.add_reveal_albums(playback[:])
+            self.__populate(playback)
             self.show_placeholder(False)
         else:
+            self.__playback = None
             self.show_placeholder(True)
 
     def clear(self):
@@ -122,7 +129,12 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
             @param player as Player
             @param album as Album
         """
+        # Album will be added with its page
+        if self.__playback is not None and\
+                self.__loaded < len(self.__playback) - 1:
+            return
         self.add_value(album)
+        self.__loaded += 1
         self.show_placeholder(False)
 
     def _on_playback_updated(self, player, album):
@@ -140,16 +152,15 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
         """
             Add album
             @param player as Player
-            @param albums as [Album]
+            @param albums as PlaybackList
         """
+        self.stop()
+        AlbumsListView.clear(self)
         if albums:
-            self.stop()
-            AlbumsListView.clear(self)
-            AlbumsListView.populate(self, albums)
+            self.__populate(albums)
             self.show_placeholder(False)
         else:
-            self.stop()
-            AlbumsListView.clear(self)
+            self.__playback = None
             self.show_placeholder(True)
 
     def _on_playback_removed(self, player, album):
@@ -161,6 +172,7 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
         for child in self.children:
             if child.album == album:
                 self._box.remove(child)
+                self.__loaded -= 1
                 break
         if not self.children:
             self.show_placeholder(True)
@@ -173,6 +185,17 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
         """
         App().player.load(track)
 
+    def _on_value_changed(self, adj):
+        """
+            Add next page when scrolled to bottom
+            @param adj as Gtk.Adjustment
+        """
+        AlbumsListView._on_value_changed(self, adj)
+        if self.__playback is not None and\
+                self.__loaded < len(self.__playback) and\
+                adj.get_value() + adj.get_page_size() * 2 >= adj.get_upper():
+            self.__add_page()
+
     def _on_album_removed(self, row):
         """
             Remove album from playback
@@ -206,6 +229,31 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
 #######################
 # PRIVATE             #
 #######################
+    def __populate(self, playback):
+        """
+            Populate view with first page, more on scroll
+            @param playback as PlaybackList
+        """
+        self.__playback = playback
+        # Current album must be in view
+        try:
+            count = playback.index(App().player.current_track.album) + 1
+        except ValueError:
+            count = 0
+        albums = playback[:max(count, self.__PAGE_SIZE)]
+        self.__loaded = len(albums)
+        AlbumsListView.populate(self, albums)
+
+    def __add_page(self):
+        """
+            Add next page to view
+        """
+        start = self.__loaded
+        albums = self.__playback[start:start + self.__PAGE_SIZE]
+        self.__loaded += len(albums)
+        for album in albums:
+            self.add_value(album)
+
     def __add_queue(self):
         """
             Add player queue
@@ -223,4 +271,8 @@ class CurrentAlbumsView(AlbumsListView, SignalsHelper):
         albums = []
         for child in self.children:
             albums.append(child.album)
+        # Keep albums not added to view yet
+        if self.__playback is not None:
+            albums += self.__playback[self.__loaded:]
         App().player.set_albums(albums, False)
+        self.__playback = App().player.playback
@@ -14,7 +14,7 @@ from random import shuffle
 
 from lollypop.view_flowbox import FlowBoxView
 from lollypop.widgets_albums_decade import AlbumsDecadeWidget
-from lollypop.define import App, Type, ViewType, OrderBy
+from lollypop.define import App, Type, ViewType, OrderBy, TaskLane
 from lollypop.utils import get_icon_name
 from lollypop.objects_album import Album
 
@@ -62,7 +62,8 @@ class DecadesBoxView(FlowBoxView):
                 decades.append(decade)
             return decades
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
     @property
     def args(self):
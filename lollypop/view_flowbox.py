@@ -10,7 +10,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gtk
+from gi.repository import GLib, Gtk
 
 from locale import strcoll
 
@@ -25,6 +25,8 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         Lazy loading FlowBox
     """
 
+    __PREWARM_DELAY = 500
+
     def __init__(self, storage_type, view_type=ViewType.SCROLLED):
         """
             Init flowbox view
@@ -34,6 +36,7 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         LazyLoadingView.__init__(self, storage_type, view_type)
         self._items = []
         self.__hovered_child = None
+        self.__prewarm_timeout_id = None
         self.__font_height = get_font_height()
         self._box = Gtk.FlowBox()
         self._box.get_style_context().add_class("small_padding")
@@ -48,6 +51,7 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
             self.__event_controller = Gtk.EventControllerMotion.new(self._box)
             self.__event_controller.connect("motion", self.__on_box_motion)
         GesturesHelper.__init__(self, self._box)
+        self.connect("populated", self.__on_populated)
 
     def populate(self, items):
         """
@@ -142,6 +146,24 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
     def _on_child_activated(self, flowbox, child):
         pass
 
+    def _prewarm(self, children):
+        """
+            Prewarm artwork for children
+            @param children as [Gtk.FlowBoxChild], most wanted first
+        """
+        pass
+
+    def _on_value_changed(self, adj):
+        """
+            Prewarm artwork once scrolling stops
+            @param adj as Gtk.Adjustment
+        """
+        LazyLoadingView._on_value_changed(self, adj)
+        if self.__prewarm_timeout_id is not None:
+            GLib.source_remove(self.__prewarm_timeout_id)
+        self.__prewarm_timeout_id = GLib.timeout_add(
+            self.__PREWARM_DELAY, self.__prewarm)
+
     def _on_container_folded(self, leaflet, folded):
         """
             Handle libhandy folded status
@@ -190,6 +212,9 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         """
         LazyLoadingView._on_destroy(self, widget)
         self.__event_controller = None
+        if self.__prewarm_timeout_id is not None:
+            GLib.source_remove(self.__prewarm_timeout_id)
+            self.__prewarm_timeout_id = None
 
 #######################
 # PRIVATE             #
@@ -204,6 +229,53 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
             menu_widget.show()
             popup_widget(menu_widget, child.artwork, None, None, None)
 
+    def __get_page_children(self):
+        """
+            Get visible children followed by next page children
+            @return [Gtk.FlowBoxChild]
+        """
+        children = self._box.get_children()
+        position = self.scrolled.translate_coordinates(self._box, 0, 0)
+        if not children or position is None:
+            return []
+        top = position[1]
+        bottom = top + self.scrolled.get_allocated_height()
+        # Children are sorted by position, search first visible child
+        (start, end) = (0, len(children))
+        while start < end:
+            middle = (start + end) // 2
+            child = children[middle]
+            position = child.translate_coordinates(self._box, 0, 0)
+            if position is None:
+                return []
+            if position[1] + child.get_allocated_height() <= top:
+                start = middle + 1
+            else:
+                end = middle
+        count = 0
+        for child in children[start:]:
+            position = child.translate_coordinates(self._box, 0, 0)
+            if position is None or position[1] >= bottom:
+                break
+            count += 1
+        return children[start:start + count * 2]
+
+    def __prewarm(self):
+        """
+            Prewarm artwork for current page and next page
+        """
+        self.__prewarm_timeout_id = None
+        if not self.destroyed:
+            self._prewarm(self.__get_page_children())
+
+    def __on_populated(self, view):
+        """
+            Prewarm artwork for first page
+            @param view as LazyLoadingView
+        """
+        if self.__prewarm_timeout_id is None:
+            self.__prewarm()
+
     def __unselect_selected(self):
         """
             Unselect selected child
@@ -14,7 +14,7 @@ from random import shuffle
 
 from lollypop.view_flowbox import FlowBoxView
 from lollypop.widgets_albums_genre import AlbumsGenreWidget
-from lollypop.define import App, Type, ViewType
+from lollypop.define import App, Type, ViewType, TaskLane
 from lollypop.utils import get_icon_name
 from lollypop.objects_album import Album
 
@@ -49,7 +49,8 @@ class GenresBoxView(FlowBoxView):
         def load():
             return App().genres.get_ids()
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
     @property
     def args(self):
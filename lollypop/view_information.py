@@ -15,7 +15,7 @@ from gi.repository import Gtk, GLib, Gio, Pango
 from gettext import gettext as _
 import re
 
-from lollypop.define import App, ViewType, MARGIN
+from lollypop.define import App, ViewType, MARGIN, TaskLane
 from lollypop.define import ARTISTS_PATH
 from lollypop.objects_album import Album
 from lollypop.information_store import InformationStore
@@ -237,7 +237,8 @@ class InformationView(View, SignalsHelper):
             App().task_helper.run(
                 wikipedia.get_search_list,
                 self.__artist_name,
-                callback=(self.__on_wikipedia_search_list,))
+                callback=(self.__on_wikipedia_search_list,),
+                lane=TaskLane.NETWORK)
         else:
             self.__show_main_widget()
 
@@ -306,4 +307,5 @@ class InformationView(View, SignalsHelper):
         wikipedia = WikipediaHelper()
         App().task_helper.run(wikipedia.get_content_for_page_id,
                               row.page_id, row.locale,
-                              callback=(self.__on_wikipedia_get_content,))
+                              callback=(self.__on_wikipedia_get_content,),
+                              lane=TaskLane.NETWORK)
@@ -12,7 +12,7 @@
 
 from lollypop.utils_album import tracks_to_albums
 from lollypop.utils import get_default_storage_type
-from lollypop.define import App, ViewType, MARGIN, Type, Size
+from lollypop.define import App, ViewType, MARGIN, Type, Size, TaskLane
 from lollypop.objects_album import Album
 from lollypop.objects_track import Track
 from lollypop.widgets_banner_playlist import PlaylistBannerWidget
@@ -219,7 +219,8 @@ class PlaylistsView(AlbumsListView, SignalsHelper, SizeAllocationHelper):
             return tracks_to_albums(
                 [Track(track_id) for track_id in track_ids])
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
     def __populate_smart(self):
         """
@@ -242,7 +243,8 @@ class PlaylistsView(AlbumsListView, SignalsHelper, SizeAllocationHelper):
                 [Track(track_id) for track_id in track_ids])
 
         self.banner.spinner.start()
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
     def __on_dnd_finished(self, dnd_helper):
         """
@@ -13,7 +13,7 @@
 from locale import strcoll
 
 from lollypop.view_flowbox import FlowBoxView
-from lollypop.define import App, Type, ViewType, StorageType
+from lollypop.define import App, Type, ViewType, StorageType, TaskLane
 from lollypop.utils import popup_widget
 from lollypop.utils_album import tracks_to_albums
 from lollypop.objects_track import Track
@@ -62,7 +62,8 @@ class PlaylistsManagerView(FlowBoxView, SignalsHelper):
             items += App().playlists.get_ids()
             return items
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
     @property
     def args(self):
@@ -246,7 +247,8 @@ class PlaylistsManagerDeviceView(PlaylistsManagerView):
             items += App().playlists.get_synced_ids(self.__index)
             return items
 
-        App().task_helper.run(load, callback=(on_load,))
+        App().task_helper.run(load, callback=(on_load,),
+                              lane=TaskLane.DB)
 
     @property
     def args(self):
@@ -10,7 +10,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gtk, GLib, Gio
+from gi.repository import Gtk
 
 from gettext import gettext as _
 
@@ -142,15 +142,12 @@ class SearchView(View, Gtk.Bin, SignalsHelper):
                       ViewType.SCROLLED |
                       ViewType.OVERLAY)
         Gtk.Bin.__init__(self)
-        self.__timeout_id = None
         self.__current_search = ""
         self.__search = Search()
         self.__search.set_web_search(
             App().settings.get_value("web-search").get_string())
-        self.__cancellable = Gio.Cancellable()
         self._empty_message = _("Search for artists, albums and tracks")
         self._empty_icon_name = "edit-find-symbolic"
-        self.__cancellable = Gio.Cancellable()
         self.__banner = SearchBannerWidget()
         self.__banner.show()
         self.__stack = SearchStack(self.storage_type)
@@ -161,9 +158,10 @@ class SearchView(View, Gtk.Bin, SignalsHelper):
                               _("Search for artists, albums and tracks"))
         self.set_search(initial_search)
         return [
-                (self.__search, "match-artist", "_on_match_artist"),
-                (self.__search, "match-album", "_on_match_album"),
-                (self.__search, "match-track", "_on_match_track"),
+                (self.__search, "match-artists", "_on_match_artists"),
+                (self.__search, "match-albums", "_on_match_albums"),
+                (self.__search, "match-tracks", "_on_match_tracks"),
+                (self.__search, "started", "_on_search_started"),
                 (self.__search, "finished", "_on_search_finished"),
                 (App().settings, "changed::web-search",
                  "_on_web_search_changed")
@@ -174,13 +172,11 @@ class SearchView(View, Gtk.Bin, SignalsHelper):
             Populate search
             in db based on text entry current text
         """
-        self.cancel()
-        self.__stack.new_current_child()
         if len(self.__current_search) > 1:
-            self.__banner.spinner.start()
-            current_search = self.__current_search.lower()
-            self.__search.get(current_search, self.__cancellable)
+            self.__search.get(self.__current_search.lower())
         else:
+            self.cancel()
+            self.__stack.new_current_child()
             self.show_placeholder(True,
                                   _("Search for artists, albums and tracks"))
             self.__banner.spinner.stop()
@@ -201,10 +197,9 @@ class SearchView(View, Gtk.Bin, SignalsHelper):
 
     def cancel(self):
         """
-            Cancel current search and replace cancellable
+            Cancel current search
         """
-        self.__cancellable.cancel()
-        self.__cancellable = Gio.Cancellable()
+        self.__search.cancel()
 
     @property
     def args(self):
@@ -237,54 +232,78 @@ class SearchView(View, Gtk.Bin, SignalsHelper):
         self.cancel()
         self.__banner.spinner.stop()
 
-    def _on_match_artist(self, search, artist_id, storage_type):
+    def _on_match_artists(self, search, artist_ids, storage_type):
         """
-            Add a new artist to view
-            @param search as *Search
-            @param artist_id as int
+            Add new artists to view
+            @param search as Search
+            @param artist_ids as [int]
             @param storage_type as StorageType
         """
         if storage_type & StorageType.SEARCH:
             self.__stack.current_child.artists_line_view.show()
-            self.__stack.current_child.artists_line_view.add_value(artist_id)
+            self.__stack.current_child.artists_line_view.add_values(
+                artist_ids)
             self.show_placeholder(False)
 
-    def _on_match_album(self, search, album_id, storage_type):
+    def _on_match_albums(self, search, album_ids, storage_type):
         """
-            Add a new album to view
-            @param search as *Search
-            @param artist_id as int
+            Add new albums to view
+            @param search as Search
+            @param album_ids as [int]
             @param storage_type as StorageType
         """
         if storage_type & StorageType.SEARCH:
-            artist_match = False
-            album = Album(album_id)
-            if album.artists:
-                artist = sql_escape(album.artists[0])
-                search = sql_escape(self.__current_search)
-                artist_match = artist.find(search) != -1
-            if artist_match:
-                self._on_match_artist(search,
-                                      album.artist_ids[0],
-                                      storage_type)
-            else:
+            artist_ids = []
+            albums = []
+            current_search = sql_escape(self.__current_search)
+            for row in App().albums.get_rows(album_ids):
+                album = Album(row[0], row=row)
+                if album.artists and sql_escape(
+                        album.artists[0]).find(current_search) != -1:
+                    artist_ids.append(album.artist_ids[0])
+                else:
+                    albums.append(album)
+            if artist_ids:
+                self._on_match_artists(search, artist_ids, storage_type)
+            if albums:
                 self.__stack.current_child.albums_line_view.show()
-                self.__stack.current_child.albums_line_view.add_value(album)
+                for album in albums:
+                    self.__stack.current_child.albums_line_view.add_value(
+                        album)
                 self.show_placeholder(False)
 
-    def _on_match_track(self, search, track_id, storage_type):
+    def _on_match_tracks(self, search, track_ids, storage_type):
         """
-            Add a new track to view
-            @param search as *Search
-            @param track_id as int
+            Add new tracks to view
+            @param search as Search
+            @param track_ids as [int]
             @param storage_type as StorageType
         """
         if storage_type & StorageType.SEARCH:
-            track = Track(track_id)
+            track_rows = App().tracks.get_rows(track_ids)
+            album_ids = list(set([row[7] for row in track_rows]))
+            album_rows = {}
+            for row in App().albums.get_rows(album_ids):
+                album_rows[row[0]] = row
+            tracks = []
+            for row in track_rows:
+                album = Album(row[7], row=album_rows.get(row[7], None))
+                track = Track(row[0], album, row)
+                album.set_tracks([track], False)
+                tracks.append(track)
             self.__stack.current_child.search_tracks_view.show()
-            self.__stack.current_child.search_tracks_view.append_row(track)
+            self.__stack.current_child.search_tracks_view.append_rows(tracks)
             self.show_placeholder(False)
 
+    def _on_search_started(self, search, current_search):
+        """
+            Prepare a new child for results
+            @param search as Search
+            @param current_search as str
+        """
+        self.__stack.new_current_child()
+        self.__banner.spinner.start()
+
     def _on_search_finished(self, search_handler, last):
         """
             Stop spinner and show placeholder if not result
@@ -324,23 +343,16 @@ class SearchView(View, Gtk.Bin, SignalsHelper):
 
     def _on_search_changed(self, widget):
         """
-            Timeout filtering
+            Search while typing, search is debounced
             @param widget as Gtk.TextEntry
         """
-        if self.__timeout_id is not None:
-            GLib.source_remove(self.__timeout_id)
-        self.__timeout_id = GLib.timeout_add(
-                500,
-                self.__on_search_changed_timeout)
-
-    def __on_search_changed_timeout(self):
-        """
-            Populate widget
-        """
-        self.__timeout_id = None
         new_search = self.__banner.entry.get_text().strip()
-        if self.__current_search != new_search:
-            self.__current_search = new_search
+        if self.__current_search == new_search:
+            return
+        self.__current_search = new_search
+        if len(new_search) > 1:
+            self.__search.set_search(new_search.lower())
+        else:
             self.populate()
 
     def __on_button_clicked(self, button):
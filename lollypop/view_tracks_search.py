@@ -46,16 +46,32 @@ class SearchTracksView(TracksView, SignalsHelper):
             @param track as Track
             @param position as int
         """
+        self.append_rows([track])
+
+    def append_rows(self, tracks):
+        """
+            Append tracks, balanced between columns
+            @param tracks as [Track]
+        """
         self._init()
-        if track.id in self.__track_ids:
-            return
-        self.__track_ids.append(track.id)
+        left = []
+        right = []
         left_len = len(self._tracks_widget_left[0].get_children())
         right_len = len(self._tracks_widget_right[0].get_children())
-        if left_len > right_len:
-            self._add_tracks(self._tracks_widget_right[0], [track])
-        else:
-            self._add_tracks(self._tracks_widget_left[0], [track])
+        for track in tracks:
+            if track.id in self.__track_ids:
+                continue
+            self.__track_ids.append(track.id)
+            if left_len > right_len:
+                right.append(track)
+                right_len += 1
+            else:
+                left.append(track)
+                left_len += 1
+        if left:
+            self._add_tracks(self._tracks_widget_left[0], left)
+        if right:
+            self._add_tracks(self._tracks_widget_right[0], right)
 
     def clear(self):
         """
@@ -176,6 +176,14 @@ class AlbumSimpleWidget(Gtk.FlowBoxChild):
         else:
             return "%s %s" % (self.__album.name, self.__album.artists)
 
+    @property
+    def art_size(self):
+        """
+            Get artwork size
+            @return int
+        """
+        return self.__art_size
+
     @property
     def artwork(self):
         """
@@ -15,7 +15,7 @@ from gi.repository import GLib, Gtk, Gdk, GdkPixbuf, Gio
 import cairo
 from random import shuffle
 
-from lollypop.define import App, Type
+from lollypop.define import App, Type, TaskLane
 from lollypop.objects_album import Album
 from lollypop.utils import get_round_surface, emit_signal, get_icon_name
 from lollypop.widgets_flowbox_rounded import RoundedFlowBoxWidget
@@ -64,11 +64,13 @@ class RoundedAlbumsWidget(RoundedFlowBoxWidget):
                 App().art.get_from_cache,
                 self.artwork_name, "ROUNDED",
                 self._art_size, self._art_size,
-                callback=(self.__on_load_from_cache,))
+                callback=(self.__on_load_from_cache,),
+                lane=TaskLane.UI_ARTWORK, widget=self)
         else:
             self.__album_ids = self._get_album_ids()
             shuffle(self.__album_ids)
-            App().task_helper.run(self._create_surface, True)
+            App().task_helper.run(self._create_surface, True,
+                                  lane=TaskLane.UI_ARTWORK, widget=self)
 
 #######################
 # PROTECTED           #
@@ -17,6 +17,7 @@ from gettext import gettext as _
 from lollypop.define import App, ArtSize, ViewType, Size
 from lollypop.define import MARGIN
 from lollypop.widgets_banner import BannerWidget
+from lollypop.objects_album import Album
 from lollypop.utils import emit_signal, popup_widget, get_human_duration
 from lollypop.helper_signals import SignalsHelper, signals_map
 
@@ -40,7 +41,7 @@ class CurrentAlbumsBannerWidget(BannerWidget, SignalsHelper):
             Gtk.IconSize.BUTTON)
         self.__clear_button.set_relief(Gtk.ReliefStyle.NONE)
         self.__clear_button.set_tooltip_text(_("Clear albums"))
-        self.__clear_button.set_sensitive(App().player.albums)
+        self.__clear_button.set_sensitive(App().player.album_ids)
         self.__clear_button.connect("clicked", self.__on_clear_button_clicked)
         self.__clear_button.get_style_context().add_class("banner-button")
         self.__clear_button.show()
@@ -48,7 +49,7 @@ class CurrentAlbumsBannerWidget(BannerWidget, SignalsHelper):
             "view-more-symbolic",
             Gtk.IconSize.BUTTON)
         self.__menu_button.set_relief(Gtk.ReliefStyle.NONE)
-        self.__menu_button.set_sensitive(App().player.albums)
+        self.__menu_button.set_sensitive(App().player.album_ids)
         self.__menu_button.connect("clicked", self.__on_menu_button_clicked)
         self.__menu_button.get_style_context().add_class("banner-button")
         self.__menu_button.show()
@@ -58,7 +59,7 @@ class CurrentAlbumsBannerWidget(BannerWidget, SignalsHelper):
         self.__jump_button.set_relief(Gtk.ReliefStyle.NONE)
         self.__jump_button.connect("clicked", self.__on_jump_button_clicked)
         self.__jump_button.set_tooltip_text(_("Go to current track"))
-        self.__jump_button.set_sensitive(App().player.albums)
+        self.__jump_button.set_sensitive(App().player.album_ids)
         self.__jump_button.get_style_context().add_class("banner-button")
         self.__jump_button.show()
         self.__title_label = Gtk.Label.new(
@@ -182,7 +183,7 @@ class CurrentAlbumsBannerWidget(BannerWidget, SignalsHelper):
             Update clear button state
             @param player as Player
         """
-        sensitive = player.albums != []
+        sensitive = player.album_ids != []
         GLib.idle_add(self.__clear_button.set_sensitive, sensitive)
         GLib.idle_add(self.__clear_button.set_sensitive, sensitive)
         GLib.idle_add(self.__jump_button.set_sensitive, sensitive)
@@ -199,7 +200,9 @@ class CurrentAlbumsBannerWidget(BannerWidget, SignalsHelper):
         """
         GLib.idle_add(self.__duration_label.set_text, "")
         duration = 0
-        for child in self.__view.children:
+        children = self.__view.children
+        Album.prefetch_durations([child.album for child in children])
+        for child in children:
             if not self.__duration_task:
                 return
             duration += child.album.duration
@@ -18,6 +18,7 @@ from lollypop.utils import get_human_duration, popup_widget
 from lollypop.utils_album import tracks_to_albums
 from lollypop.define import App, ArtSize, ViewType
 from lollypop.objects_track import Track
+from lollypop.objects_album import Album
 from lollypop.widgets_banner import BannerWidget
 from lollypop.helper_signals import SignalsHelper, signals_map
 
@@ -176,7 +177,9 @@ class PlaylistBannerWidget(BannerWidget, SignalsHelper):
             Calculate playback duration
         """
         duration = 0
-        for child in self.__view.children:
+        children = self.__view.children
+        Album.prefetch_durations([child.album for child in children])
+        for child in children:
             if not self.__duration_task:
                 return
             duration += child.album.duration
@@ -54,6 +54,9 @@ class DeviceWidget(Gtk.ListBoxRow):
         self.__builder.get_object("name").set_label(self.__name)
         self.__combobox = self.__builder.get_object("combobox")
         self.__sync_button = self.__builder.get_object("sync_button")
+        self.__cache_usage = self.__builder.get_object("cache_usage")
+        self.__cache_clear_button = self.__builder.get_object(
+            "cache_clear_button")
         if icon is not None:
             device_symbolic = self.__builder.get_object("device-symbolic")
             device_symbolic.set_from_gicon(icon, Gtk.IconSize.DND)
@@ -142,10 +145,24 @@ class DeviceWidget(Gtk.ListBoxRow):
                 App().task_helper.run(self.__mtp_sync.sync, uri, index)
                 emit_signal(self, "syncing", True)
                 button.set_label(_("Cancel"))
+                # Sync reads cached files
+                self.__cache_clear_button.set_sensitive(False)
         else:
             self.__mtp_sync.cancel()
             button.set_sensitive(False)
 
+    def _on_cache_clear_clicked(self, button):
+        """
+            Remove converted files from cache
+            @param button as Gtk.Button
+        """
+        def clear():
+            self.__mtp_sync.cache.clear()
+            return self.__mtp_sync.cache.usage
+
+        button.set_sensitive(False)
+        App().task_helper.run(clear, callback=(self.__on_cache_usage,))
+
     def _on_convert_toggled(self, widget):
         """
             Save option
@@ -338,6 +355,34 @@ class DeviceWidget(Gtk.ListBoxRow):
         self.__sync_button.set_label(_("Synchronize"))
         self.__sync_button.set_sensitive(True)
         self.__calculate_free_space()
+        self.__update_cache_usage()
+
+    def __update_cache_usage(self):
+        """
+            Show transcode cache usage
+        """
+        def load():
+            self.__mtp_sync.cache.load()
+            return self.__mtp_sync.cache.usage
+
+        App().task_helper.run(load, callback=(self.__on_cache_usage,))
+
+    def __on_cache_usage(self, usage):
+        """
+            Show transcode cache usage
+            @param usage as (int, int): (size, budget)
+        """
+        if self.__builder is None:
+            return
+        (size, budget) = usage
+        syncing = self.__sync_button.get_label() != _("Synchronize")
+        self.__cache_clear_button.set_sensitive(size > 0 and not syncing)
+        if budget == 0:
+            self.__cache_usage.set_text(_("Disabled"))
+        else:
+            # Translators: cache size of cache budget, like 12 MB of 2 GB
+            self.__cache_usage.set_text(_("%s of %s") % (
+                GLib.format_size(size), GLib.format_size(budget)))
 
     def __on_map(self, widget):
         """
@@ -346,6 +391,7 @@ class DeviceWidget(Gtk.ListBoxRow):
         """
         App().task_helper.run(self.__get_basename_for_sync,
                               callback=(self.__set_combobox_content,))
+        self.__update_cache_usage()
 
     def __on_destroy(self, widget):
         """
@@ -12,7 +12,7 @@
 
 from gi.repository import Gtk, GLib, Handy
 
-from lollypop.define import App, ScanType, ArtSize
+from lollypop.define import App, ArtSize
 from lollypop.container import Container
 from lollypop.toolbar import Toolbar
 from lollypop.utils import emit_signal
@@ -201,8 +201,6 @@ class Window(Handy.ApplicationWindow, SignalsHelper):
             @param window as Gtk.Window
         """
         self.__setup_size_and_position()
-        if App().settings.get_value("auto-update") or App().tracks.is_empty():
-            App().scanner.update(ScanType.FULL)
 
     def __on_button_release_event(self, window, event):
         """
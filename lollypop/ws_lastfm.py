@@ -14,12 +14,12 @@ from gi.repository import Soup, Gio
 
 import json
 from hashlib import md5
-from pickle import load, dump
 
 from lollypop.helper_passwords import PasswordsHelper
+from lollypop.helper_scrobbles import ScrobblesHelper
 from lollypop.logger import Logger
 from lollypop.utils import get_network_available
-from lollypop.define import LOLLYPOP_DATA_PATH, App, Type
+from lollypop.define import App, Type
 from lollypop.define import LASTFM_API_KEY, LASTFM_API_SECRET
 
 
@@ -28,13 +28,17 @@ class LastFMWebService:
         Handle scrobbling to Last.fm and all authenticated API calls
     """
 
+    # Max listens for a track.scrobble request
+    __BATCH_SIZE = 50
+
     def __init__(self, name):
         """
             Init service
             @param name as str
         """
         self.__name = name
-        self.__queue = []
+        self.__scrobbles = ScrobblesHelper(name, self.__BATCH_SIZE,
+                                           self.__listen)
         if name == "LIBREFM":
             self.__uri = "https://libre.fm/2.0/"
         else:
@@ -43,28 +47,19 @@ class LastFMWebService:
 
     def start(self):
         """
-            Start web service (load save queue)
+            Start web service (submit waiting listens)
         """
-        try:
-            self.__cancellable = Gio.Cancellable()
-            self.__queue = load(
-                open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name, "rb"))
-        except Exception as e:
-            Logger.info("LastFMWebService::start(): %s", e)
-            self.__queue = []
+        self.__cancellable = Gio.Cancellable()
+        if self.__can_submit():
+            self.__scrobbles.flush()
 
     def stop(self):
         """
-            Stop current tasks and save queue to disk
+            Stop current tasks, waiting listens are already on disk
             @return bool
         """
         self.__cancellable.cancel()
-        try:
-            with open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name,
-                      "wb") as f:
-                dump(list(self.__queue), f)
-        except Exception as e:
-            Logger.info("LastFMWebService::stop: %s", e)
+        self.__scrobbles.stop()
         return True
 
     def listen(self, track, timestamp):
@@ -73,13 +68,11 @@ class LastFMWebService:
             @param track as Track
             @param timestamp as int
         """
-        monitor = Gio.NetworkMonitor.get_default()
-        if App().settings.get_value("disable-scrobbling") or\
-                not get_network_available() or\
-                monitor.get_network_metered():
-            self.__queue.append((track, timestamp))
-        elif track.id is not None and track.id >= 0:
-            App().task_helper.run(self.__listen, track, timestamp)
+        if track.id is None or track.id < 0:
+            return
+        self.__scrobbles.add(track, timestamp)
+        if self.__can_submit():
+            self.__scrobbles.flush()
 
     def playing_now(self, track):
         """
@@ -190,50 +183,55 @@ class LastFMWebService:
         api_sig += LASTFM_API_SECRET
         return md5(api_sig.encode("utf-8")).hexdigest()
 
-    def __listen(self, track, timestamp):
+    def __can_submit(self):
         """
-            Scrobble track
-            @param track as Track
-            @param timestamp as int
+            True if listens can be submitted now
+            @return bool
+        """
+        monitor = Gio.NetworkMonitor.get_default()
+        return not App().settings.get_value("disable-scrobbling") and\
+            get_network_available() and\
+            not monitor.get_network_metered()
+
+    def __listen(self, rows):
+        """
+            Scrobble listens
+            @param rows as [tuple], see ScrobblesDatabase.get()
+            @return bool
         """
-        tracks = self.__queue + [(track, timestamp)]
-        self.__queue = []
         try:
-            for (track, timestamp) in tracks:
-                token = App().ws_director.token_ws.get_token(
-                    self.__name, self.__cancellable)
-                if token is None:
-                    return
-                args = self.__get_args_for_method("track.scrobble")
-                args.append(("artist", track.artists[0]))
-                if track.album.artist_ids[0] == Type.COMPILATIONS:
-                    args.append(("albumArtist", track.artists[0]))
-                else:
-                    args.append(("albumArtist", track.album.artists[0]))
-                args.append(("track", track.name))
-                args.append(("album", track.album.name))
-                if track.mbid and track.mbid.find(":") == -1:
-                    args.append(("mbid", track.mbid))
-                args.append(("timestamp", str(timestamp)))
-                args.append(("sk", token))
-                api_sig = self.__get_sig_for_args(args)
-                args.append(("api_sig", api_sig))
-                hash = {}
-                for (name, value) in args:
-                    hash[name] = value
-                form = Soup.form_encode_hash(hash)
-                msg = Soup.Message.new_from_encoded_form(
-                    "POST", self.__uri, form)
-                request_headers = msg.get_property("request-headers")
-                request_headers.append("Accept-Charset", "utf-8")
-                data = App().task_helper.send_message_sync(msg,
-                                                           self.__cancellable)
-                if data is not None:
-                    Logger.debug("%s: %s", self.__uri, data)
-                else:
-                    self.__queue.append((track, timestamp))
+            token = App().ws_director.token_ws.get_token(
+                self.__name, self.__cancellable)
+            if token is None:
+                return False
+            args = self.__get_args_for_method("track.scrobble")
+            for (i, (scrobble_id, timestamp, artist, album_artist, title,
+                     album, tracknumber, duration, mb_track_id, mb_album_id,
+                     mb_artist_ids)) in enumerate(rows):
+                args.append(("artist[%s]" % i, artist))
+                args.append(("albumArtist[%s]" % i, album_artist))
+                args.append(("track[%s]" % i, title))
+                args.append(("album[%s]" % i, album))
+                if mb_track_id and mb_track_id.find(":") == -1:
+                    args.append(("mbid[%s]" % i, mb_track_id))
+                args.append(("timestamp[%s]" % i, str(timestamp)))
+            args.append(("sk", token))
+            api_sig = self.__get_sig_for_args(args)
+            args.append(("api_sig", api_sig))
+            hash = {}
+            for (name, value) in args:
+                hash[name] = value
+            form = Soup.form_encode_hash(hash)
+            msg = Soup.Message.new_from_encoded_form("POST", self.__uri, form)
+            request_headers = msg.get_property("request-headers")
+            request_headers.append("Accept-Charset", "utf-8")
+            data = App().task_helper.send_message_sync(msg, self.__cancellable)
+            if data is not None:
+                Logger.debug("%s: %s", self.__uri, data)
+                return True
         except Exception as e:
             Logger.error("LastFMWebService::__listen(): %s" % e)
+        return False
 
     def __playing_now(self, track):
         """
@@ -14,10 +14,10 @@
 from gi.repository import Soup, GLib, GObject, Gio
 
 import json
-from pickle import load, dump
 
 from lollypop.logger import Logger
-from lollypop.define import App, LOLLYPOP_DATA_PATH, Type
+from lollypop.define import App, Type
+from lollypop.helper_scrobbles import ScrobblesHelper
 from lollypop.utils import get_network_available
 
 
@@ -29,6 +29,8 @@ class ListenBrainzWebService(GObject.GObject):
     """
 
     user_token = GObject.Property(type=str, default="plop")
+    # Max listens for an import request
+    __BATCH_SIZE = 1000
 
     def __init__(self):
         """
@@ -38,35 +40,28 @@ class ListenBrainzWebService(GObject.GObject):
         try:
             self.__uri = "https://api.listenbrainz.org/1/submit-listens"
             self.__name = "listenbrainz"
-            self.__queue = []
+            self.__scrobbles = ScrobblesHelper(self.__name,
+                                               self.__BATCH_SIZE,
+                                               self.__listen)
             self.start()
         except Exception as e:
             Logger.info("LastFM::__init__(): %s", e)
 
     def start(self):
         """
-            Start web service (load save queue)
+            Start web service (submit waiting listens)
         """
-        try:
-            self.__cancellable = Gio.Cancellable()
-            self.__queue = load(
-                open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name, "rb"))
-        except Exception as e:
-            Logger.info("ListenBrainzWebService::start(): %s", e)
-            self.__queue = []
+        self.__cancellable = Gio.Cancellable()
+        if self.__can_submit():
+            self.__scrobbles.flush()
 
     def stop(self):
         """
-            Stop current tasks and save queue to disk
+            Stop current tasks, waiting listens are already on disk
             @return bool
         """
         self.__cancellable.cancel()
-        try:
-            with open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name,
-                      "wb") as f:
-                dump(list(self.__queue), f)
-        except Exception as e:
-            Logger.info("ListenBrainzWebService::stop: %s", e)
+        self.__scrobbles.stop()
         return True
 
     def listen(self, track, timestamp):
@@ -75,16 +70,14 @@ class ListenBrainzWebService(GObject.GObject):
             @param track as Track
             @param timestamp as int
         """
-        monitor = Gio.NetworkMonitor.get_default()
         if not App().settings.get_value(
                 "listenbrainz-user-token").get_string():
             return
-        elif App().settings.get_value("disable-scrobbling") or\
-                not get_network_available() or\
-                monitor.get_network_metered():
-            self.__queue.append((track, timestamp))
-        elif track.id is not None and track.id >= 0:
-            App().task_helper.run(self.__listen, track, timestamp)
+        if track.id is None or track.id < 0:
+            return
+        self.__scrobbles.add(track, timestamp)
+        if self.__can_submit():
+            self.__scrobbles.flush()
 
     def playing_now(self, track):
         """
@@ -112,29 +105,60 @@ class ListenBrainzWebService(GObject.GObject):
 #######################
 # PRIVATE             #
 #######################
-    def __listen(self, track, timestamp):
+    def __can_submit(self):
         """
-            Scrobble track
-            @param track as Track
-            @param timestamp as int
+            True if listens can be submitted now
+            @return bool
+        """
+        monitor = Gio.NetworkMonitor.get_default()
+        return App().settings.get_value(
+            "listenbrainz-user-token").get_string() != "" and\
+            not App().settings.get_value("disable-scrobbling") and\
+            get_network_available() and\
+            not monitor.get_network_metered()
+
+    def __listen(self, rows):
+        """
+            Submit listens
+            @param rows as [tuple], see ScrobblesDatabase.get()
+            @return bool
         """
-        tracks = self.__queue + [(track, timestamp)]
-        self.__queue = []
         try:
-            for (track, timestamp) in tracks:
-                payload = self.__get_payload(track)
-                payload[0]["listened_at"] = timestamp
-                post_data = {
-                    "listen_type": "single",
-                    "payload": payload
-                }
-                data = self.__post_request(post_data)
-                if data is not None:
-                    Logger.debug("%s: %s", self.__uri, data)
-                else:
-                    self.__queue.append((track, timestamp))
+            payload = []
+            for (scrobble_id, timestamp, artist, album_artist, title,
+                 album, tracknumber, duration, mb_track_id, mb_album_id,
+                 mb_artist_ids) in rows:
+                payload.append({
+                    "listened_at": timestamp,
+                    "track_metadata": {
+                        "artist_name": album_artist,
+                        "track_name": title,
+                        "release_name": album,
+                        "additional_info": {
+                            "media_player": "Lollypop",
+                            "media_player_version": App().version,
+                            "artist_mbids": [
+                                mbid for mbid in mb_artist_ids.split(";")
+                                if mbid
+                            ],
+                            "release_mbid": mb_album_id,
+                            "recording_mbid": mb_track_id,
+                            "tracknumber": tracknumber,
+                            "duration_ms": duration
+                        }
+                    }
+                })
+            post_data = {
+                "listen_type": "single" if len(payload) == 1 else "import",
+                "payload": payload
+            }
+            data = self.__post_request(post_data)
+            if data is not None:
+                Logger.debug("%s: %s", self.__uri, data)
+                return True
         except Exception as e:
             Logger.error("ListenBrainzWebService::__listen(): %s" % e)
+        return False
 
     def __playing_now(self, track):
         """